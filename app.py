@@ -0,0 +1,515 @@
+import asyncio
+import json
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
+
+from AIFoundationKit.base.exception.custom_exception import AppException
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from AIFoundationKit.base.utils import generate_session_id
+from fastapi import FastAPI, File, Form, HTTPException, Request, UploadFile
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from fastapi.staticfiles import StaticFiles
+from pydantic import BaseModel
+
+from src.constants import (
+    API_JOB_WORKERS,
+    API_MAX_INGEST_QUEUE,
+    API_MAX_INGEST_REQUESTS,
+    API_MAX_LLM_QUEUE,
+    API_MAX_LLM_REQUESTS,
+    API_MAX_PARSE_QUEUE,
+    API_PARSE_WORKERS,
+    API_RETRY_AFTER_SECONDS,
+    DEFAULT_FAISS_DIR,
+    DEFAULT_JOB_QUEUE_PATH,
+    DEFAULT_JOB_UPLOAD_DIR,
+    DIR_STATIC,
+    DIR_TEMPLATES,
+    INDEX_TEMPLATE,
+    JOB_KIND_COMPARE,
+    JOB_KIND_INGEST,
+    JOB_LANE_DEFAULT,
+    JOB_LANES,
+    JOB_STATUS_SUCCEEDED,
+    KEY_FAISS_DB,
+    SESSION_ID_PATTERN,
+    STREAM_EVENT_ERROR,
+    STREAM_EVENT_SOURCES,
+)
+from src.document_analysier.data_analysis import DocumentAnalysis
+from src.document_analysier.data_ingestion import DocumentHandler
+from src.document_comparison.document_comparison import DocumentComparisonWithLLM
+from src.document_comparison.document_handler import DocumentComparisonHandler
+from src.job_queue import JobQueue, JobWorkerPool, job_key
+from src.model_registry import DEFAULT_CONFIG_PATH, get_model_registry
+from src.multi_doc_chat.data_ingestion import SUPPORTED_LOADERS, MultiDocIngestor
+from src.multi_doc_chat.data_retrival import load_sharded_retriever
+from src.single_doc_chat.data_retrival import ConversationlRAG
+from src.streaming_upload import UploadTooLargeError, asave_stream
+
+logger = get_logger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent
+
+
+class AdmissionGate:
+    """
+    Bounds one kind of work in flight.
+
+    Up to ``max_running`` requests run at once and up to ``max_waiting`` more
+    wait for a slot. Anything beyond that is rejected with 429 straight away,
+    so an overloaded server sheds load instead of queueing without limit.
+    """
+
+    def __init__(self, name: str, max_running: int, max_waiting: int):
+        """
+        Initializes the AdmissionGate.
+
+        Args:
+            name (str): Kind of work, used in logs and error messages.
+            max_running (int): Maximum number of requests running at once.
+            max_waiting (int): Maximum number of requests waiting for a slot.
+        """
+        self.name = name
+        self.capacity = max_running + max_waiting
+        self.admitted = 0
+        self._semaphore = asyncio.Semaphore(max_running)
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot, or raise a 429 ``HTTPException`` if the queue is full.
+        """
+        if self.admitted >= self.capacity:
+            logger.warning("Rejected %s request: %d admitted", self.name, self.admitted)
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many {self.name} requests, retry later",
+                headers={"Retry-After": str(API_RETRY_AFTER_SECONDS)},
+            )
+        self.admitted += 1
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            self.admitted -= 1
+            raise
+
+    def release(self) -> None:
+        self._semaphore.release()
+        self.admitted -= 1
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class GatedStreamingResponse(StreamingResponse):
+    """
+    Streaming response holding an ``AdmissionGate`` slot until it is sent.
+
+    The slot is released however sending ends, including when the client
+    disconnects before the body is iterated, which a ``finally`` in the body
+    generator would never see.
+    """
+
+    def __init__(self, gate: AdmissionGate, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.gate = gate
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            self.gate.release()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    # PDF parsing is CPU-bound and holds the GIL, so it runs on a process pool;
+    # LLM calls use the async clients on the event loop.
+    workers = API_PARSE_WORKERS or os.cpu_count() or 1
+    app.state.parse_pool = ProcessPoolExecutor(max_workers=workers)
+    app.state.parse_gate = AdmissionGate("parse", workers, API_MAX_PARSE_QUEUE)
+    app.state.llm_gate = AdmissionGate("LLM", API_MAX_LLM_REQUESTS, API_MAX_LLM_QUEUE)
+    app.state.ingest_gate = AdmissionGate(
+        "ingest", API_MAX_INGEST_REQUESTS, API_MAX_INGEST_QUEUE
+    )
+    app.state.history_store = None
+    app.state.contextualizer = None
+    app.state.job_queue = JobQueue(DEFAULT_JOB_QUEUE_PATH)
+    app.state.job_workers = JobWorkerPool(DEFAULT_JOB_QUEUE_PATH, API_JOB_WORKERS)
+    app.state.job_workers.start()
+    logger.info("Document Portal API started with %d parse workers", workers)
+    try:
+        yield
+    finally:
+        app.state.job_workers.stop()
+        app.state.parse_pool.shutdown(wait=False, cancel_futures=True)
+
+
+app = FastAPI(title="Document Portal", lifespan=lifespan)
+
+app.mount("/static", StaticFiles(directory=PROJECT_ROOT / DIR_STATIC), name="static")
+
+
+class ChatRequest(BaseModel):
+
+    session_id: str
+
+    question: str
+
+    k: int = 4
+
+
+@lru_cache(maxsize=1)
+def get_document_analysis() -> DocumentAnalysis:
+    return DocumentAnalysis()
+
+
+@lru_cache(maxsize=1)
+def get_document_comparison() -> DocumentComparisonWithLLM:
+    return DocumentComparisonWithLLM()
+
+
+def _check_session_id(session_id: Optional[str]) -> None:
+    # Session ids become directory names.
+    if session_id is not None and not re.match(SESSION_ID_PATTERN, session_id):
+        raise HTTPException(status_code=400, detail="Invalid session id")
+
+
+def _check_supported_files(files: List[UploadFile]) -> None:
+    unsupported = [
+        upload.filename
+        for upload in files
+        if Path(upload.filename or "").suffix.lower() not in SUPPORTED_LOADERS
+    ]
+    if unsupported:
+        raise HTTPException(
+            status_code=400, detail=f"Unsupported file types: {unsupported}"
+        )
+
+
+def _check_lane(lane: str) -> None:
+    if lane not in JOB_LANES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown lane {lane!r}, expected one of {JOB_LANES}",
+        )
+
+
+async def _save_upload(upload: UploadFile, directory: str, prefix: str = "") -> str:
+    """
+    Write an upload to ``directory`` in chunks, keeping its base name.
+    """
+    file_name = prefix + os.path.basename(upload.filename or "upload")
+    saved = await asave_stream(upload, directory, file_name)
+    return saved.path
+
+
+async def _parse(request: Request, func, *args):
+    """
+    Run a parsing call on the shared process pool.
+    """
+    state = request.app.state
+    loop = asyncio.get_running_loop()
+    async with state.parse_gate.admit():
+        return await loop.run_in_executor(state.parse_pool, func, *args)
+
+
+async def _stage_job_uploads(
+    uploads: List[UploadFile], kind: str, **options
+) -> Tuple[str, List[str]]:
+    """
+    Store the uploads of a job under a directory named after its ``job_key``.
+
+    Uploads identical to an earlier submission are discarded, so the earlier
+    copy, and the earlier job, are reused, even if the files were renamed.
+
+    Returns:
+        Tuple[str, List[str]]: The job key and the absolute stored paths.
+    """
+    upload_root = os.path.abspath(DEFAULT_JOB_UPLOAD_DIR)
+    os.makedirs(upload_root, exist_ok=True)
+    staging_dir = tempfile.mkdtemp(prefix=".staging.", dir=upload_root)
+    try:
+        names = []
+        for index, upload in enumerate(uploads):
+            # One directory per upload, so equal file names do not collide.
+            os.mkdir(os.path.join(staging_dir, str(index)))
+            path = await _save_upload(upload, os.path.join(staging_dir, str(index)))
+            names.append(os.path.relpath(path, staging_dir))
+        key = job_key(
+            kind, [os.path.join(staging_dir, name) for name in names], **options
+        )
+        job_dir = os.path.join(upload_root, key)
+        try:
+            os.rename(staging_dir, job_dir)
+        except OSError:
+            if not os.path.isdir(job_dir):
+                raise
+            # Already stored by an identical submission, maybe under other
+            # file names: the key only covers contents, so use its copies.
+            shutil.rmtree(staging_dir)
+            names = [
+                os.path.join(
+                    str(index), os.listdir(os.path.join(job_dir, str(index)))[0]
+                )
+                for index in range(len(uploads))
+            ]
+        return key, [os.path.join(job_dir, name) for name in names]
+    except BaseException:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        raise
+
+
+def _load_conversation(request: Request, session_id: str, k: int) -> ConversationlRAG:
+    registry = get_model_registry(DEFAULT_CONFIG_PATH)
+    retriever = load_sharded_retriever(
+        registry.get_embeddings(),
+        DEFAULT_FAISS_DIR,
+        [session_id],
+        k=k,
+        index_config=registry.loader.config.get(KEY_FAISS_DB),
+    )
+    if not retriever.shards:
+        raise HTTPException(status_code=404, detail="No documents for this session")
+    rag = ConversationlRAG(
+        session_id=session_id,
+        retriever=retriever,
+        config_path=DEFAULT_CONFIG_PATH,
+        history_store=request.app.state.history_store,
+        contextualizer=request.app.state.contextualizer,
+    )
+    # Share one history store and one contextualizer, with their in-memory
+    # caches, across requests.
+    request.app.state.history_store = rag.history_store
+    request.app.state.contextualizer = rag.contextualizer
+    return rag
+
+
+async def _chat_events(rag: ConversationlRAG, question: str) -> AsyncIterator[str]:
+    """
+    Serialize a conversation's streamed answer as newline-delimited JSON.
+    """
+    try:
+        async for event in rag.astream_answer(question):
+            if event["type"] == STREAM_EVENT_SOURCES:
+                event = {
+                    "type": STREAM_EVENT_SOURCES,
+                    "documents": [
+                        {
+                            "page_content": document.page_content,
+                            "metadata": document.metadata,
+                        }
+                        for document in event["documents"]
+                    ],
+                }
+            yield json.dumps(event, default=str) + "\n"
+    except AppException as e:
+        # The status line has already been sent.
+        yield json.dumps({"type": STREAM_EVENT_ERROR, "detail": str(e)}) + "\n"
+
+
+@app.exception_handler(AppException)
+async def app_exception_handler(request: Request, exc: AppException) -> JSONResponse:
+    logger.error("Request to %s failed: %s", request.url.path, exc)
+    return JSONResponse(status_code=500, content={"detail": str(exc)})
+
+
+@app.exception_handler(UploadTooLargeError)
+async def upload_too_large_handler(
+    request: Request, exc: UploadTooLargeError
+) -> JSONResponse:
+    return JSONResponse(status_code=exc.status_code, content={"detail": str(exc)})
+
+
+@app.get("/")
+async def index() -> FileResponse:
+    return FileResponse(PROJECT_ROOT / DIR_TEMPLATES / INDEX_TEMPLATE)
+
+
+@app.get("/health")
+async def health() -> dict:
+    return {"status": "ok"}
+
+
+@app.post("/analyze")
+async def analyze(request: Request, file: UploadFile = File(...)) -> dict:
+    """
+    Extract structured metadata from an uploaded PDF.
+    """
+    handler = DocumentHandler()
+    with tempfile.TemporaryDirectory() as staging_dir:
+        staged_path = await _save_upload(file, staging_dir)
+        # Saving stores the PDF in the blob store and extracts its text into
+        # the text cache, which ``read_pdf`` then reads.
+        pdf_path = await _parse(request, handler.save_pdf, staged_path)
+    text = await asyncio.to_thread(handler.read_pdf, pdf_path)
+    async with request.app.state.llm_gate.admit():
+        analysis = await get_document_analysis().aanalyze_document(text)
+    return {"session_id": handler.session_id, "analysis": analysis}
+
+
+@app.post("/compare")
+async def compare(
+    request: Request,
+    reference: UploadFile = File(...),
+    actual: UploadFile = File(...),
+) -> dict:
+    """
+    Compare two uploaded documents page by page.
+    """
+    handler = DocumentComparisonHandler()
+    with tempfile.TemporaryDirectory() as staging_dir:
+        reference_path = await _save_upload(reference, staging_dir, "reference_")
+        actual_path = await _save_upload(actual, staging_dir, "actual_")
+        reference_path, actual_path = await _parse(
+            request, handler.save_file, reference_path, actual_path
+        )
+    reference_text = await asyncio.to_thread(handler.read_file, reference_path)
+    actual_text = await asyncio.to_thread(handler.read_file, actual_path)
+    async with request.app.state.llm_gate.admit():
+        changes = await get_document_comparison().acompare_documents(
+            reference_text, actual_text
+        )
+    return {
+        "session_id": handler.session_id,
+        "changes": changes.to_dict(orient="records"),
+    }
+
+
+@app.post("/ingest")
+async def ingest(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    session_id: Optional[str] = Form(None),
+) -> dict:
+    """
+    Add uploaded PDF, DOCX, TXT and MD files to a multi-document chat session.
+    """
+    _check_session_id(session_id)
+    _check_supported_files(files)
+
+    state = request.app.state
+    async with state.ingest_gate.admit():
+        ingestor = MultiDocIngestor(session_id=session_id)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file_paths = []
+            for index, upload in enumerate(files):
+                # One directory per upload, so equal file names do not collide.
+                upload_dir = os.path.join(tmp_dir, str(index))
+                os.mkdir(upload_dir)
+                file_paths.append(await _save_upload(upload, upload_dir))
+            # Parsing runs on the shared process pool; embedding is I/O bound
+            # and stays on this worker thread.
+            await asyncio.to_thread(
+                ingestor.ingest_files, file_paths, True, state.parse_pool
+            )
+    return {
+        "session_id": ingestor.session_id,
+        "files": [upload.filename for upload in files],
+    }
+
+
+@app.post("/chat")
+async def chat(request: Request, body: ChatRequest) -> StreamingResponse:
+    """
+    Answer a question about a session's documents as newline-delimited JSON
+    events: the sources first, then the answer tokens.
+    """
+    _check_session_id(body.session_id)
+    gate = request.app.state.llm_gate
+    await gate.acquire()
+    try:
+        rag = await asyncio.to_thread(
+            _load_conversation, request, body.session_id, body.k
+        )
+        return GatedStreamingResponse(
+            gate, _chat_events(rag, body.question), media_type="application/x-ndjson"
+        )
+    except BaseException:
+        gate.release()
+        raise
+
+
+@app.post("/jobs/ingest", status_code=202)
+async def submit_ingest_job(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    session_id: Optional[str] = Form(None),
+    lane: str = Form(JOB_LANE_DEFAULT),
+) -> dict:
+    """
+    Queue an ingest into a multi-document chat session for the job workers.
+    """
+    _check_session_id(session_id)
+    _check_supported_files(files)
+    _check_lane(lane)
+    key, file_paths = await _stage_job_uploads(
+        files, JOB_KIND_INGEST, session_id=session_id
+    )
+    job_id = request.app.state.job_queue.submit(
+        JOB_KIND_INGEST,
+        {"file_paths": file_paths, "session_id": session_id or generate_session_id()},
+        lane=lane,
+        key=key,
+    )
+    return {"job_id": job_id}
+
+
+@app.post("/jobs/compare", status_code=202)
+async def submit_compare_job(
+    request: Request,
+    reference: UploadFile = File(...),
+    actual: UploadFile = File(...),
+    lane: str = Form(JOB_LANE_DEFAULT),
+) -> dict:
+    """
+    Queue a document comparison for the job workers.
+    """
+    _check_lane(lane)
+    key, (reference_path, actual_path) = await _stage_job_uploads(
+        [reference, actual], JOB_KIND_COMPARE
+    )
+    job_id = request.app.state.job_queue.submit(
+        JOB_KIND_COMPARE,
+        {"reference_path": reference_path, "actual_path": actual_path},
+        lane=lane,
+        key=key,
+    )
+    return {"job_id": job_id}
+
+
+@app.get("/jobs/{job_id}")
+async def job_status(request: Request, job_id: str) -> dict:
+    status = request.app.state.job_queue.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    return status
+
+
+@app.get("/jobs/{job_id}/result")
+async def job_result(request: Request, job_id: str) -> dict:
+    job = request.app.state.job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown job")
+    if job.status != JOB_STATUS_SUCCEEDED:
+        raise HTTPException(status_code=409, detail=job.to_status())
+    return {"job_id": job.id, "result": job.result}
+
+
+if __name__ == "__main__":
+
+    import uvicorn
+
+    uvicorn.run("app:app", host="0.0.0.0", port=8000)
@@ -0,0 +1,116 @@
+"""
+Compare recall, query latency and memory of the FAISS index types supported
+by src.faiss_index against the exact flat baseline.
+
+Usage:
+    PYTHONPATH=. python extras/benchmark_faiss_index.py [--vectors 200000] [--dim 384]
+"""
+
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from src.constants import FAISS_INDEX_TYPES
+from src.faiss_index import create_faiss_index
+
+
+def clustered_vectors(count: int, dim: int, clusters: int, seed: int) -> np.ndarray:
+
+    rng = np.random.default_rng(seed)
+
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+
+    labels = rng.integers(0, clusters, size=count)
+
+    noise = rng.normal(scale=0.3, size=(count, dim)).astype(np.float32)
+
+    return centers[labels] + noise
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+
+    hits = sum(len(set(row) & set(expected)) for row, expected in zip(found, truth))
+
+    return hits / truth.size
+
+
+def benchmark(args) -> None:
+
+    vectors = clustered_vectors(args.vectors, args.dim, args.clusters, seed=0)
+
+    queries = clustered_vectors(args.queries, args.dim, args.clusters, seed=1)
+
+    config = {
+        "nlist": args.nlist,
+        "nprobe": args.nprobe,
+        "pq_m": args.pq_m,
+        "ef_search": args.ef_search,
+    }
+
+    truth = None
+
+    print(
+        f"{'index':<10} {'build (s)':>10} {'ms/query':>9} "
+        f"{'recall@' + str(args.k):>10} {'size (MB)':>10}"
+    )
+
+    for index_type in FAISS_INDEX_TYPES:
+
+        start = time.perf_counter()
+
+        index = create_faiss_index(vectors, {**config, "index_type": index_type})
+
+        index.add(vectors)
+
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+
+        _, found = index.search(queries, args.k)
+
+        latency = (time.perf_counter() - start) * 1000 / len(queries)
+
+        if truth is None:
+
+            truth = found
+
+        size = faiss.serialize_index(index).nbytes / 1e6
+
+        print(
+            f"{index_type:<10} {build:>10.2f} {latency:>9.3f} "
+            f"{recall_at_k(found, truth):>10.3f} {size:>10.1f}"
+        )
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument("--vectors", type=int, default=200_000)
+
+    parser.add_argument("--dim", type=int, default=384)
+
+    parser.add_argument("--queries", type=int, default=500)
+
+    parser.add_argument("--clusters", type=int, default=500)
+
+    parser.add_argument("--k", type=int, default=10)
+
+    parser.add_argument("--nlist", type=int, default=1024)
+
+    parser.add_argument("--nprobe", type=int, default=16)
+
+    parser.add_argument("--pq-m", type=int, default=48)
+
+    parser.add_argument("--ef-search", type=int, default=64)
+
+    args = parser.parse_args()
+
+    benchmark(args)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,95 @@
+"""
+Compare langchain's FAISS MMR search with the vectorized implementation in
+src.multi_doc_chat.mmr at several fetch_k values.
+
+Usage:
+    PYTHONPATH=. python extras/benchmark_mmr.py [--docs 20000] [--dim 768]
+"""
+
+import argparse
+import time
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from src.multi_doc_chat.mmr import mmr_search_by_vector
+
+FETCH_K_VALUES = [50, 200, 1000]
+
+
+def _time_call(func, repeat: int) -> float:
+
+    best = float("inf")
+
+    for _ in range(repeat):
+
+        start = time.perf_counter()
+
+        func()
+
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def build_vectorstore(docs: int, dim: int) -> FAISS:
+
+    rng = np.random.default_rng(0)
+
+    vectors = rng.normal(size=(docs, dim)).astype(np.float32)
+
+    return FAISS.from_embeddings(
+        [(f"chunk {index}", vector.tolist()) for index, vector in enumerate(vectors)],
+        DeterministicFakeEmbedding(size=dim),
+    )
+
+
+def benchmark(docs: int, dim: int, k: int, repeat: int) -> None:
+
+    vectorstore = build_vectorstore(docs, dim)
+
+    query = np.random.default_rng(1).normal(size=dim).tolist()
+
+    print(f"{'fetch_k':>8} {'langchain (s)':>14} {'vectorized (s)':>15} {'speedup':>8}")
+
+    for fetch_k in FETCH_K_VALUES:
+
+        baseline = _time_call(
+            lambda: vectorstore.max_marginal_relevance_search_by_vector(
+                query, k=k, fetch_k=fetch_k
+            ),
+            repeat,
+        )
+
+        vectorized = _time_call(
+            lambda: mmr_search_by_vector(vectorstore, query, k=k, fetch_k=fetch_k),
+            repeat,
+        )
+
+        print(
+            f"{fetch_k:>8} {baseline:>14.4f} {vectorized:>15.4f} "
+            f"{baseline / vectorized:>7.1f}x"
+        )
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument("--docs", type=int, default=20000)
+
+    parser.add_argument("--dim", type=int, default=768)
+
+    parser.add_argument("--k", type=int, default=10)
+
+    parser.add_argument("--repeat", type=int, default=5)
+
+    args = parser.parse_args()
+
+    benchmark(args.docs, args.dim, args.k, args.repeat)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -0,0 +1,99 @@
+"""
+Compare sequential and page-parallel PDF text extraction throughput.
+
+Usage:
+    PYTHONPATH=. python extras/benchmark_read_pdf.py [--repeat 5] [--workers 4]
+"""
+
+import argparse
+import os
+import time
+from pathlib import Path
+
+import fitz
+
+from src.document_analysier.data_ingestion import DocumentHandler
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+BUNDLED_PDFS = [
+    PROJECT_ROOT
+    / "data"
+    / "document_analysis"
+    / "NIPS-2017-attention-is-all-you-need-Paper.pdf",
+    PROJECT_ROOT / "Long_Report_V1.pdf",
+    PROJECT_ROOT / "Long_Report_V2.pdf",
+]
+
+
+def _time_call(func, repeat: int) -> float:
+
+    best = float("inf")
+
+    for _ in range(repeat):
+
+        start = time.perf_counter()
+
+        func()
+
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def benchmark(pdf_paths, repeat: int, workers: int) -> None:
+
+    handler = DocumentHandler(session_id="benchmark_read_pdf")
+
+    print(f"{'file':<50} {'pages':>6} {'mode':<18} {'seconds':>9} {'pages/s':>9}")
+
+    for pdf_path in pdf_paths:
+
+        if not pdf_path.exists():
+
+            print(f"Skipping missing file: {pdf_path}")
+
+            continue
+
+        with fitz.open(pdf_path) as pdf:
+
+            page_count = pdf.page_count
+
+        modes = {
+            "sequential": lambda: handler.read_pdf(str(pdf_path)),
+            "lazy iterator": lambda: sum(
+                len(text) for _, text in handler.iter_pdf_pages(str(pdf_path))
+            ),
+            f"parallel x{workers}": lambda: handler.read_pdf(
+                str(pdf_path), max_workers=workers
+            ),
+        }
+
+        for mode, func in modes.items():
+
+            seconds = _time_call(func, repeat)
+
+            print(
+                f"{pdf_path.name:<50} {page_count:>6} {mode:<18} "
+                f"{seconds:>9.4f} {page_count / seconds:>9.1f}"
+            )
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description=__doc__)
+
+    parser.add_argument("pdfs", nargs="*", type=Path, help="PDFs to benchmark")
+
+    parser.add_argument("--repeat", type=int, default=5)
+
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+
+    args = parser.parse_args()
+
+    benchmark(args.pdfs or BUNDLED_PDFS, args.repeat, args.workers)
+
+
+if __name__ == "__main__":
+
+    main()
@@ -34,3 +34,8 @@ class ChangeFormat(BaseModel):
 class SummaryResponse(RootModel[list[ChangeFormat]]):
 
     pass
+
+
+class ComparisonReport(BaseModel):
+
+    changes: list[ChangeFormat] = Field(description="Page-wise list of changes")
@@ -100,9 +100,29 @@ context_qa_prompt = ChatPromptTemplate.from_messages(
     ]
 )
 
+summarize_conversation_prompt = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            (
+                "You are a Conversation Archivist. Condense the earlier part of a "
+                "conversation into a short running summary."
+                "\n\nRules:"
+                "\n1.  **Merge**: Fold the new messages into the existing summary."
+                "\n2.  **Retain Facts**: Keep names, numbers, documents and open "
+                "questions the user may refer back to."
+                "\n3.  **Brevity**: At most 5 sentences. Output only the summary."
+                "\n\nExisting summary:\n{summary}"
+            ),
+        ),
+        MessagesPlaceholder("messages"),
+    ]
+)
+
 PROMPT_REGISTRY = {
     "document_analysis": document_analysis_prompt,
     "document_comparison": document_comparison_prompt,
     "contextualize_question": contextualize_question_prompt,
     "context_qa": context_qa_prompt,
+    "summarize_conversation": summarize_conversation_prompt,
 }
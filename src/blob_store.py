@@ -0,0 +1,195 @@
+import json
+import os
+import shutil
+import uuid
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from AIFoundationKit.base.logger.custom_logger import get_logger
+
+from src.constants import MAX_UPLOAD_BYTES
+from src.streaming_upload import save_stream
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Blob:
+    sha256: str
+    path: str
+    size: int
+
+
+class BlobStore:
+    """
+    Content-addressed store of uploaded files.
+
+    Each distinct content is kept once, under ``objects/<sha256>``, and
+    exposed in session directories through hard links, so the link count of
+    a blob is its reference count. Results derived from a blob, such as its
+    parsed pages, are cached under ``artifacts/<sha256>/`` and reused by
+    every upload of the same content. ``find`` maps a linked file back to
+    its blob through an index of blob inodes.
+
+    The store must live on the same filesystem as the session directories;
+    elsewhere, links fall back to copies, which are not counted.
+    """
+
+    def __init__(self, root: str):
+        """
+        Initializes the BlobStore.
+
+        Args:
+            root (str): Directory holding the blobs and their artifacts.
+        """
+        # Directories are created on first write, so handlers that never
+        # store anything leave no trace.
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.artifacts_dir = os.path.join(root, "artifacts")
+        self.inodes_dir = os.path.join(root, "inodes")
+        self.tmp_dir = os.path.join(root, "tmp")
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.objects_dir, sha256)
+
+    def _inode_path(self, stat: os.stat_result) -> str:
+        return os.path.join(self.inodes_dir, f"{stat.st_dev}-{stat.st_ino}")
+
+    def _index_inode(self, sha256: str) -> None:
+        inode_path = self._inode_path(os.stat(self.blob_path(sha256)))
+        try:
+            if os.readlink(inode_path) == sha256:
+                return
+        except OSError:
+            pass
+        os.makedirs(self.inodes_dir, exist_ok=True)
+        temp_path = f"{inode_path}.{uuid.uuid4().hex}.tmp"
+        os.symlink(sha256, temp_path)
+        os.replace(temp_path, inode_path)
+
+    def put(self, source: Any, max_bytes: int = MAX_UPLOAD_BYTES) -> Blob:
+        """
+        Store the content of ``source`` unless it is already stored.
+
+        Args:
+            source (Any): Anything accepted by ``save_stream``.
+            max_bytes (int): Maximum accepted size.
+
+        Returns:
+            Blob: The stored blob.
+        """
+        saved = save_stream(source, self.tmp_dir, uuid.uuid4().hex, max_bytes)
+        blob_path = self.blob_path(saved.sha256)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        try:
+            # Unlike a rename, link never replaces a blob stored concurrently,
+            # whose existing links must keep counting.
+            os.link(saved.path, blob_path)
+            logger.info("Stored blob %s (%d bytes)", saved.sha256, saved.size)
+        except FileExistsError:
+            logger.info("Blob %s already stored", saved.sha256)
+        finally:
+            os.remove(saved.path)
+        self._index_inode(saved.sha256)
+        return Blob(saved.sha256, blob_path, saved.size)
+
+    def find(self, file_path: str) -> Optional[str]:
+        """
+        The sha256 of the blob ``file_path`` is a link to, or None if it is
+        not one (e.g. a missing file or a copy).
+        """
+        try:
+            stat = os.stat(file_path)
+            sha256 = os.readlink(self._inode_path(stat))
+            # Inode numbers are reused, so check the entry is still current.
+            if os.path.samestat(stat, os.stat(self.blob_path(sha256))):
+                return sha256
+        except OSError:
+            pass
+        return None
+
+    def link(self, sha256: str, dest_path: str) -> str:
+        """
+        Expose a blob at ``dest_path``, replacing any file already there.
+
+        Returns:
+            str: ``dest_path``.
+        """
+        blob_path = self.blob_path(sha256)
+        if os.path.exists(dest_path) and os.path.samefile(dest_path, blob_path):
+            return dest_path
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        temp_path = f"{dest_path}.{uuid.uuid4().hex}.link"
+        try:
+            os.link(blob_path, temp_path)
+        except OSError:
+            # e.g. the destination is on another filesystem.
+            shutil.copyfile(blob_path, temp_path)
+        os.replace(temp_path, dest_path)
+        return dest_path
+
+    def refcount(self, sha256: str) -> int:
+        """
+        Number of hard links to a blob outside the store.
+        """
+        try:
+            return os.stat(self.blob_path(sha256)).st_nlink - 1
+        except FileNotFoundError:
+            return 0
+
+    def gc(self) -> int:
+        """
+        Remove blobs no longer linked from any session, with their artifacts.
+
+        Returns:
+            int: Number of blobs removed.
+        """
+        if not os.path.isdir(self.objects_dir):
+            return 0
+        removed = 0
+        for sha256 in os.listdir(self.objects_dir):
+            if self.refcount(sha256) == 0:
+                blob_path = self.blob_path(sha256)
+                inode_path = self._inode_path(os.stat(blob_path))
+                os.remove(blob_path)
+                try:
+                    os.remove(inode_path)
+                except FileNotFoundError:
+                    pass
+                shutil.rmtree(
+                    os.path.join(self.artifacts_dir, sha256), ignore_errors=True
+                )
+                removed += 1
+        logger.info("Removed %d unreferenced blobs", removed)
+        return removed
+
+    def artifact_path(self, sha256: str, file_name: str) -> str:
+        """
+        Path of a file derived from a blob; removed with the blob.
+        """
+        return os.path.join(self.artifacts_dir, sha256, file_name)
+
+    def _artifact_path(self, sha256: str, name: str) -> str:
+        return self.artifact_path(sha256, f"{name}.json")
+
+    def get_artifact(self, sha256: str, name: str) -> Optional[Any]:
+        """
+        A cached result derived from a blob, or None if there is none.
+        """
+        try:
+            with open(self._artifact_path(sha256, name), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def put_artifact(self, sha256: str, name: str, value: Any) -> None:
+        """
+        Cache a JSON-serializable result derived from a blob.
+        """
+        path = self._artifact_path(sha256, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, default=str)
+        os.replace(temp_path, path)
@@ -106,3 +106,257 @@ MSG_VAL_COMPLETE = "--- Validation Complete ---"
 TEST_QUERY = "dataset"
 
 TEST_PROMPT = "Say 'Hello'"
+
+FAISS_INDEX_NAME = "index"
+
+FAISS_INDEX_FILE = "index.faiss"
+
+KEY_CONTENT_HASH = "content_hash"
+
+DEFAULT_EMBEDDING_CACHE_PATH = "data/embedding_cache/embeddings.sqlite3"
+
+DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES = 500_000
+
+PDF_PAGE_TEMPLATE = "\n--- Page {page_num}  ---\n{text}"
+
+MIN_PAGES_PER_WORKER = 8
+
+PDF_PAGE_HEADER_PATTERN = r"\n--- Page (\d+)  ---\n"
+
+CHARS_PER_TOKEN = 4
+
+ANALYSIS_CHUNK_TOKEN_BUDGET = 6000
+
+ANALYSIS_MAX_CONCURRENCY = 4
+
+NOT_AVAILABLE_VALUES = ("", "n/a", "na", "none", "unknown", "not available")
+
+FILE_MANAGER_PAGE_PATTERN = r"(?m)^Page (\d+):\n"
+
+NO_CHANGE = "NO CHANGE"
+
+PAGE_UNCHANGED = "unchanged"
+
+PAGE_CHANGED = "changed"
+
+PAGE_ADDED = "added"
+
+PAGE_REMOVED = "removed"
+
+COMPARISON_PAGES_PER_BATCH = 5
+
+COMPARISON_MAX_CONCURRENCY = 4
+
+COMPARISON_REQUESTS_PER_SECOND = 2.0
+
+KEY_RESPONSE_CACHE = "response_cache"
+
+ENV_RESPONSE_CACHE_PATH = "RESPONSE_CACHE_PATH"
+
+DEFAULT_RESPONSE_CACHE_TTL_SECONDS = 7 * 24 * 3600
+
+DEFAULT_RESPONSE_CACHE_MAX_ENTRIES = 10_000
+
+STREAM_EVENT_SOURCES = "sources"
+
+STREAM_EVENT_TOKEN = "token"
+
+STREAM_EVENT_ERROR = "error"
+
+DEFAULT_SESSION_HISTORY_PATH = "data/session_history/history.sqlite3"
+
+SESSION_HISTORY_MAX_MESSAGES = 20
+
+SESSION_HISTORY_MAX_TOKENS = 2000
+
+SESSION_HISTORY_MAX_SESSIONS = 256
+
+SESSION_HISTORY_IDLE_SECONDS = 1800
+
+# Words that usually refer back to earlier turns of a conversation.
+CONTEXT_REFERENCE_WORDS = frozenset(
+    {
+        "it",
+        "its",
+        "they",
+        "them",
+        "their",
+        "theirs",
+        "this",
+        "that",
+        "these",
+        "those",
+        "he",
+        "him",
+        "his",
+        "she",
+        "her",
+        "hers",
+        "former",
+        "latter",
+        "above",
+        "previous",
+        "earlier",
+        "same",
+        "aforementioned",
+        "mentioned",
+        "else",
+        "again",
+    }
+)
+
+CONTEXT_FOLLOW_UP_PREFIXES = (
+    "and ",
+    "also ",
+    "but ",
+    "so ",
+    "what about",
+    "how about",
+    "why not",
+    "tell me more",
+)
+
+# Shorter queries (e.g. "Why?") are always treated as follow-ups.
+STANDALONE_QUERY_MIN_WORDS = 2
+
+QUERY_REWRITE_CACHE_SIZE = 1024
+
+DEFAULT_FAISS_DIR = "data/faiss_index"
+
+DEFAULT_MULTI_DOC_DATA_DIR = "data/multi_document_chat"
+
+KEY_FILE_NAME = "file_name"
+
+KEY_SESSION_ID = "session_id"
+
+COMPRESSION_SIMILARITY_THRESHOLD = 0.3
+
+COMPRESSION_TOP_SENTENCES = 3
+
+COMPRESSION_TOKEN_BUDGET = 1500
+
+COMPRESSION_SENTENCE_CACHE_SIZE = 4096
+
+KEY_SIMILARITY = "similarity"
+
+BM25_INDEX_FILE = "bm25.json"
+
+BM25_K1 = 1.5
+
+BM25_B = 0.75
+
+RRF_K = 60
+
+HYBRID_FETCH_K = 20
+
+FAISS_INDEX_TYPES = ("flat", "ivf_flat", "ivf_pq", "hnsw", "sq8")
+
+DEFAULT_FAISS_INDEX_CONFIG = {
+    "index_type": "flat",
+    "nlist": 1024,
+    "nprobe": 16,
+    "pq_m": 16,
+    "pq_nbits": 8,
+    "hnsw_m": 32,
+    "ef_construction": 200,
+    "ef_search": 64,
+    "train_sample_size": 100_000,
+}
+
+# faiss warns when an IVF quantizer has fewer training points per list.
+MIN_TRAINING_POINTS_PER_LIST = 39
+
+DOCSTORE_FILE = "docstore.sqlite3"
+
+LEGACY_DOCSTORE_FILE = "index.pkl"
+
+# Symlink, inside an index directory, to the generation holding the current
+# index and docstore.
+FAISS_CURRENT_LINK = ".current"
+
+FAISS_GENERATION_PREFIX = ".generation."
+
+VECTORSTORE_CACHE_SIZE = 8
+
+DOCSTORE_CACHE_SIZE = 1024
+
+KEY_EMBEDDING_EXECUTOR = "embedding_executor"
+
+EMBEDDING_BATCH_SIZE = 100
+
+EMBEDDING_MAX_CONCURRENCY = 4
+
+EMBEDDING_REQUESTS_PER_SECOND = 10.0
+
+EMBEDDING_MAX_RETRIES = 5
+
+EMBEDDING_BACKOFF_SECONDS = 1.0
+
+EMBEDDING_MAX_BACKOFF_SECONDS = 30.0
+
+DIR_TEMPLATES = "templates"
+
+DIR_STATIC = "static"
+
+INDEX_TEMPLATE = "index.html"
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Content-addressed store of uploads, kept inside each data directory so
+# session files can be hard links to it.
+DIR_BLOBS = ".blobs"
+
+# Artifact holding a document's extracted page text, see src/text_cache.py.
+PAGE_TEXT_FILE = "pages.bin"
+
+# Uploads larger than this are rejected while streaming, before they fill
+# the disk or memory.
+MAX_UPLOAD_BYTES = 1024 * 1024 * 1024
+
+API_PARSE_WORKERS = None
+
+API_MAX_PARSE_QUEUE = 32
+
+API_MAX_LLM_REQUESTS = 16
+
+API_MAX_LLM_QUEUE = 64
+
+API_MAX_INGEST_REQUESTS = 2
+
+API_MAX_INGEST_QUEUE = 8
+
+API_RETRY_AFTER_SECONDS = 5
+
+SESSION_ID_PATTERN = r"^[A-Za-z0-9_-]+$"
+
+DEFAULT_JOB_QUEUE_PATH = "data/jobs/jobs.sqlite3"
+
+DEFAULT_JOB_UPLOAD_DIR = "data/jobs/uploads"
+
+JOB_KIND_INGEST = "ingest"
+
+JOB_KIND_COMPARE = "compare"
+
+# Lanes in the order workers serve them.
+JOB_LANES = ("interactive", "default", "bulk")
+
+JOB_LANE_DEFAULT = "default"
+
+JOB_STATUS_QUEUED = "queued"
+
+JOB_STATUS_RUNNING = "running"
+
+JOB_STATUS_SUCCEEDED = "succeeded"
+
+JOB_STATUS_FAILED = "failed"
+
+JOB_POLL_SECONDS = 1.0
+
+JOB_STALE_SECONDS = 600
+
+# Must stay well below JOB_STALE_SECONDS.
+JOB_HEARTBEAT_SECONDS = 30
+
+JOB_MAX_ATTEMPTS = 3
+
+API_JOB_WORKERS = 2
@@ -1,33 +1,156 @@
 import os
+import re
 import sys
+from collections import Counter
 
 from AIFoundationKit.base.exception.custom_exception import AppException
 from AIFoundationKit.base.logger.custom_logger import get_logger
 from AIFoundationKit.base.logger.logger_utils import add_context
-from AIFoundationKit.rag.model_loader import ModelLoader
-from dotenv import load_dotenv
 from langchain_classic.output_parsers import OutputFixingParser
 from langchain_core.output_parsers import JsonOutputParser
 
 from model.models import Metadata
 from prompt.prompt_lib import PROMPT_REGISTRY
 from src.constants import (
+    ANALYSIS_CHUNK_TOKEN_BUDGET,
+    ANALYSIS_MAX_CONCURRENCY,
+    CHARS_PER_TOKEN,
     COMPONENT_DOCUMENT_ANALYSIS,
     CONFIG_DIR,
     CONFIG_FILE,
     ERR_DOC_ANALYSIS_INIT,
     MSG_DOC_ANALYSIS_INIT,
+    NOT_AVAILABLE_VALUES,
+    PDF_PAGE_HEADER_PATTERN,
 )
+from src.model_registry import get_model_registry
+from src.output_parsing import RepairingOutputParser, build_structured_output_chain
+
+
+def split_document_by_pages(
+    document_text: str, max_tokens: int = ANALYSIS_CHUNK_TOKEN_BUDGET
+) -> list[str]:
+    """
+    Split ``read_pdf`` output into chunks of whole pages within a token budget.
+
+    Pages are packed greedily in order; a single page larger than the budget
+    is split on character boundaries. Token counts are approximated as
+    ``CHARS_PER_TOKEN`` characters per token.
+    """
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+
+    starts = [
+        match.start() for match in re.finditer(PDF_PAGE_HEADER_PATTERN, document_text)
+    ]
+
+    if not starts or starts[0] != 0:
+
+        starts.insert(0, 0)
+
+    pages = [
+        document_text[start:end]
+        for start, end in zip(starts, starts[1:] + [len(document_text)])
+    ]
+
+    chunks, current = [], ""
+
+    for page in pages:
+
+        if current and len(current) + len(page) > max_chars:
+
+            chunks.append(current)
+
+            current = ""
+
+        while len(page) > max_chars:
+
+            chunks.append(page[:max_chars])
+
+            page = page[max_chars:]
+
+        current += page
+
+    if current or not chunks:
+
+        chunks.append(current)
+
+    return chunks
+
+
+def _is_informative(value) -> bool:
+
+    return str(value).strip().lower() not in NOT_AVAILABLE_VALUES
+
+
+def merge_metadata(partials: list[dict], page_count: int = None) -> dict:
+    """
+    Merge per-chunk ``Metadata`` results into a single result.
+
+    Summaries are concatenated without duplicates, ``SentimentTone`` is decided
+    by majority vote, ``PageCount`` is the number of pages in the document when
+    known, and every other field takes the most common informative value,
+    preferring earlier chunks on ties.
+    """
+
+    merged = {}
+
+    summary = []
+
+    for partial in partials:
+
+        items = partial.get("Summary") or []
+
+        if isinstance(items, str):
+
+            items = [items]
+
+        summary.extend(item for item in items if item not in summary)
+
+    merged["Summary"] = summary
+
+    for field in Metadata.model_fields:
+
+        if field in ("Summary", "PageCount"):
+
+            continue
+
+        values = [
+            partial[field]
+            for partial in partials
+            if field in partial and _is_informative(partial[field])
+        ]
+
+        # Counter.most_common keeps insertion order on ties.
+        merged[field] = Counter(values).most_common(1)[0][0] if values else ""
+
+    if page_count is None:
+
+        counts = [
+            int(partial["PageCount"])
+            for partial in partials
+            if str(partial.get("PageCount", "")).strip().isdigit()
+        ]
+
+        page_count = sum(counts) if counts else ""
+
+    merged["PageCount"] = page_count
+
+    return merged
 
 
 class DocumentAnalysis:
 
-    def __init__(self, config_path: str = None):
+    def __init__(
+        self,
+        config_path: str = None,
+        chunk_token_budget: int = ANALYSIS_CHUNK_TOKEN_BUDGET,
+        max_concurrency: int = ANALYSIS_MAX_CONCURRENCY,
+        structured_output: bool = False,
+    ):
 
         try:
 
-            load_dotenv()
-
             self.logger = get_logger(__name__)
 
             self.logger = add_context(
@@ -46,18 +169,26 @@ class DocumentAnalysis:
 
                 config_path = os.path.join(config_path, CONFIG_FILE)
 
-            self.loader = ModelLoader(config_path=config_path)
+            self.registry = get_model_registry(config_path)
 
-            self.llm = self.loader.load_llm()
+            self.llm = self.registry.get_llm()
 
             self.parser = JsonOutputParser(pydantic_object=Metadata)
 
-            self.fixing_parser = OutputFixingParser.from_llm(
-                parser=self.parser, llm=self.llm
-            )
-
             self.document_analysis_prompt = PROMPT_REGISTRY["document_analysis"]
 
+            self.chunk_token_budget = chunk_token_budget
+
+            self.max_concurrency = max_concurrency
+
+            self.structured_output = structured_output
+
+            self.chain = self.registry.get_chain(
+                "document_analysis",
+                self._build_chain,
+                variant="structured" if structured_output else "json",
+            )
+
             self.logger.info(MSG_DOC_ANALYSIS_INIT)
 
         except Exception as e:
@@ -66,23 +197,99 @@ class DocumentAnalysis:
 
             raise AppException(f"{ERR_DOC_ANALYSIS_INIT}:", sys) from e
 
+    def _build_chain(self, llm):
+
+        if self.structured_output:
+
+            return build_structured_output_chain(
+                self.document_analysis_prompt, llm, Metadata
+            )
+
+        # Malformed JSON is repaired locally first; the LLM-based fixer is
+        # only used when that fails.
+        output_parser = RepairingOutputParser(
+            pydantic_object=Metadata,
+            fixing_parser=OutputFixingParser.from_llm(parser=self.parser, llm=llm),
+        )
+
+        return self.document_analysis_prompt | llm | output_parser
+
+    def _chain_inputs(self, chunks: list[str]) -> list[dict]:
+
+        format_instructions = self.parser.get_format_instructions()
+
+        return [
+            {"format_instructions": format_instructions, "document_text": chunk}
+            for chunk in chunks
+        ]
+
+    def _page_count(self, document_text: str):
+
+        pages = re.findall(PDF_PAGE_HEADER_PATTERN, document_text)
+
+        return len(pages) or None
+
     def analyze_document(self, document_text: str) -> dict:
 
         self.logger.info("Document analysis started")
 
         try:
 
-            chain = self.document_analysis_prompt | self.llm | self.fixing_parser
+            chunks = split_document_by_pages(document_text, self.chunk_token_budget)
+
+            if len(chunks) == 1:
+
+                response = self.chain.invoke(self._chain_inputs(chunks)[0])
+
+            else:
+
+                self.logger.info("Analyzing document in %d chunks", len(chunks))
+
+                partials = self.chain.batch(
+                    self._chain_inputs(chunks),
+                    config={"max_concurrency": self.max_concurrency},
+                )
+
+                response = merge_metadata(partials, self._page_count(document_text))
 
             self.logger.info("Document analysis completed successfully")
 
-            response = chain.invoke(
-                {
-                    "format_instructions": self.parser.get_format_instructions(),
-                    "document_text": document_text,
-                }
+            return response
+
+        except Exception as e:
+
+            self.logger.error("Document analysis failed: %s", str(e))
+
+            raise AppException(f"Document analysis failed: {str(e)}") from e
+
+    async def aanalyze_document(self, document_text: str) -> dict:
+        """
+        Async variant of ``analyze_document``. Long documents are split into
+        page chunks that are analyzed concurrently, at most ``max_concurrency``
+        at a time, and the partial results are merged.
+        """
+
+        self.logger.info("Document analysis started")
+
+        try:
+
+            chunks = split_document_by_pages(document_text, self.chunk_token_budget)
+
+            partials = await self.chain.abatch(
+                self._chain_inputs(chunks),
+                config={"max_concurrency": self.max_concurrency},
             )
 
+            if len(partials) == 1:
+
+                response = partials[0]
+
+            else:
+
+                response = merge_metadata(partials, self._page_count(document_text))
+
+            self.logger.info("Document analysis completed successfully")
+
             return response
 
         except Exception as e:
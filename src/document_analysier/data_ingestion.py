@@ -1,4 +1,6 @@
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator
 
 import fitz
 from AIFoundationKit.base.exception.custom_exception import AppException
@@ -6,7 +8,9 @@ from AIFoundationKit.base.logger.custom_logger import get_logger
 from AIFoundationKit.base.logger.logger_utils import add_context
 from AIFoundationKit.base.utils import generate_session_id
 
+from src.blob_store import BlobStore
 from src.constants import (
+    DIR_BLOBS,
     DIR_DATA,
     DIR_DOCUMENT_ANALYSIS,
     ENV_DATA_STORAGE_PATH,
@@ -16,9 +20,49 @@ from src.constants import (
     ERR_PDF_READ,
     ERR_PDF_SAVE,
     FITZ_TEXT_MODE,
+    MIN_PAGES_PER_WORKER,
     MSG_DOC_HANDLER_INIT,
     MSG_PDF_SAVED,
+    PDF_PAGE_TEMPLATE,
 )
+from src.text_cache import TextCache
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> list[tuple[int, str]]:
+    """
+    Extract the text of pages ``[start, stop)`` of a PDF.
+
+    Defined at module level so it can run in a worker process; each worker
+    opens its own handle on the file.
+    """
+
+    with fitz.open(pdf_path) as pdf:
+
+        return [
+            (page_index + 1, pdf[page_index].get_text(FITZ_TEXT_MODE))
+            for page_index in range(start, stop)
+        ]
+
+
+def _split_page_ranges(page_count: int, workers: int) -> list[tuple[int, int]]:
+    """
+    Split ``page_count`` pages into contiguous ranges, a few per worker so
+    uneven pages still balance across the pool.
+    """
+
+    step = max(1, -(-page_count // (workers * 4)), MIN_PAGES_PER_WORKER)
+
+    return [
+        (start, min(start + step, page_count)) for start in range(0, page_count, step)
+    ]
+
+
+def _join_pages(pages) -> str:
+
+    return "\n".join(
+        PDF_PAGE_TEMPLATE.format(page_num=page_num, text=text)
+        for page_num, text in pages
+    )
 
 
 class DocumentHandler:
@@ -38,6 +82,10 @@ class DocumentHandler:
 
             self.session_path = os.path.join(self.data_dir, self.session_id)
 
+            self.blob_store = BlobStore(os.path.join(self.data_dir, DIR_BLOBS))
+
+            self.text_cache = TextCache(self.blob_store)
+
             if not os.path.exists(self.session_path):
 
                 os.makedirs(self.session_path)
@@ -53,24 +101,43 @@ class DocumentHandler:
             raise AppException(f"{ERR_DOC_HANDLER_INIT}: {str(e)}")
 
     def save_pdf(self, file_obj) -> str:
+        """
+        Save a PDF into the session directory and cache its text.
+
+        ``file_obj`` is a path, or an object with ``path`` and ``getbuffer``
+        (e.g. a Streamlit upload written to disk).
+        """
 
         try:
 
-            if not hasattr(file_obj, "path") or not hasattr(file_obj, "getbuffer"):
+            if isinstance(file_obj, (str, os.PathLike)):
+
+                source_path = os.fspath(file_obj)
+
+            elif hasattr(file_obj, "path") and hasattr(file_obj, "getbuffer"):
+
+                source_path = file_obj.path
+
+            else:
 
                 raise AppException(ERR_INVALID_FILE_OBJ)
 
-            if not os.path.exists(file_obj.path):
+            if not os.path.exists(source_path):
 
-                raise AppException(f"{ERR_PDF_NOT_FOUND}: {file_obj.path}")
+                raise AppException(f"{ERR_PDF_NOT_FOUND}: {source_path}")
 
-            pdf_name = os.path.basename(file_obj.path)
+            pdf_name = os.path.basename(source_path)
 
-            dest_path = os.path.join(self.session_path, pdf_name)
+            # Stream from the path rather than ``getbuffer``, so the PDF is
+            # never held in memory as a whole, and keep one copy per content.
+            blob = self.blob_store.put(source_path)
 
-            with open(dest_path, "wb") as f:
+            dest_path = self.blob_store.link(
+                blob.sha256, os.path.join(self.session_path, pdf_name)
+            )
 
-                f.write(file_obj.getbuffer())
+            # Extract the text once, for every later read of this content.
+            self.text_cache.ensure(blob.sha256, dest_path)
 
             self.logger.info(f"{MSG_PDF_SAVED}: {dest_path}")
 
@@ -82,23 +149,105 @@ class DocumentHandler:
 
             raise AppException(f"{ERR_PDF_SAVE}: {str(e)}")
 
-    def read_pdf(self, pdf_path: str) -> list[str]:
+    def iter_pdf_pages(self, pdf_path: str) -> Iterator[tuple[int, str]]:
+        """
+        Lazily yield ``(page_num, text)`` for each page of a PDF.
 
-        try:
+        Only one page's text is held at a time, so callers can stream long
+        documents into chunking or LLM calls.
+        """
 
-            text_chunks = []
+        try:
 
             with fitz.open(pdf_path) as pdf:
 
                 for page_num, page in enumerate(pdf, start=1):
 
-                    text = page.get_text(FITZ_TEXT_MODE)
+                    yield page_num, page.get_text(FITZ_TEXT_MODE)
+
+        except Exception as e:
+
+            self.logger.error(f"{ERR_PDF_READ}: {str(e)}")
+
+            raise AppException(f"{ERR_PDF_READ}: {str(e)}")
+
+    def iter_pdf_pages_parallel(
+        self, pdf_path: str, max_workers: int = None
+    ) -> Iterator[tuple[int, str]]:
+        """
+        Yield ``(page_num, text)`` in page order, extracting page ranges in
+        parallel over a process pool.
+        """
+
+        try:
+
+            with fitz.open(pdf_path) as pdf:
+
+                page_count = pdf.page_count
+
+            workers = min(
+                max_workers or os.cpu_count() or 1,
+                -(-page_count // MIN_PAGES_PER_WORKER),
+            )
+
+            if workers <= 1:
+
+                yield from _extract_page_range(pdf_path, 0, page_count)
+
+                return
+
+            ranges = _split_page_ranges(page_count, workers)
+
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+
+                for pages in executor.map(
+                    _extract_page_range,
+                    [pdf_path] * len(ranges),
+                    [start for start, _ in ranges],
+                    [stop for _, stop in ranges],
+                ):
+
+                    yield from pages
+
+        except Exception as e:
+
+            self.logger.error(f"{ERR_PDF_READ}: {str(e)}")
+
+            raise AppException(f"{ERR_PDF_READ}: {str(e)}")
+
+    def read_pdf(self, pdf_path: str, max_workers: int = 1) -> str:
+        """
+        Read the full text of a PDF with a page header before each page.
+
+        PDFs saved with ``save_pdf`` are read from the page-text cache.
+        Otherwise, with ``max_workers`` other than 1, pages are extracted in
+        parallel; ``None`` uses one worker per CPU.
+        """
+
+        try:
+
+            cached = self.text_cache.get(pdf_path)
+
+            if cached is not None:
+
+                with cached:
+
+                    return _join_pages(enumerate(cached, start=1))
+
+            if max_workers == 1:
+
+                pages = self.iter_pdf_pages(pdf_path)
+
+            else:
+
+                pages = self.iter_pdf_pages_parallel(pdf_path, max_workers=max_workers)
 
-                    text_chunks.append(f"\n--- Page {page_num}  ---\n{text}")
+            return _join_pages(pages)
 
-            text = "\n".join(text_chunks)
+        except AppException:
 
-            return text
+            # Already logged and wrapped by the page iterators.
+            raise
 
         except Exception as e:
 
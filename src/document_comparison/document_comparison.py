@@ -1,14 +1,30 @@
+import asyncio
+from typing import Callable, Optional
+
 import pandas as pd
 from AIFoundationKit.base.exception.custom_exception import AppException
 from AIFoundationKit.base.logger.custom_logger import get_logger
 from AIFoundationKit.base.logger.logger_utils import add_context
 from AIFoundationKit.base.utils import generate_session_id
-from AIFoundationKit.rag.model_loader import ModelLoader
-from dotenv import load_dotenv
 from langchain_classic.output_parsers import OutputFixingParser
 from langchain_core.output_parsers import JsonOutputParser
+from langchain_core.rate_limiters import InMemoryRateLimiter
 
+from model.models import ComparisonReport, SummaryResponse
 from prompt.prompt_lib import PROMPT_REGISTRY
+from src.constants import (
+    COMPARISON_MAX_CONCURRENCY,
+    COMPARISON_PAGES_PER_BATCH,
+    COMPARISON_REQUESTS_PER_SECOND,
+    PAGE_UNCHANGED,
+)
+from src.document_comparison.page_diff import (
+    align_pages,
+    build_changed_pages_prompt,
+    merge_page_changes,
+)
+from src.model_registry import DEFAULT_CONFIG_PATH, get_model_registry
+from src.output_parsing import RepairingOutputParser, build_structured_output_chain
 
 
 class DocumentComparisonWithLLM:
@@ -19,36 +35,72 @@ class DocumentComparisonWithLLM:
     and output parsers required for structural comparison of document content.
     """
 
-    def __init__(self):
+    def __init__(
+        self, structured_output: bool = False, config_path: str = DEFAULT_CONFIG_PATH
+    ):
         """
         Initializes the DocumentComparisonWithLLM class.
 
-        Sets up the environment, logger, LLM loader, prompts, and output parsing chain.
-        """
+        Sets up the logger and fetches the shared LLM client and output parsing
+        chain from the process-wide model registry.
 
-        load_dotenv()
+        Args:
+            structured_output (bool): Use the provider's native structured output
+                                      instead of prompting for JSON.
+            config_path (str): Path to the config file. Defaults to the
+                               project's config/config.yaml.
+        """
 
         self.logger = get_logger(__name__)
 
         self.logger = add_context(self.logger, session_id=generate_session_id())
 
-        self.model_loader = ModelLoader()
+        self.registry = get_model_registry(config_path)
 
-        self.llm = self.model_loader.load_llm()
+        self.llm = self.registry.get_llm()
 
         self.prompt = PROMPT_REGISTRY.get("document_comparison")
 
         self.output_parser = JsonOutputParser()
 
-        self.parser = OutputFixingParser.from_llm(
-            llm=self.llm,
-            parser=self.output_parser,
-        )
+        self.structured_output = structured_output
 
-        self.chain = self.prompt | self.llm | self.parser
+        self.chain = self.registry.get_chain(
+            "document_comparison",
+            self._build_chain,
+            variant="structured" if structured_output else "json",
+        )
 
         self.logger.info("Document comparison with LLM initialized successfully")
 
+    def _build_chain(self, llm):
+        """
+        Builds the comparison chain for the shared LLM client.
+
+        Args:
+            llm: The LLM client returned by the model registry.
+
+        Returns:
+            Runnable: The prompt, LLM and output parser chain.
+        """
+
+        if self.structured_output:
+
+            return build_structured_output_chain(
+                self.prompt, llm, ComparisonReport, field="changes"
+            )
+
+        # Malformed JSON is repaired locally first; the LLM-based fixer is
+        # only used when that fails.
+        parser = RepairingOutputParser(
+            pydantic_object=SummaryResponse,
+            fixing_parser=OutputFixingParser.from_llm(
+                llm=llm, parser=self.output_parser
+            ),
+        )
+
+        return self.prompt | llm | parser
+
     def compare_documents(self, combined_docs: str):
         """
         Compares two provided document texts using the configured LLM chain.
@@ -83,6 +135,171 @@ class DocumentComparisonWithLLM:
 
             raise AppException(f"Failed to compare documents: {str(e)}") from e
 
+    def compare_document_pages(
+        self, reference_text: str, actual_text: str
+    ) -> pd.DataFrame:
+        """
+        Compares two documents page by page, sending only changed pages to the LLM.
+
+        Pages are aligned locally by the hash of their normalized text. Identical
+        pages are reported as 'NO CHANGE' without an LLM call, and the remaining
+        page pairs are sent together with their line diff.
+
+        Args:
+            reference_text (str): The extracted text of the reference document.
+            actual_text (str): The extracted text of the actual document.
+
+        Returns:
+            pd.DataFrame: One ``ChangeFormat`` row per page, in page order.
+
+        Raises:
+            AppException: If the comparison process fails.
+        """
+
+        try:
+
+            diffs = align_pages(reference_text, actual_text)
+
+            changed = [diff for diff in diffs if diff.status != PAGE_UNCHANGED]
+
+            self.logger.info(
+                "Page diff found %d changed of %d pages", len(changed), len(diffs)
+            )
+
+            llm_rows = []
+
+            if changed:
+
+                format_instruction = self.output_parser.get_format_instructions()
+
+                llm_rows = self.chain.invoke(
+                    {
+                        "combined_docs": build_changed_pages_prompt(changed),
+                        "format_instruction": format_instruction,
+                    }
+                )
+
+            rows = merge_page_changes(diffs, llm_rows or [])
+
+            response = SummaryResponse.model_validate(rows).model_dump()
+
+            self.logger.info("Documents compared successfully")
+
+            return self._format_response(response)
+
+        except Exception as e:
+
+            self.logger.error("Failed to compare documents: %s", e)
+
+            raise AppException(f"Failed to compare documents: {str(e)}") from e
+
+    async def acompare_documents(
+        self,
+        reference_text: str,
+        actual_text: str,
+        pages_per_batch: int = COMPARISON_PAGES_PER_BATCH,
+        max_concurrency: int = COMPARISON_MAX_CONCURRENCY,
+        requests_per_second: float = COMPARISON_REQUESTS_PER_SECOND,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> pd.DataFrame:
+        """
+        Asynchronously compares two documents in concurrent page-aligned batches.
+
+        Pages are aligned as in ``compare_document_pages``. Changed pages are
+        grouped into batches of ``pages_per_batch`` which run concurrently
+        through the chain, at most ``max_concurrency`` at a time and no faster
+        than ``requests_per_second``. The rows are returned in page order.
+
+        Args:
+            reference_text (str): The extracted text of the reference document.
+            actual_text (str): The extracted text of the actual document.
+            pages_per_batch (int): Number of changed pages per LLM call.
+            max_concurrency (int): Maximum number of in-flight LLM calls.
+            requests_per_second (float): Maximum rate of LLM calls.
+            on_progress (Callable[[int, int], None], optional): Called with the
+                                                                number of done
+                                                                and total
+                                                                batches after
+                                                                each batch.
+
+        Returns:
+            pd.DataFrame: One ``ChangeFormat`` row per page, in page order.
+
+        Raises:
+            AppException: If the comparison process fails.
+        """
+
+        try:
+
+            diffs = align_pages(reference_text, actual_text)
+
+            changed = [diff for diff in diffs if diff.status != PAGE_UNCHANGED]
+
+            batches = [
+                changed[start : start + pages_per_batch]
+                for start in range(0, len(changed), pages_per_batch)
+            ]
+
+            self.logger.info(
+                "Comparing %d changed of %d pages in %d batches",
+                len(changed),
+                len(diffs),
+                len(batches),
+            )
+
+            semaphore = asyncio.Semaphore(max_concurrency)
+
+            rate_limiter = InMemoryRateLimiter(
+                requests_per_second=requests_per_second,
+                check_every_n_seconds=0.05,
+                max_bucket_size=max_concurrency,
+            )
+
+            format_instruction = self.output_parser.get_format_instructions()
+
+            done = 0
+
+            async def compare_batch(batch):
+
+                nonlocal done
+
+                async with semaphore:
+
+                    await rate_limiter.aacquire()
+
+                    rows = await self.chain.ainvoke(
+                        {
+                            "combined_docs": build_changed_pages_prompt(batch),
+                            "format_instruction": format_instruction,
+                        }
+                    )
+
+                done += 1
+
+                if on_progress is not None:
+
+                    on_progress(done, len(batches))
+
+                return [rows] if isinstance(rows, dict) else list(rows or [])
+
+            results = await asyncio.gather(*(compare_batch(b) for b in batches))
+
+            llm_rows = [row for rows in results for row in rows]
+
+            rows = merge_page_changes(diffs, llm_rows)
+
+            response = SummaryResponse.model_validate(rows).model_dump()
+
+            self.logger.info("Documents compared successfully")
+
+            return self._format_response(response)
+
+        except Exception as e:
+
+            self.logger.error("Failed to compare documents: %s", e)
+
+            raise AppException(f"Failed to compare documents: {str(e)}") from e
+
     def _format_response(self, response: list[dict]) -> pd.DataFrame:
         """
         Formats the LLM response. Currently returns the response as is.
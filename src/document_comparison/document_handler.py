@@ -8,7 +8,9 @@ from AIFoundationKit.base.logger.custom_logger import get_logger
 from AIFoundationKit.base.logger.logger_utils import add_context
 from AIFoundationKit.base.utils import generate_session_id
 
-from src.constants import ERR_DOC_HANDLER_INIT
+from src.blob_store import BlobStore
+from src.constants import DIR_BLOBS, ERR_DOC_HANDLER_INIT
+from src.text_cache import TextCache, format_file_text
 
 
 class DocumentComparisonHandler:
@@ -60,6 +62,11 @@ class DocumentComparisonHandler:
             self.file_path = base_dir / self.session_id
             self.file_path.mkdir(parents=True, exist_ok=True)
 
+            # Saved files are links to a store shared by all sessions, which
+            # also caches their extracted text.
+            self.blob_store = BlobStore(str(base_dir / DIR_BLOBS))
+            self.text_cache = TextCache(self.blob_store)
+
             self.logger.info(
                 "Document comparison handler initialized with storage: %s",
                 self.file_path,
@@ -143,6 +150,10 @@ class DocumentComparisonHandler:
         """
         Helper method to process and save a single file.
 
+        The content is streamed to disk in chunks, so large files are never
+        held in memory as a whole, and its text is extracted into the cache
+        read by ``read_file``.
+
         Args:
             file_input (Union[str, BinaryIO, bytes]): The file content or path.
             file_name (str, optional): Name for the file.
@@ -157,22 +168,24 @@ class DocumentComparisonHandler:
             if not file_name:
                 file_name = os.path.basename(file_input)
 
-            with open(file_input, "rb") as f:
-                file_content = f.read()
-
-            saved_path = self.file_manager.save_file(
-                file_content, str(self.file_path), file_name=file_name
-            )
-            return str(saved_path)
+        elif not file_name:
+            file_name = getattr(file_input, "name", None)
+            if not file_name:
+                raise ValueError(
+                    "File name must be provided if the file has no name attribute"
+                )
 
-        saved_path = self.file_manager.save_file(
-            file_input, str(self.file_path), file_name=file_name
+        blob = self.blob_store.put(file_input)
+        saved_path = self.blob_store.link(
+            blob.sha256, os.path.join(self.file_path, os.path.basename(file_name))
         )
-        return str(saved_path)
+        self.text_cache.ensure(blob.sha256, saved_path)
+        return str(Path(saved_path).resolve())
 
     def read_file(self, file_path: str) -> str:
         """
-        Reads the content of a file.
+        Reads the content of a file, from the text cache if it was saved by
+        this handler.
 
         Args:
             file_path (str): The path to the file to be read.
@@ -183,6 +196,14 @@ class DocumentComparisonHandler:
 
         try:
 
+            cached = self.text_cache.get(file_path)
+
+            if cached is not None:
+
+                with cached:
+
+                    return format_file_text(file_path, cached)
+
             return self.file_manager.read_file(file_path)
 
         except Exception as e:
@@ -243,7 +264,7 @@ class DocumentComparisonHandler:
                 [
                     folder
                     for folder in self.file_path.parent.iterdir()
-                    if folder.is_dir()
+                    if folder.is_dir() and folder.name != DIR_BLOBS
                 ],
                 reverse=True,
             )
@@ -252,6 +273,7 @@ class DocumentComparisonHandler:
                     file.unlink()
                 folder.rmdir()
                 self.logger.info("Removed old session: %s", folder)
+            self.blob_store.gc()
         except Exception as e:
             self.logger.error("Failed to clean old sessions: %s", e)
             raise AppException(f"Failed to clean old sessions: {str(e)}") from e
@@ -0,0 +1,263 @@
+import difflib
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import List, Optional, Union
+
+from src.constants import (
+    FILE_MANAGER_PAGE_PATTERN,
+    NO_CHANGE,
+    PAGE_ADDED,
+    PAGE_CHANGED,
+    PAGE_REMOVED,
+    PAGE_UNCHANGED,
+)
+
+
+@dataclass
+class PageDiff:
+    """
+    Alignment of one reference page with one actual page.
+
+    Either side is None when the page was added or removed. ``page`` is a
+    unique id: the actual page number, or ``R<n>`` for reference page ``n``
+    when it was removed.
+    """
+
+    page: str
+
+    status: str
+
+    reference_page: Optional[int] = None
+
+    actual_page: Optional[int] = None
+
+    reference_text: str = ""
+
+    actual_text: str = ""
+
+    diff: str = ""
+
+
+def split_pages(text: str) -> List[str]:
+    """
+    Split text produced by ``BaseFileManager.read_file`` into pages.
+
+    Args:
+        text (str): Extracted document text with ``Page N:`` headers.
+
+    Returns:
+        List[str]: The text of each page. Text without page headers is
+                   returned as a single page.
+    """
+    parts = re.split(FILE_MANAGER_PAGE_PATTERN, text)
+    if len(parts) == 1:
+        return [text]
+
+    # re.split with one group yields [preamble, num, body, num, body, ...].
+    return [body.rstrip("\n") for body in parts[2::2]]
+
+
+def normalize_page(text: str) -> str:
+    """
+    Normalize page text so that whitespace-only differences compare equal.
+
+    Args:
+        text (str): Page text.
+
+    Returns:
+        str: Text with runs of whitespace collapsed to single spaces.
+    """
+    return " ".join(text.split())
+
+
+def page_id(reference_page: Optional[int], actual_page: Optional[int]) -> str:
+    """
+    Unique id of an aligned page pair, see ``PageDiff.page``.
+    """
+    if actual_page is None:
+        return f"R{reference_page}"
+    return str(actual_page)
+
+
+def _page_hash(text: str) -> str:
+    return hashlib.sha256(normalize_page(text).encode("utf-8")).hexdigest()
+
+
+def _line_diff(reference_text: str, actual_text: str) -> str:
+    return "\n".join(
+        difflib.unified_diff(
+            reference_text.splitlines(),
+            actual_text.splitlines(),
+            fromfile="reference",
+            tofile="actual",
+            lineterm="",
+            n=1,
+        )
+    )
+
+
+def align_pages(reference_text: str, actual_text: str) -> List[PageDiff]:
+    """
+    Align the pages of two documents and classify each page.
+
+    Pages are matched by the hash of their normalized text using
+    ``difflib.SequenceMatcher``, so inserted or deleted pages do not shift
+    every following page into a spurious change. Unmatched pages inside a
+    replaced block are paired in order and carry a line-level diff.
+
+    Removed pages follow the actual page they were removed after.
+
+    Args:
+        reference_text (str): Text of the reference document.
+        actual_text (str): Text of the actual document.
+
+    Returns:
+        List[PageDiff]: One entry per aligned page, in document order.
+    """
+    reference_pages = split_pages(reference_text)
+    actual_pages = split_pages(actual_text)
+
+    matcher = difflib.SequenceMatcher(
+        None,
+        [_page_hash(page) for page in reference_pages],
+        [_page_hash(page) for page in actual_pages],
+        autojunk=False,
+    )
+
+    diffs: List[PageDiff] = []
+    for tag, ref_start, ref_end, act_start, act_end in matcher.get_opcodes():
+        ref_span = range(ref_start, ref_end)
+        act_span = range(act_start, act_end)
+
+        if tag == "equal":
+            for ref_index, act_index in zip(ref_span, act_span):
+                diffs.append(
+                    PageDiff(
+                        page=page_id(ref_index + 1, act_index + 1),
+                        status=PAGE_UNCHANGED,
+                        reference_page=ref_index + 1,
+                        actual_page=act_index + 1,
+                    )
+                )
+            continue
+
+        for offset in range(max(len(ref_span), len(act_span))):
+            ref_index = ref_start + offset if offset < len(ref_span) else None
+            act_index = act_start + offset if offset < len(act_span) else None
+            ref_page = reference_pages[ref_index] if ref_index is not None else ""
+            act_page = actual_pages[act_index] if act_index is not None else ""
+
+            if ref_index is None:
+                status = PAGE_ADDED
+            elif act_index is None:
+                status = PAGE_REMOVED
+            else:
+                status = PAGE_CHANGED
+
+            reference_page = None if ref_index is None else ref_index + 1
+            actual_page = None if act_index is None else act_index + 1
+            diffs.append(
+                PageDiff(
+                    page=page_id(reference_page, actual_page),
+                    status=status,
+                    reference_page=reference_page,
+                    actual_page=actual_page,
+                    reference_text=ref_page,
+                    actual_text=act_page,
+                    diff=_line_diff(ref_page, act_page),
+                )
+            )
+
+    return diffs
+
+
+def build_changed_pages_prompt(diffs: List[PageDiff]) -> str:
+    """
+    Render only the changed pages as the ``combined_docs`` prompt input.
+
+    Args:
+        diffs (List[PageDiff]): Output of ``align_pages``.
+
+    Returns:
+        str: Prompt text describing each changed page pair and its line diff.
+    """
+    sections = []
+    for diff in diffs:
+        if diff.status == PAGE_UNCHANGED:
+            continue
+        sections.append(
+            f"Page {diff.page} ({diff.status}; reference page "
+            f"{diff.reference_page or '-'}, actual page {diff.actual_page or '-'}):\n"
+            f"Reference:\n{diff.reference_text}\n"
+            f"Actual:\n{diff.actual_text}\n"
+            f"Line diff:\n{diff.diff}"
+        )
+    if any(diff.status == PAGE_REMOVED for diff in diffs):
+        sections.insert(
+            0,
+            "Removed pages have ids like R3 (page 3 of the reference); report "
+            "their changes under that id, e.g. Page R3.",
+        )
+    return "\n\n".join(sections)
+
+
+def parse_page_id(page: object) -> Optional[str]:
+    """
+    Extract the page id from an LLM ``Page`` value such as ``"Page 3"`` or
+    ``"Page R4"``.
+
+    Args:
+        page (object): The ``Page`` value of a ``ChangeFormat`` row.
+
+    Returns:
+        Optional[str]: The first page id found, or None.
+    """
+    match = re.search(r"(?<![A-Za-z])(R?)\s*(\d+)", str(page), re.IGNORECASE)
+    if match is None:
+        return None
+    return match.group(1).upper() + str(int(match.group(2)))
+
+
+def merge_page_changes(
+    diffs: List[PageDiff], llm_rows: Union[List[dict], dict]
+) -> List[dict]:
+    """
+    Combine deterministic ``NO CHANGE`` rows with LLM rows for changed pages.
+
+    LLM rows for pages that the diff found identical are dropped, and changed
+    pages the LLM did not report fall back to their line diff.
+
+    Args:
+        diffs (List[PageDiff]): Output of ``align_pages``.
+        llm_rows (Union[List[dict], dict]): ``ChangeFormat`` rows returned by
+                                            the LLM.
+
+    Returns:
+        List[dict]: ``ChangeFormat`` rows in the order of ``diffs``, keyed by
+                    ``PageDiff.page``.
+    """
+    changed = {diff.page: diff for diff in diffs if diff.status != PAGE_UNCHANGED}
+    if isinstance(llm_rows, dict):
+        llm_rows = [llm_rows]
+
+    rows_by_page = {}
+    for row in llm_rows:
+        page = parse_page_id(row.get("Page"))
+        if page in changed:
+            rows_by_page.setdefault(page, []).append(
+                {"Page": page, "changes": str(row.get("changes", ""))}
+            )
+
+    rows = []
+    for diff in diffs:
+        if diff.status == PAGE_UNCHANGED:
+            rows.append({"Page": diff.page, "changes": NO_CHANGE})
+        elif diff.page in rows_by_page:
+            rows.extend(rows_by_page.pop(diff.page))
+        else:
+            rows.append(
+                {"Page": diff.page, "changes": diff.diff or diff.status.upper()}
+            )
+
+    return rows
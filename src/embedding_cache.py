@@ -0,0 +1,266 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_core.embeddings import Embeddings
+
+from src.constants import DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES
+from src.embedding_executor import EmbeddingExecutor
+
+logger = get_logger(__name__)
+
+
+def resolve_model_name(embedding_model: Any) -> str:
+    """
+    Best-effort name of an embedding model, used to namespace cache keys.
+
+    Args:
+        embedding_model (Any): The embedding model.
+
+    Returns:
+        str: The configured model name, or the class name as a fallback.
+    """
+    if isinstance(embedding_model, EmbeddingExecutor):
+        # Batching does not change the vectors, so share the model's entries.
+        embedding_model = embedding_model.embedding_model
+    for attr in ("model", "model_name"):
+        value = getattr(embedding_model, attr, None)
+        if isinstance(value, str) and value:
+            return value
+    return type(embedding_model).__name__
+
+
+def embedding_cache_key(model_name: str, text: str) -> str:
+    """
+    Compute the cache key for a text embedded with a given model.
+
+    Args:
+        model_name (str): Name of the embedding model.
+        text (str): The embedded text.
+
+    Returns:
+        str: sha256 hex digest of the model name and text.
+    """
+    return hashlib.sha256(f"{model_name}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent, size-bounded store of embedding vectors backed by SQLite.
+
+    Vectors are stored as float32 blobs keyed by ``embedding_cache_key``. Each
+    hit refreshes the entry's access time, and once the store grows past
+    ``max_entries`` the least recently used entries are evicted.
+    """
+
+    def __init__(
+        self,
+        cache_path: str,
+        max_entries: int = DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Initializes the EmbeddingCache.
+
+        Args:
+            cache_path (str): Path of the SQLite database file.
+            max_entries (int): Maximum number of vectors kept on disk.
+        """
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access "
+                "ON embeddings (last_access)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.cache_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        """
+        Look up vectors for the given keys.
+
+        Args:
+            keys (List[str]): Cache keys to look up.
+
+        Returns:
+            Dict[str, List[float]]: Vectors for the keys that were found.
+        """
+        found: Dict[str, List[float]] = {}
+        if not keys:
+            return found
+
+        unique_keys = list(dict.fromkeys(keys))
+        with self._lock, self._connect() as conn:
+            # Stay well below SQLite's bound-parameter limit.
+            for start in range(0, len(unique_keys), 500):
+                batch = unique_keys[start : start + 500]
+                placeholders = ",".join("?" * len(batch))
+                query = (
+                    "SELECT key, vector FROM embeddings "
+                    f"WHERE key IN ({placeholders})"
+                )
+                rows = conn.execute(query, batch).fetchall()
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embeddings SET last_access = ? WHERE key = ?",
+                    [(now, key) for key in found],
+                )
+        return found
+
+    def put_many(self, items: Dict[str, List[float]]) -> None:
+        """
+        Store vectors and evict the least recently used entries if needed.
+
+        Args:
+            items (Dict[str, List[float]]): Vectors keyed by cache key.
+        """
+        if not items:
+            return
+
+        now = time.time()
+        rows = [
+            (key, np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for key, vector in items.items()
+        ]
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, last_access) "
+                "VALUES (?, ?, ?)",
+                rows,
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY last_access ASC LIMIT ?)",
+            (overflow,),
+        )
+        logger.info("Evicted %d entries from embedding cache", overflow)
+
+    def __len__(self) -> int:
+        with self._connect() as conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()
+        return count
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that serves document vectors from an ``EmbeddingCache``.
+
+    Only texts missing from the cache are sent to the wrapped model. Query
+    embeddings are passed straight through, since some providers embed
+    queries differently from documents.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings,
+        cache: EmbeddingCache,
+        model_name: Optional[str] = None,
+    ):
+        """
+        Initializes the CachedEmbeddings wrapper.
+
+        Args:
+            embedding_model (Embeddings): The embedding model to wrap.
+            cache (EmbeddingCache): The cache to read from and write to.
+            model_name (str, optional): Name used to namespace cache keys.
+                                        Defaults to the wrapped model's name.
+        """
+        self.embedding_model = embedding_model
+        self.cache = cache
+        self.model_name = model_name or resolve_model_name(embedding_model)
+        self.hits = 0
+        self.misses = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [embedding_cache_key(self.model_name, text) for text in texts]
+        cached = self.cache.get_many(keys)
+
+        missing = {key: text for key, text in zip(keys, texts) if key not in cached}
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            missing_keys = list(missing)
+            missing_texts = list(missing.values())
+            if isinstance(self.embedding_model, EmbeddingExecutor):
+                # Store each batch as it finishes, so vectors embedded before
+                # a failure are not requested again when the ingest is retried.
+                vectors = self.embedding_model.embed_documents(
+                    missing_texts,
+                    on_batch=lambda start, batch: self.cache.put_many(
+                        dict(zip(missing_keys[start : start + len(batch)], batch))
+                    ),
+                )
+            else:
+                vectors = self.embedding_model.embed_documents(missing_texts)
+                self.cache.put_many(dict(zip(missing_keys, vectors)))
+            cached.update(zip(missing_keys, vectors))
+
+        logger.info(
+            "Embedding cache: %d hits, %d misses",
+            len(texts) - len(missing),
+            len(missing),
+        )
+        return [cached[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embedding_model.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embedding_model.aembed_query(text)
+
+
+def with_embedding_cache(
+    embedding_model: Embeddings,
+    cache_path: Optional[str],
+    max_entries: int = DEFAULT_EMBEDDING_CACHE_MAX_ENTRIES,
+) -> Embeddings:
+    """
+    Wrap an embedding model with a persistent cache.
+
+    Args:
+        embedding_model (Embeddings): The embedding model to wrap.
+        cache_path (Optional[str]): Path of the cache database. If None, the
+                                    model is returned unchanged.
+        max_entries (int): Maximum number of cached vectors.
+
+    Returns:
+        Embeddings: The cached model, or the original one.
+    """
+    if cache_path is None or isinstance(embedding_model, CachedEmbeddings):
+        return embedding_model
+    return CachedEmbeddings(embedding_model, EmbeddingCache(cache_path, max_entries))
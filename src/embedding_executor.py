@@ -0,0 +1,207 @@
+import random
+import time
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_core.embeddings import Embeddings
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from src.constants import (
+    EMBEDDING_BACKOFF_SECONDS,
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_MAX_BACKOFF_SECONDS,
+    EMBEDDING_MAX_CONCURRENCY,
+    EMBEDDING_MAX_RETRIES,
+    EMBEDDING_REQUESTS_PER_SECOND,
+)
+
+logger = get_logger(__name__)
+
+# Called with the offset of a finished batch and its vectors.
+BatchCallback = Callable[[int, List[List[float]]], None]
+
+
+class EmbeddingExecutor(Embeddings):
+    """
+    Embeddings wrapper that embeds documents in concurrent, rate-limited
+    batches and retries failed batches with exponential backoff.
+
+    Requests are paced by a token bucket, so a large ingest keeps the
+    provider quota busy without tripping its rate limit. A callback is
+    invoked as each batch finishes, which ``CachedEmbeddings`` uses to
+    checkpoint vectors so a failed ingest resumes where it stopped.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings,
+        batch_size: int = EMBEDDING_BATCH_SIZE,
+        max_concurrency: int = EMBEDDING_MAX_CONCURRENCY,
+        requests_per_second: Optional[float] = EMBEDDING_REQUESTS_PER_SECOND,
+        max_retries: int = EMBEDDING_MAX_RETRIES,
+        backoff_seconds: float = EMBEDDING_BACKOFF_SECONDS,
+        max_backoff_seconds: float = EMBEDDING_MAX_BACKOFF_SECONDS,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ):
+        """
+        Initializes the EmbeddingExecutor.
+
+        Args:
+            embedding_model (Embeddings): The embedding model to wrap.
+            batch_size (int): Number of texts per embedding request.
+            max_concurrency (int): Maximum number of in-flight requests.
+            requests_per_second (Optional[float]): Maximum request rate; None
+                                                   or 0 disables the limit.
+            max_retries (int): Retries per batch before the ingest fails.
+            backoff_seconds (float): Delay before the first retry, doubled on
+                                     each further attempt.
+            max_backoff_seconds (float): Upper bound of the retry delay.
+            on_progress (Callable[[int, int], None], optional): Called with the
+                                                                number of
+                                                                embedded and
+                                                                total texts
+                                                                after each batch.
+        """
+        self.embedding_model = embedding_model
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.max_backoff_seconds = max_backoff_seconds
+        self.on_progress = on_progress
+        self.rate_limiter = None
+        if requests_per_second:
+            self.rate_limiter = InMemoryRateLimiter(
+                requests_per_second=requests_per_second,
+                check_every_n_seconds=0.05,
+                max_bucket_size=self.max_concurrency,
+            )
+        self.retries = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        embedding_model: Embeddings,
+        config: Optional[Dict[str, Any]] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> "EmbeddingExecutor":
+        """
+        Build an executor from the ``embedding_executor`` config section.
+        """
+        return cls(embedding_model, **(config or {}), on_progress=on_progress)
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.max_backoff_seconds, self.backoff_seconds * 2**attempt)
+        # Full jitter keeps concurrent batches from retrying in lockstep.
+        return random.uniform(0, delay)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        for attempt in range(self.max_retries + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                return self.embedding_model.embed_documents(texts)
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                self.retries += 1
+                logger.warning(
+                    "Embedding batch of %d failed (attempt %d), retrying in %.1fs: %s",
+                    len(texts),
+                    attempt + 1,
+                    delay,
+                    e,
+                )
+                time.sleep(delay)
+
+    def embed_documents(
+        self, texts: List[str], on_batch: Optional[BatchCallback] = None
+    ) -> List[List[float]]:
+        """
+        Embed texts in concurrent batches, preserving their order.
+
+        Args:
+            texts (List[str]): The texts to embed.
+            on_batch (Optional[BatchCallback]): Called with the offset and
+                                                vectors of each finished batch.
+
+        Returns:
+            List[List[float]]: One vector per text.
+        """
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        starts = range(0, len(texts), self.batch_size)
+        if not starts:
+            return []
+
+        errors = []
+        embedded = 0
+        workers = min(self.max_concurrency, len(starts))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = {
+                executor.submit(
+                    self._embed_batch, texts[start : start + self.batch_size]
+                ): start
+                for start in starts
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_EXCEPTION)
+                for future in done:
+                    start = pending.pop(future)
+                    if future.cancelled():
+                        continue
+                    if future.exception() is not None:
+                        errors.append(future.exception())
+                        continue
+                    batch_vectors = future.result()
+                    vectors[start : start + len(batch_vectors)] = batch_vectors
+                    if on_batch is not None:
+                        on_batch(start, batch_vectors)
+                    embedded += len(batch_vectors)
+                    if self.on_progress is not None:
+                        self.on_progress(embedded, len(texts))
+                if errors:
+                    # Stop queued batches, but still collect the running ones
+                    # so their vectors reach the checkpoint.
+                    for future in pending:
+                        future.cancel()
+
+        if errors:
+            raise errors[0]
+
+        logger.info(
+            "Embedded %d texts in %d batches (%d retries)",
+            len(texts),
+            len(starts),
+            self.retries,
+        )
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embedding_model.embed_query(text)
+
+    async def aembed_query(self, text: str) -> List[float]:
+        return await self.embedding_model.aembed_query(text)
+
+
+def with_embedding_executor(
+    embedding_model: Embeddings,
+    config: Optional[Dict[str, Any]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> Embeddings:
+    """
+    Wrap an embedding model with an ``EmbeddingExecutor``, unless it already is.
+
+    Args:
+        embedding_model (Embeddings): The embedding model to wrap.
+        config (Optional[Dict[str, Any]]): The ``embedding_executor`` section.
+        on_progress (Callable[[int, int], None], optional): Progress callback
+                                                            of a new executor.
+
+    Returns:
+        Embeddings: The wrapped model.
+    """
+    if isinstance(embedding_model, EmbeddingExecutor):
+        return embedding_model
+    return EmbeddingExecutor.from_config(embedding_model, config, on_progress)
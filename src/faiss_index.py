@@ -0,0 +1,231 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+import faiss
+import numpy as np
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from src.constants import (
+    DEFAULT_FAISS_INDEX_CONFIG,
+    FAISS_INDEX_TYPES,
+    MIN_TRAINING_POINTS_PER_LIST,
+)
+
+logger = get_logger(__name__)
+
+
+def resolve_index_config(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Merge a ``faiss_db`` config section over the defaults and validate it.
+
+    Args:
+        config (Optional[Dict[str, Any]]): The ``faiss_db`` section.
+
+    Returns:
+        Dict[str, Any]: The complete index configuration.
+
+    Raises:
+        ValueError: If ``index_type`` is not supported.
+    """
+    resolved = dict(DEFAULT_FAISS_INDEX_CONFIG)
+    resolved.update(
+        {key: value for key, value in (config or {}).items() if key in resolved}
+    )
+    if resolved["index_type"] not in FAISS_INDEX_TYPES:
+        raise ValueError(
+            f"Unsupported FAISS index type {resolved['index_type']!r}, "
+            f"expected one of {FAISS_INDEX_TYPES}"
+        )
+    return resolved
+
+
+def _nlist(config: Dict[str, Any], num_vectors: int) -> int:
+    # Fewer lists than requested when the corpus is too small to train them.
+    return max(1, min(config["nlist"], num_vectors // MIN_TRAINING_POINTS_PER_LIST))
+
+
+def _factory_string(config: Dict[str, Any], num_vectors: int) -> str:
+    index_type = config["index_type"]
+    if index_type == "flat":
+        return "Flat"
+    if index_type == "hnsw":
+        return f"HNSW{config['hnsw_m']}"
+    if index_type == "sq8":
+        return "SQ8"
+
+    nlist = _nlist(config, num_vectors)
+    if index_type == "ivf_flat":
+        return f"IVF{nlist},Flat"
+    if num_vectors < 2 ** config["pq_nbits"]:
+        # PQ needs one training vector per centroid; exact search is cheap
+        # at this size anyway.
+        logger.info(
+            "%d vectors are too few to train PQ%dx%d, using a flat index",
+            num_vectors,
+            config["pq_m"],
+            config["pq_nbits"],
+        )
+        return "Flat"
+    return f"IVF{nlist},PQ{config['pq_m']}x{config['pq_nbits']}"
+
+
+def apply_search_params(index: Any, config: Optional[Dict[str, Any]]) -> None:
+    """
+    Set the query-time knobs (``nprobe`` for IVF, ``efSearch`` for HNSW).
+
+    These are not reliably persisted with the index, so they are applied
+    again after every load.
+    """
+    config = resolve_index_config(config)
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.nprobe = min(config["nprobe"], ivf.nlist)
+    if hasattr(index, "hnsw"):
+        index.hnsw.efSearch = config["ef_search"]
+
+
+def create_faiss_index(
+    vectors: np.ndarray, config: Optional[Dict[str, Any]] = None
+) -> Any:
+    """
+    Create and train an empty FAISS index of the configured type.
+
+    IVF and PQ indexes are trained on a random sample of at most
+    ``train_sample_size`` vectors; an ``ivf_pq`` index over fewer vectors
+    than PQ centroids is created flat instead. IVF indexes get a direct map so stored
+    vectors can still be reconstructed (used by MMR and compression).
+
+    Args:
+        vectors (np.ndarray): The vectors about to be indexed, one per row.
+        config (Optional[Dict[str, Any]]): The ``faiss_db`` section.
+
+    Returns:
+        Any: The trained, empty ``faiss.Index``.
+    """
+    config = resolve_index_config(config)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    factory = _factory_string(config, len(vectors))
+    index = faiss.index_factory(vectors.shape[1], factory, faiss.METRIC_L2)
+
+    if hasattr(index, "hnsw"):
+        index.hnsw.efConstruction = config["ef_construction"]
+
+    if not index.is_trained:
+        sample = vectors
+        if len(vectors) > config["train_sample_size"]:
+            rng = np.random.default_rng(0)
+            rows = rng.choice(len(vectors), config["train_sample_size"], replace=False)
+            sample = vectors[rows]
+        logger.info("Training FAISS %s index on %d vectors", factory, len(sample))
+        index.train(sample)
+
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.make_direct_map()
+
+    apply_search_params(index, config)
+    return index
+
+
+def retrain_if_outgrown(
+    vectorstore: FAISS, config: Optional[Dict[str, Any]] = None
+) -> bool:
+    """
+    Rebuild an IVF or PQ index whose training no longer fits its size.
+
+    Quantizers are trained once, on the vectors of the first ingest, so an
+    index that grows through incremental adds keeps too few lists. It is
+    rebuilt when the corpus supports at least twice the trained number of
+    lists, or when an index created flat for lack of training data can now
+    be trained, so the retraining cost stays proportional to the growth.
+    HNSW and SQ8 indexes are never retrained.
+
+    Vectors of IVF-Flat and flat indexes are reconstructed exactly; those
+    of PQ indexes are embedded again from the stored texts, which the
+    embedding cache usually serves.
+
+    Args:
+        vectorstore (FAISS): The vectorstore, modified in place.
+        config (Optional[Dict[str, Any]]): The ``faiss_db`` section.
+
+    Returns:
+        bool: Whether the index was rebuilt.
+    """
+    config = resolve_index_config(config)
+    if not config["index_type"].startswith("ivf"):
+        return False
+
+    index = vectorstore.index
+    num_vectors = index.ntotal
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is None:
+        if _factory_string(config, num_vectors) == "Flat":
+            return False
+    elif _nlist(config, num_vectors) < 2 * ivf.nlist:
+        return False
+
+    if isinstance(ivf, faiss.IndexIVFPQ):
+        texts = [
+            vectorstore.docstore.search(vectorstore.index_to_docstore_id[position])
+            for position in range(num_vectors)
+        ]
+        vectors = np.asarray(
+            vectorstore.embedding_function.embed_documents(
+                [document.page_content for document in texts]
+            ),
+            dtype=np.float32,
+        )
+    else:
+        vectors = index.reconstruct_n(0, num_vectors)
+
+    logger.info("Retraining FAISS index over %d vectors", num_vectors)
+    new_index = create_faiss_index(vectors, config)
+    new_index.add(vectors)
+    vectorstore.index = new_index
+    return True
+
+
+def build_vectorstore(
+    documents: List[Document],
+    embedding_model: Any,
+    ids: Sequence[str],
+    config: Optional[Dict[str, Any]] = None,
+    vectors: Optional[np.ndarray] = None,
+) -> FAISS:
+    """
+    Embed documents into a new FAISS vectorstore of the configured type.
+
+    Args:
+        documents (List[Document]): The chunks to index.
+        embedding_model (Any): The embedding model.
+        ids (Sequence[str]): Docstore id of each chunk.
+        config (Optional[Dict[str, Any]]): The ``faiss_db`` section; the
+                                           default is an exact flat index.
+        vectors (Optional[np.ndarray]): Embeddings of the chunks, one per
+                                        row, when already known.
+
+    Returns:
+        FAISS: The populated vectorstore.
+    """
+    texts = [document.page_content for document in documents]
+    if vectors is None:
+        if resolve_index_config(config)["index_type"] == "flat":
+            return FAISS.from_documents(
+                documents=documents, embedding=embedding_model, ids=list(ids)
+            )
+        vectors = embedding_model.embed_documents(texts)
+    vectors = np.asarray(vectors, dtype=np.float32)
+    vectorstore = FAISS(
+        embedding_function=embedding_model,
+        index=create_faiss_index(vectors, config),
+        docstore=InMemoryDocstore(),
+        index_to_docstore_id={},
+    )
+    vectorstore.add_embeddings(
+        list(zip(texts, vectors.tolist())),
+        metadatas=[document.metadata for document in documents],
+        ids=list(ids),
+    )
+    return vectorstore
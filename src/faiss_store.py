@@ -0,0 +1,278 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import faiss
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_community.docstore.base import Docstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from src.constants import (
+    DOCSTORE_CACHE_SIZE,
+    DOCSTORE_FILE,
+    FAISS_CURRENT_LINK,
+    FAISS_INDEX_FILE,
+    VECTORSTORE_CACHE_SIZE,
+)
+
+logger = get_logger(__name__)
+
+_MMAP_FLAGS = (
+    faiss.IO_FLAG_MMAP | getattr(faiss, "IO_FLAG_MMAP_IFC", 0) | faiss.IO_FLAG_READ_ONLY
+)
+
+
+def write_docstore(
+    path: str, index_to_docstore_id: Mapping, docstore: Docstore
+) -> None:
+    """
+    Write the documents of a FAISS vectorstore to a SQLite file.
+
+    Rows are keyed by index position, so both the position-to-id map and a
+    single document can be read without loading the rest.
+
+    Args:
+        path (str): Path of the SQLite file to create.
+        index_to_docstore_id (Mapping): FAISS position to docstore id.
+        docstore (Docstore): The docstore holding the documents.
+    """
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.execute(
+                "CREATE TABLE documents ("
+                "position INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, "
+                "page_content TEXT NOT NULL, metadata TEXT NOT NULL)"
+            )
+            rows = []
+            for position in range(len(index_to_docstore_id)):
+                doc_id = index_to_docstore_id[position]
+                document = docstore.search(doc_id)
+                rows.append(
+                    (
+                        position,
+                        doc_id,
+                        document.page_content,
+                        json.dumps(document.metadata, default=str),
+                    )
+                )
+            conn.executemany("INSERT INTO documents VALUES (?, ?, ?, ?)", rows)
+    finally:
+        conn.close()
+
+
+class SQLiteDocstore(Docstore):
+    """
+    Read-only docstore reading documents on demand from the SQLite file
+    written by ``write_docstore``, with a small LRU of recent documents.
+
+    The file is opened once, so a docstore keeps reading the version it was
+    opened on even after a newer one is moved into place.
+    """
+
+    def __init__(self, path: str, cache_size: int = DOCSTORE_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self._conn = sqlite3.connect(
+            f"file:{path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._cache: "OrderedDict[str, Document]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fetchall(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def search(self, search: str) -> Union[str, Document]:
+        with self._lock:
+            document = self._cache.get(search)
+            if document is not None:
+                self._cache.move_to_end(search)
+                return document
+
+        rows = self.fetchall(
+            "SELECT page_content, metadata FROM documents WHERE id = ?", (search,)
+        )
+        if not rows:
+            return f"ID {search} not found."
+
+        page_content, metadata = rows[0]
+        document = Document(
+            id=search, page_content=page_content, metadata=json.loads(metadata)
+        )
+        with self._lock:
+            self._cache[search] = document
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return document
+
+    def load_all(self) -> Tuple[Dict[str, Document], Dict[int, str]]:
+        """
+        Read every document, e.g. to rebuild a writable in-memory docstore.
+
+        Returns:
+            Tuple[Dict[str, Document], Dict[int, str]]: Documents keyed by id,
+            and the FAISS position-to-id map.
+        """
+        documents, index_to_id = {}, {}
+        for position, doc_id, page_content, metadata in self.fetchall(
+            "SELECT position, id, page_content, metadata FROM documents"
+        ):
+            documents[doc_id] = Document(
+                id=doc_id, page_content=page_content, metadata=json.loads(metadata)
+            )
+            index_to_id[position] = doc_id
+        return documents, index_to_id
+
+
+def docstore_documents(docstore: Docstore) -> Dict[str, Document]:
+    """
+    All documents of an in-memory or SQLite docstore, keyed by id.
+    """
+    if isinstance(docstore, SQLiteDocstore):
+        return docstore.load_all()[0]
+    return docstore._dict
+
+
+class SQLiteIndexMap(Mapping):
+    """
+    Read-only FAISS position-to-docstore-id map backed by a ``SQLiteDocstore``.
+    """
+
+    def __init__(self, docstore: SQLiteDocstore):
+        self.docstore = docstore
+        ((self._length,),) = docstore.fetchall("SELECT COUNT(*) FROM documents")
+
+    def __getitem__(self, position: int) -> str:
+        rows = self.docstore.fetchall(
+            "SELECT id FROM documents WHERE position = ?", (int(position),)
+        )
+        if not rows:
+            raise KeyError(position)
+        return rows[0][0]
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __iter__(self) -> Iterator[int]:
+        for (position,) in self.docstore.fetchall(
+            "SELECT position FROM documents ORDER BY position"
+        ):
+            yield position
+
+    def values(self) -> List[str]:
+        return [
+            doc_id
+            for (doc_id,) in self.docstore.fetchall(
+                "SELECT id FROM documents ORDER BY position"
+            )
+        ]
+
+
+def read_index(index_path: str, mmap: bool = True) -> Any:
+    """
+    Read a FAISS index, memory-mapping it when possible so several processes
+    share one copy in the page cache.
+    """
+    if mmap:
+        try:
+            return faiss.read_index(index_path, _MMAP_FLAGS)
+        except RuntimeError as e:
+            logger.warning(
+                "Cannot memory-map %s, reading it instead: %s", index_path, e
+            )
+    return faiss.read_index(index_path)
+
+
+def resolve_index_dir(faiss_index_path: str) -> str:
+    """
+    Directory holding the current generation of a persisted index.
+
+    Indexes saved before generations keep their files directly in
+    ``faiss_index_path``. Resolve once and read every file from the result,
+    so the index and its docstore come from the same generation.
+    """
+    link = os.path.join(faiss_index_path, FAISS_CURRENT_LINK)
+    if os.path.islink(link):
+        return os.path.realpath(link)
+    return faiss_index_path
+
+
+_cache: "OrderedDict[tuple, FAISS]" = OrderedDict()
+
+_cache_lock = threading.Lock()
+
+
+def _file_key(path: str) -> Tuple[int, int, int]:
+    stat = os.stat(path)
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def open_vectorstore(
+    faiss_index_path: str,
+    embedding_model: Any,
+    cache_size: int = VECTORSTORE_CACHE_SIZE,
+) -> Optional[FAISS]:
+    """
+    Open a persisted vectorstore read-only, sharing it across requests.
+
+    The index is memory-mapped and the docstore is read lazily from SQLite.
+    Open vectorstores are kept in a process-wide LRU keyed by path and the
+    identity of the index and docstore files, so a rewritten index is picked
+    up on the next call.
+
+    Args:
+        faiss_index_path (str): Directory containing the persisted index.
+        embedding_model (Any): The embedding model used to build the index.
+        cache_size (int): Maximum number of open vectorstores kept.
+
+    Returns:
+        Optional[FAISS]: The vectorstore, or None if the directory has no
+        index in this format.
+    """
+    index_dir = resolve_index_dir(faiss_index_path)
+    index_path = os.path.join(index_dir, FAISS_INDEX_FILE)
+    docstore_path = os.path.join(index_dir, DOCSTORE_FILE)
+    try:
+        key = (
+            os.path.abspath(faiss_index_path),
+            id(embedding_model),
+            _file_key(index_path),
+            _file_key(docstore_path),
+        )
+    except FileNotFoundError:
+        return None
+
+    with _cache_lock:
+        vectorstore = _cache.get(key)
+        if vectorstore is not None:
+            _cache.move_to_end(key)
+            return vectorstore
+
+    docstore = SQLiteDocstore(docstore_path)
+    vectorstore = FAISS(
+        embedding_function=embedding_model,
+        index=read_index(index_path),
+        docstore=docstore,
+        index_to_docstore_id=SQLiteIndexMap(docstore),
+    )
+    logger.info("Opened FAISS index %s", faiss_index_path)
+
+    with _cache_lock:
+        _cache[key] = vectorstore
+        while len(_cache) > cache_size:
+            _cache.popitem(last=False)
+    return vectorstore
+
+
+def clear_vectorstore_cache() -> None:
+    """
+    Drop every cached vectorstore.
+    """
+    with _cache_lock:
+        _cache.clear()
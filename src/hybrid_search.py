@@ -0,0 +1,228 @@
+import json
+import math
+import os
+import re
+import tempfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from src.constants import BM25_B, BM25_INDEX_FILE, BM25_K1, HYBRID_FETCH_K, RRF_K
+
+# Keeps identifiers such as "INV-2023-001" or "4.2.1" together as one token.
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-_./][a-z0-9]+)*")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lower-case text and split it into BM25 terms.
+
+    Compound identifiers are emitted whole and also split into their parts,
+    so "INV-2023-001" matches both the full id and "2023".
+    """
+    terms = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        terms.append(token)
+        parts = re.split(r"[-_./]", token)
+        if len(parts) > 1:
+            terms.extend(parts)
+    return terms
+
+
+class BM25Index:
+    """
+    Compact in-memory BM25 inverted index over chunk ids.
+
+    Postings are kept per term as ``[doc, term frequency]`` pairs and
+    converted to NumPy arrays on first use, so scoring a query is one
+    vectorized update per query term.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        """
+        Initializes the BM25Index.
+
+        Args:
+            k1 (float): Term frequency saturation.
+            b (float): Document length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self.ids: List[str] = []
+        self.doc_lengths: List[int] = []
+        self.postings: Dict[str, List[List[int]]] = {}
+        self._arrays: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def add(self, ids: Sequence[str], texts: Sequence[str]) -> None:
+        """
+        Index texts under the given ids.
+        """
+        for chunk_id, text in zip(ids, texts):
+            doc = len(self.ids)
+            terms = tokenize(text)
+            self.ids.append(chunk_id)
+            self.doc_lengths.append(len(terms))
+            for term, count in Counter(terms).items():
+                self.postings.setdefault(term, []).append([doc, count])
+        self._arrays.clear()
+
+    @classmethod
+    def from_documents(cls, documents: Dict[str, Document]) -> "BM25Index":
+        """
+        Build an index from documents keyed by id, e.g. a FAISS docstore.
+        """
+        index = cls()
+        index.add(
+            list(documents), [document.page_content for document in documents.values()]
+        )
+        return index
+
+    def _postings(self, term: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        arrays = self._arrays.get(term)
+        if arrays is None and term in self.postings:
+            pairs = np.asarray(self.postings[term], dtype=np.int64)
+            arrays = self._arrays[term] = (pairs[:, 0], pairs[:, 1].astype(np.float32))
+        return arrays
+
+    def search(self, query: str, k: int) -> List[Tuple[str, float]]:
+        """
+        Return up to ``k`` (id, score) pairs for the query, best first.
+        """
+        if not self.ids:
+            return []
+
+        doc_lengths = np.asarray(self.doc_lengths, dtype=np.float32)
+        norm = self.k1 * (1 - self.b + self.b * doc_lengths / doc_lengths.mean())
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for term in set(tokenize(query)):
+            postings = self._postings(term)
+            if postings is None:
+                continue
+            docs, tfs = postings
+            idf = math.log(1 + (len(self.ids) - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+
+        matched = np.flatnonzero(scores)
+        if len(matched) > k:
+            matched = matched[np.argpartition(-scores[matched], k)[:k]]
+        ranked = matched[np.argsort(-scores[matched], kind="stable")]
+        return [(self.ids[doc], float(scores[doc])) for doc in ranked]
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to ``path`` atomically.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        payload = {
+            "k1": self.k1,
+            "b": self.b,
+            "ids": self.ids,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+        fd, tmp_path = tempfile.mkstemp(prefix=".bm25.", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> Optional["BM25Index"]:
+        """
+        Load an index written by ``save``; returns None if it does not exist.
+        """
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            payload = json.load(f)
+        index = cls(k1=payload["k1"], b=payload["b"])
+        index.ids = payload["ids"]
+        index.doc_lengths = payload["doc_lengths"]
+        index.postings = payload["postings"]
+        return index
+
+
+def bm25_index_path(faiss_index_path: str) -> str:
+    """
+    Path of the BM25 index persisted next to a FAISS index.
+    """
+    return os.path.join(faiss_index_path, BM25_INDEX_FILE)
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[str]], k: int = RRF_K
+) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists with reciprocal rank fusion.
+
+    Args:
+        rankings (Iterable[Sequence[str]]): Ids ranked best first, one list
+                                            per retriever.
+        k (int): RRF constant damping the weight of top ranks.
+
+    Returns:
+        List[Tuple[str, float]]: Ids and fused scores, best first.
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Runs BM25 and FAISS search concurrently and fuses them with reciprocal
+    rank fusion, so exact keyword matches (invoice numbers, clause ids) are
+    found even when the dense search misses them.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: FAISS
+
+    bm25_index: Any
+
+    k: int = 4
+
+    fetch_k: int = HYBRID_FETCH_K
+
+    rrf_k: int = RRF_K
+
+    def _dense_ids(self, query: str) -> List[str]:
+        documents = self.vectorstore.similarity_search(query, k=self.fetch_k)
+        return [document.id for document in documents]
+
+    def _sparse_ids(self, query: str) -> List[str]:
+        return [doc_id for doc_id, _ in self.bm25_index.search(query, self.fetch_k)]
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dense = executor.submit(self._dense_ids, query)
+            sparse = executor.submit(self._sparse_ids, query)
+            rankings = [dense.result(), sparse.result()]
+
+        documents = []
+        for doc_id, _ in reciprocal_rank_fusion(rankings, self.rrf_k):
+            document = self.vectorstore.docstore.search(doc_id)
+            if isinstance(document, Document):
+                documents.append(document)
+            if len(documents) == self.k:
+                break
+        return documents
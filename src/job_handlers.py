@@ -0,0 +1,64 @@
+import asyncio
+import os
+from typing import Any, Callable, Dict, List
+
+from src.constants import JOB_KIND_COMPARE, JOB_KIND_INGEST
+from src.document_comparison.document_comparison import DocumentComparisonWithLLM
+from src.document_comparison.document_handler import DocumentComparisonHandler
+from src.multi_doc_chat.data_ingestion import MultiDocIngestor
+
+# Called by a handler with its progress in [0, 1] and a short message.
+ProgressCallback = Callable[[float, str], None]
+
+
+def ingest_job(payload: Dict[str, Any], progress: ProgressCallback) -> Dict[str, Any]:
+    """
+    Ingest ``payload["file_paths"]`` into the ``payload["session_id"]`` shard,
+    reporting progress after every parsed file and embedding batch.
+    """
+    file_paths = payload["file_paths"]
+    progress(0.0, f"Ingesting {len(file_paths)} files")
+    ingestor = MultiDocIngestor(session_id=payload["session_id"])
+    ingestor.ingest_files(file_paths, incremental=True, on_progress=progress)
+    return {
+        "session_id": ingestor.session_id,
+        "files": [os.path.basename(file_path) for file_path in file_paths],
+    }
+
+
+def compare_job(
+    payload: Dict[str, Any], progress: ProgressCallback
+) -> List[Dict[str, Any]]:
+    """
+    Compare ``payload["reference_path"]`` with ``payload["actual_path"]``,
+    reporting progress after every batch of changed pages.
+
+    The documents are saved through ``DocumentComparisonHandler``, so their
+    text is extracted once per content and read from the text cache.
+    """
+    progress(0.0, "Reading documents")
+    handler = DocumentComparisonHandler()
+    reference_path, actual_path = handler.save_file(
+        payload["reference_path"],
+        payload["actual_path"],
+        "reference_" + os.path.basename(payload["reference_path"]),
+        "actual_" + os.path.basename(payload["actual_path"]),
+    )
+    reference_text = handler.read_file(reference_path)
+    actual_text = handler.read_file(actual_path)
+
+    def on_progress(done: int, total: int) -> None:
+        progress(done / total, f"Compared {done} of {total} page batches")
+
+    changes = asyncio.run(
+        DocumentComparisonWithLLM().acompare_documents(
+            reference_text, actual_text, on_progress=on_progress
+        )
+    )
+    return changes.to_dict(orient="records")
+
+
+JOB_HANDLERS = {
+    JOB_KIND_INGEST: ingest_job,
+    JOB_KIND_COMPARE: compare_job,
+}
@@ -0,0 +1,532 @@
+import hashlib
+import json
+import multiprocessing
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from AIFoundationKit.base.logger.custom_logger import get_logger
+
+from src.constants import (
+    API_JOB_WORKERS,
+    DEFAULT_JOB_QUEUE_PATH,
+    JOB_HEARTBEAT_SECONDS,
+    JOB_LANE_DEFAULT,
+    JOB_LANES,
+    JOB_MAX_ATTEMPTS,
+    JOB_POLL_SECONDS,
+    JOB_STALE_SECONDS,
+    JOB_STATUS_FAILED,
+    JOB_STATUS_QUEUED,
+    JOB_STATUS_RUNNING,
+    JOB_STATUS_SUCCEEDED,
+)
+from src.job_handlers import JOB_HANDLERS, ProgressCallback
+from src.utils import compute_file_hash
+
+logger = get_logger(__name__)
+
+JobHandler = Callable[[Dict[str, Any], ProgressCallback], Any]
+
+_COLUMNS = (
+    "id, kind, key, lane, payload, status, progress, message, result, error, "
+    "attempts, created_at, updated_at"
+)
+
+
+@dataclass
+class Job:
+    id: str
+    kind: str
+    key: Optional[str]
+    lane: str
+    payload: Dict[str, Any]
+    status: str
+    progress: float
+    message: str
+    result: Any
+    error: Optional[str]
+    attempts: int
+    created_at: float
+    updated_at: float
+
+    @classmethod
+    def from_row(cls, row: Sequence[Any]) -> "Job":
+        values = dict(zip(_COLUMNS.split(", "), row))
+        values["lane"] = JOB_LANES[values["lane"]]
+        values["payload"] = json.loads(values["payload"])
+        if values["result"] is not None:
+            values["result"] = json.loads(values["result"])
+        return cls(**values)
+
+    def to_status(self) -> Dict[str, Any]:
+        """
+        The job's state without its payload and result.
+        """
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "lane": self.lane,
+            "status": self.status,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "attempts": self.attempts,
+        }
+
+
+def job_key(kind: str, file_paths: Sequence[str], **options: Any) -> str:
+    """
+    Idempotency key of a job over the given input files.
+
+    Args:
+        kind (str): The job kind.
+        file_paths (Sequence[str]): Input files, in a meaningful order.
+        **options (Any): Other JSON-serializable inputs that change the result.
+
+    Returns:
+        str: sha256 hex digest of the kind, the file contents and the options.
+    """
+    digest = hashlib.sha256(kind.encode("utf-8"))
+    for file_path in file_paths:
+        digest.update(compute_file_hash(file_path).encode("ascii"))
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class JobQueue:
+    """
+    Persistent job queue backed by SQLite, shared by the API and the worker
+    processes through one database file.
+
+    Jobs are served by lane (``JOB_LANES``, most urgent first) and then in
+    submission order. A job submitted with a key that is already queued,
+    running or done is not added again; a failed one is queued once more.
+    Running jobs whose worker stopped heartbeating for ``stale_seconds`` are
+    given back to the queue, up to ``max_attempts`` attempts. Outcomes are
+    only recorded for the attempt that currently owns a job, so a worker
+    whose job was reclaimed cannot overwrite the new attempt's result.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_JOB_QUEUE_PATH,
+        stale_seconds: float = JOB_STALE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ):
+        """
+        Initializes the JobQueue.
+
+        Args:
+            db_path (str): Path of the SQLite database file.
+            stale_seconds (float): Time without progress after which a running
+                                   job is considered abandoned.
+            max_attempts (int): Maximum number of times a job is started.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, kind TEXT NOT NULL, key TEXT UNIQUE, "
+                "lane INTEGER NOT NULL, payload TEXT NOT NULL, "
+                "status TEXT NOT NULL, progress REAL NOT NULL DEFAULT 0, "
+                "message TEXT NOT NULL DEFAULT '', result TEXT, error TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, "
+                "created_at REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_jobs_pending "
+                "ON jobs (status, lane, created_at)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def submit(
+        self,
+        kind: str,
+        payload: Dict[str, Any],
+        lane: str = JOB_LANE_DEFAULT,
+        key: Optional[str] = None,
+    ) -> str:
+        """
+        Queue a job, or return the existing job with the same key.
+
+        Args:
+            kind (str): Name of the handler that runs the job.
+            payload (Dict[str, Any]): JSON-serializable handler input.
+            lane (str): One of ``JOB_LANES``.
+            key (Optional[str]): Idempotency key, e.g. from ``job_key``.
+
+        Returns:
+            str: The job id.
+
+        Raises:
+            ValueError: If ``lane`` is unknown.
+        """
+        if lane not in JOB_LANES:
+            raise ValueError(f"Unknown job lane {lane!r}, expected one of {JOB_LANES}")
+
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            if key is not None:
+                row = conn.execute(
+                    "SELECT id, status FROM jobs WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and row[1] != JOB_STATUS_FAILED:
+                    logger.info("Job %s already submitted as %s", key, row[0])
+                    return row[0]
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET lane = ?, payload = ?, status = ?, "
+                        "progress = 0, message = '', result = NULL, error = NULL, "
+                        "attempts = 0, updated_at = ? WHERE id = ?",
+                        (
+                            JOB_LANES.index(lane),
+                            json.dumps(payload),
+                            JOB_STATUS_QUEUED,
+                            now,
+                            row[0],
+                        ),
+                    )
+                    logger.info("Requeued failed %s job %s", kind, row[0])
+                    return row[0]
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, kind, key, lane, payload, status, "
+                "created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    kind,
+                    key,
+                    JOB_LANES.index(lane),
+                    json.dumps(payload),
+                    JOB_STATUS_QUEUED,
+                    now,
+                    now,
+                ),
+            )
+        logger.info("Submitted %s job %s in lane %s", kind, job_id, lane)
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        return Job.from_row(row) if row is not None else None
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        State and progress of a job, or None if it does not exist.
+        """
+        job = self.get(job_id)
+        return job.to_status() if job is not None else None
+
+    def result(self, job_id: str) -> Any:
+        """
+        Result of a succeeded job, or None if it has not succeeded.
+        """
+        job = self.get(job_id)
+        if job is None or job.status != JOB_STATUS_SUCCEEDED:
+            return None
+        return job.result
+
+    def claim(self, lanes: Optional[Sequence[str]] = None) -> Optional[Job]:
+        """
+        Start the most urgent queued job, first reclaiming abandoned ones.
+
+        Args:
+            lanes (Optional[Sequence[str]]): Lanes to serve. Defaults to all.
+
+        Returns:
+            Optional[Job]: The started job, or None if nothing is queued.
+        """
+        ranks = [JOB_LANES.index(lane) for lane in (lanes or JOB_LANES)]
+        now = time.time()
+        stale_before = now - self.stale_seconds
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, "
+                "message = 'requeued after worker timeout' "
+                "WHERE status = ? AND updated_at < ? AND attempts < ?",
+                (
+                    JOB_STATUS_QUEUED,
+                    now,
+                    JOB_STATUS_RUNNING,
+                    stale_before,
+                    self.max_attempts,
+                ),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, "
+                "error = 'worker timed out' WHERE status = ? AND updated_at < ?",
+                (JOB_STATUS_FAILED, now, JOB_STATUS_RUNNING, stale_before),
+            )
+            placeholders = ",".join("?" * len(ranks))
+            row = conn.execute(
+                f"SELECT id FROM jobs WHERE status = ? AND lane IN ({placeholders}) "
+                "ORDER BY lane, created_at LIMIT 1",
+                (JOB_STATUS_QUEUED, *ranks),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE id = ?",
+                (JOB_STATUS_RUNNING, now, row[0]),
+            )
+            job = conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ?", (row[0],)
+            ).fetchone()
+        return Job.from_row(job)
+
+    def report_progress(
+        self, job_id: str, attempt: int, progress: float, message: str = ""
+    ) -> bool:
+        """
+        Record a running job's progress; this also serves as its heartbeat.
+
+        Returns:
+            bool: False if ``attempt`` no longer owns the job.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET progress = ?, message = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND attempts = ?",
+                (
+                    min(max(progress, 0.0), 1.0),
+                    message,
+                    time.time(),
+                    job_id,
+                    JOB_STATUS_RUNNING,
+                    attempt,
+                ),
+            )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: str, attempt: int) -> bool:
+        """
+        Keep a running job from being reclaimed as abandoned.
+
+        Returns:
+            bool: False if ``attempt`` no longer owns the job.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET updated_at = ? "
+                "WHERE id = ? AND status = ? AND attempts = ?",
+                (time.time(), job_id, JOB_STATUS_RUNNING, attempt),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: str, attempt: int, result: Any) -> bool:
+        """
+        Record the result of the attempt that currently owns a job.
+
+        Returns:
+            bool: False, with nothing recorded, if the job was reclaimed.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, progress = 1, result = ?, "
+                "updated_at = ? WHERE id = ? AND status = ? AND attempts = ?",
+                (
+                    JOB_STATUS_SUCCEEDED,
+                    json.dumps(result),
+                    time.time(),
+                    job_id,
+                    JOB_STATUS_RUNNING,
+                    attempt,
+                ),
+            )
+        if cursor.rowcount != 1:
+            logger.warning("Dropped result of job %s attempt %d", job_id, attempt)
+            return False
+        logger.info("Job %s succeeded", job_id)
+        return True
+
+    def fail(self, job_id: str, attempt: int, error: str) -> bool:
+        """
+        Record the failure of the attempt that currently owns a job.
+
+        Returns:
+            bool: False, with nothing recorded, if the job was reclaimed.
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? AND attempts = ?",
+                (
+                    JOB_STATUS_FAILED,
+                    error,
+                    time.time(),
+                    job_id,
+                    JOB_STATUS_RUNNING,
+                    attempt,
+                ),
+            )
+        if cursor.rowcount != 1:
+            logger.warning("Dropped failure of job %s attempt %d", job_id, attempt)
+            return False
+        logger.error("Job %s failed: %s", job_id, error)
+        return True
+
+
+def run_job(
+    queue: JobQueue,
+    job: Job,
+    handlers: Dict[str, JobHandler],
+    heartbeat_seconds: float = JOB_HEARTBEAT_SECONDS,
+) -> None:
+    """
+    Run a claimed job with its handler and record the outcome.
+
+    A background thread heartbeats the job every ``heartbeat_seconds`` while
+    the handler runs, so long steps without progress reports are not
+    mistaken for a dead worker.
+    """
+    done = threading.Event()
+
+    def beat() -> None:
+        while not done.wait(heartbeat_seconds):
+            if not queue.heartbeat(job.id, job.attempts):
+                logger.warning("Job %s was reclaimed from this worker", job.id)
+                return
+
+    heartbeat = threading.Thread(target=beat, daemon=True)
+    heartbeat.start()
+    try:
+        handler = handlers.get(job.kind)
+        if handler is None:
+            raise ValueError(f"No handler for job kind {job.kind!r}")
+        result = handler(
+            job.payload,
+            lambda progress, message="": queue.report_progress(
+                job.id, job.attempts, progress, message
+            ),
+        )
+        queue.complete(job.id, job.attempts, result)
+    except Exception as e:
+        queue.fail(job.id, job.attempts, str(e))
+    finally:
+        done.set()
+        heartbeat.join()
+
+
+def run_worker(
+    db_path: str = DEFAULT_JOB_QUEUE_PATH,
+    lanes: Optional[Sequence[str]] = None,
+    handlers: Optional[Dict[str, JobHandler]] = None,
+    poll_seconds: float = JOB_POLL_SECONDS,
+    stop_event: Any = None,
+    until_idle: bool = False,
+) -> int:
+    """
+    Claim and run jobs until stopped.
+
+    Args:
+        db_path (str): Path of the queue database.
+        lanes (Optional[Sequence[str]]): Lanes to serve. Defaults to all.
+        handlers (Optional[Dict[str, JobHandler]]): Handler per job kind.
+                                                    Defaults to
+                                                    ``JOB_HANDLERS``.
+        poll_seconds (float): Wait between polls of an empty queue.
+        stop_event (Any): ``multiprocessing.Event`` that stops the loop.
+        until_idle (bool): Return as soon as the queue is empty.
+
+    Returns:
+        int: Number of jobs run.
+    """
+    handlers = JOB_HANDLERS if handlers is None else handlers
+    queue = JobQueue(db_path)
+    processed = 0
+    while stop_event is None or not stop_event.is_set():
+        job = queue.claim(lanes)
+        if job is None:
+            if until_idle:
+                break
+            if stop_event is not None:
+                stop_event.wait(poll_seconds)
+            else:
+                time.sleep(poll_seconds)
+            continue
+        logger.info("Running %s job %s (attempt %d)", job.kind, job.id, job.attempts)
+        run_job(queue, job, handlers)
+        processed += 1
+    return processed
+
+
+class JobWorkerPool:
+    """
+    Worker processes serving a ``JobQueue``.
+
+    Workers are started with the ``spawn`` method, so they do not inherit the
+    threads or event loop of the process that starts them.
+    """
+
+    def __init__(
+        self,
+        db_path: str = DEFAULT_JOB_QUEUE_PATH,
+        workers: int = API_JOB_WORKERS,
+        lanes: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initializes the JobWorkerPool.
+
+        Args:
+            db_path (str): Path of the queue database.
+            workers (int): Number of worker processes.
+            lanes (Optional[Sequence[str]]): Lanes served. Defaults to all.
+        """
+        self.db_path = str(db_path)
+        self.workers = workers
+        self.lanes = list(lanes) if lanes is not None else None
+        self._context = multiprocessing.get_context("spawn")
+        self._stop_event = self._context.Event()
+        self._processes: List[multiprocessing.Process] = []
+
+    def start(self) -> None:
+        for _ in range(self.workers):
+            process = self._context.Process(
+                target=run_worker,
+                kwargs={
+                    "db_path": self.db_path,
+                    "lanes": self.lanes,
+                    "stop_event": self._stop_event,
+                },
+                daemon=True,
+            )
+            process.start()
+            self._processes.append(process)
+        logger.info("Started %d job workers", self.workers)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """
+        Ask the workers to stop after their current job and wait for them.
+        """
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        self._processes.clear()
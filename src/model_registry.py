@@ -0,0 +1,207 @@
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from AIFoundationKit.rag.model_loader import ModelLoader
+from dotenv import load_dotenv
+from langchain_core.runnables import Runnable
+
+from src.constants import (
+    CONFIG_DIR,
+    CONFIG_FILE,
+    DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+    DEFAULT_RESPONSE_CACHE_TTL_SECONDS,
+    ENV_RESPONSE_CACHE_PATH,
+    KEY_EMBEDDING_MODEL,
+    KEY_LLM,
+    KEY_MODEL_NAME,
+    KEY_PROVIDER,
+    KEY_RESPONSE_CACHE,
+)
+from src.response_cache import CachedRunnable, ResponseCache, SQLiteResponseCache
+
+logger = get_logger(__name__)
+
+# The project's config/config.yaml, for components built without a config path.
+DEFAULT_CONFIG_PATH = str(
+    Path(__file__).resolve().parent.parent / CONFIG_DIR / CONFIG_FILE
+)
+
+_registries: Dict[Optional[str], "ModelRegistry"] = {}
+
+_registries_lock = threading.Lock()
+
+
+class ModelRegistry:
+    """
+    Thread-safe, lazily populated cache of LLM clients, embedding clients and
+    chains for one configuration.
+
+    Each client is created once per process and key, so its HTTP connection
+    pool is reused across requests instead of being rebuilt by every
+    ``DocumentAnalysis``, ``DocumentComparisonWithLLM`` or ingestor.
+    """
+
+    def __init__(
+        self,
+        config_path: Optional[str] = None,
+        response_cache: Optional[ResponseCache] = None,
+    ):
+        """
+        Initializes the ModelRegistry.
+
+        Args:
+            config_path (str, optional): Path of the YAML config passed to
+                                         ``ModelLoader``. If None, the loader
+                                         falls back to environment defaults.
+            response_cache (ResponseCache, optional): Cache applied to every
+                                                      chain. Defaults to the
+                                                      ``response_cache`` config
+                                                      section, if enabled.
+        """
+        load_dotenv()
+        self.config_path = config_path
+        self.loader = ModelLoader(config_path=config_path)
+        self.response_cache = response_cache or self._load_response_cache()
+        self._lock = threading.RLock()
+        self._llms: Dict[Hashable, Any] = {}
+        self._embeddings: Dict[Hashable, Any] = {}
+        self._chains: Dict[Hashable, Runnable] = {}
+
+    def _load_response_cache(self) -> Optional[ResponseCache]:
+        config = self.loader.config.get(KEY_RESPONSE_CACHE)
+        if not isinstance(config, dict):
+            config = {}
+
+        cache_path = os.getenv(ENV_RESPONSE_CACHE_PATH)
+        if cache_path is None and config.get("enabled"):
+            cache_path = config.get("path")
+        if not cache_path:
+            return None
+
+        logger.info("Response cache enabled at %s", cache_path)
+        return SQLiteResponseCache(
+            cache_path,
+            ttl_seconds=config.get("ttl_seconds", DEFAULT_RESPONSE_CACHE_TTL_SECONDS),
+            max_entries=config.get("max_entries", DEFAULT_RESPONSE_CACHE_MAX_ENTRIES),
+        )
+
+    def _llm_key(self, provider: Optional[str], kwargs: Dict[str, Any]) -> Tuple:
+        provider_name = self.loader._resolve_provider_name(provider, KEY_LLM)
+        provider_config = self.loader.config.get(KEY_LLM, {}).get(provider_name, {})
+        return (
+            provider_name,
+            kwargs.get(KEY_MODEL_NAME, provider_config.get(KEY_MODEL_NAME)),
+            kwargs.get("temperature", provider_config.get("temperature")),
+            tuple(sorted(kwargs.items())),
+        )
+
+    def _embedding_key(self, provider: Optional[str], kwargs: Dict[str, Any]) -> Tuple:
+        embedding_config = self.loader.config.get(KEY_EMBEDDING_MODEL, {})
+        return (
+            provider or embedding_config.get(KEY_PROVIDER),
+            kwargs.get(KEY_MODEL_NAME, embedding_config.get(KEY_MODEL_NAME)),
+            tuple(sorted(kwargs.items())),
+        )
+
+    def get_llm(self, provider: Optional[str] = None, **kwargs) -> Any:
+        """
+        Return the shared LLM client for a provider and model settings.
+
+        Args:
+            provider (str, optional): Provider name. Defaults to the configured one.
+            **kwargs: Model overrides forwarded to ``ModelLoader.load_llm``.
+
+        Returns:
+            Any: The LLM client.
+        """
+        key = self._llm_key(provider, kwargs)
+        with self._lock:
+            if key not in self._llms:
+                logger.info("Creating shared LLM client for %s", key[:3])
+                self._llms[key] = self.loader.load_llm(provider, **kwargs)
+            return self._llms[key]
+
+    def get_embeddings(self, provider: Optional[str] = None, **kwargs) -> Any:
+        """
+        Return the shared embedding client for a provider and model settings.
+
+        Args:
+            provider (str, optional): Provider name. Defaults to the configured one.
+            **kwargs: Model overrides forwarded to ``ModelLoader.load_embeddings``.
+
+        Returns:
+            Any: The embedding client.
+        """
+        key = self._embedding_key(provider, kwargs)
+        with self._lock:
+            if key not in self._embeddings:
+                logger.info("Creating shared embedding client for %s", key[:2])
+                self._embeddings[key] = self.loader.load_embeddings(provider, **kwargs)
+            return self._embeddings[key]
+
+    def get_chain(
+        self,
+        prompt_name: str,
+        build_chain: Callable[[Any], Runnable],
+        provider: Optional[str] = None,
+        variant: str = "",
+        **kwargs,
+    ) -> Runnable:
+        """
+        Return the shared chain for a prompt, building it on first use.
+
+        Args:
+            prompt_name (str): Name of the prompt in ``PROMPT_REGISTRY``.
+            build_chain (Callable[[Any], Runnable]): Builds the chain from the LLM.
+            provider (str, optional): LLM provider. Defaults to the configured one.
+            variant (str): Distinguishes chains built differently from the same
+                           prompt, e.g. with another output parser.
+            **kwargs: Model overrides forwarded to ``get_llm``.
+
+        Returns:
+            Runnable: The compiled chain, wrapped in the response cache when
+                      one is configured.
+        """
+        llm_key = self._llm_key(provider, kwargs)
+        key = (prompt_name, variant, llm_key)
+        with self._lock:
+            if key not in self._chains:
+                logger.info("Building shared chain for prompt %s", prompt_name)
+                chain = build_chain(self.get_llm(provider, **kwargs))
+                if self.response_cache is not None:
+                    chain = CachedRunnable(
+                        chain,
+                        self.response_cache,
+                        prompt_name=f"{prompt_name}:{variant}",
+                        model_config=llm_key,
+                    )
+                self._chains[key] = chain
+            return self._chains[key]
+
+
+def get_model_registry(config_path: Optional[str] = None) -> ModelRegistry:
+    """
+    Return the process-wide ModelRegistry for a config file.
+
+    Args:
+        config_path (str, optional): Path of the YAML config.
+
+    Returns:
+        ModelRegistry: The shared registry.
+    """
+    key = os.path.abspath(config_path) if config_path else None
+    with _registries_lock:
+        if key not in _registries:
+            _registries[key] = ModelRegistry(config_path=config_path)
+        return _registries[key]
+
+
+def reset_model_registries() -> None:
+    """
+    Drop all shared registries, e.g. after a config change or between tests.
+    """
+    with _registries_lock:
+        _registries.clear()
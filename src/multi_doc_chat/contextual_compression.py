@@ -0,0 +1,228 @@
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, List, Optional, Sequence
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from src.constants import (
+    CHARS_PER_TOKEN,
+    COMPRESSION_SENTENCE_CACHE_SIZE,
+    COMPRESSION_SIMILARITY_THRESHOLD,
+    COMPRESSION_TOKEN_BUDGET,
+    COMPRESSION_TOP_SENTENCES,
+    KEY_SIMILARITY,
+)
+from src.embedding_cache import CachedEmbeddings
+from src.embedding_executor import EmbeddingExecutor
+from src.multi_doc_chat.mmr import _normalize_rows, fetch_candidates
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Split text into sentences on terminal punctuation and blank lines.
+    """
+    return [
+        sentence.strip()
+        for sentence in _SENTENCE_PATTERN.split(text)
+        if sentence.strip()
+    ]
+
+
+def _cosine(vectors: np.ndarray, query_vector: Sequence[float]) -> np.ndarray:
+    query = _normalize_rows(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))
+    return _normalize_rows(np.asarray(vectors, dtype=np.float32)) @ query[0]
+
+
+class SentenceEmbeddings(Embeddings):
+    """
+    Embeds sentences for compression, with a bounded in-memory LRU cache.
+
+    Sentence vectors only rank sentences for one query, so they go to the
+    unwrapped model: through ``CachedEmbeddings`` they would fill the
+    persistent cache with one-off entries, and through ``EmbeddingExecutor``
+    they would use up the ingest rate limit.
+    """
+
+    def __init__(
+        self,
+        embedding_model: Embeddings,
+        max_entries: int = COMPRESSION_SENTENCE_CACHE_SIZE,
+    ):
+        """
+        Initializes the SentenceEmbeddings.
+
+        Args:
+            embedding_model (Embeddings): The model, possibly wrapped.
+            max_entries (int): Maximum number of cached sentence vectors.
+        """
+        while isinstance(embedding_model, (CachedEmbeddings, EmbeddingExecutor)):
+            embedding_model = embedding_model.embedding_model
+        self.embedding_model = embedding_model
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        vectors = {}
+        with self._lock:
+            for text in texts:
+                if text in self._cache:
+                    self._cache.move_to_end(text)
+                    vectors[text] = self._cache[text]
+
+        missing = list(dict.fromkeys(text for text in texts if text not in vectors))
+        if missing:
+            vectors.update(zip(missing, self.embedding_model.embed_documents(missing)))
+            with self._lock:
+                for text in missing:
+                    self._cache[text] = vectors[text]
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return [vectors[text] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embedding_model.embed_query(text)
+
+
+def compress_documents(
+    documents: List[Document],
+    chunk_vectors: np.ndarray,
+    query_vector: Sequence[float],
+    embedding_model: Any,
+    similarity_threshold: float = COMPRESSION_SIMILARITY_THRESHOLD,
+    top_sentences: Optional[int] = COMPRESSION_TOP_SENTENCES,
+    token_budget: Optional[int] = COMPRESSION_TOKEN_BUDGET,
+) -> List[Document]:
+    """
+    Trim retrieved chunks to the parts relevant to the query, without an LLM.
+
+    Chunks less similar to the query than ``similarity_threshold`` are
+    dropped. From each remaining chunk only the ``top_sentences`` sentences
+    most similar to the query are kept, in their original order; all sentences
+    are embedded in one batch. Finally chunks are added most relevant first
+    until ``token_budget`` is reached, truncating the last one.
+
+    Cost: every query embeds each sentence of every kept chunk longer than
+    ``top_sentences`` sentences, i.e. up to ``k`` chunks times their sentence
+    count (about 10-30 per 1000-character chunk), in one extra embedding
+    call. Pass a ``SentenceEmbeddings`` to reuse vectors across queries.
+
+    Args:
+        documents (List[Document]): Retrieved chunks.
+        chunk_vectors (np.ndarray): Their stored embeddings, one per row.
+        query_vector (Sequence[float]): The query embedding.
+        embedding_model (Any): Model used to embed sentences.
+        similarity_threshold (float): Minimum cosine similarity of a chunk.
+        top_sentences (Optional[int]): Sentences kept per chunk; None keeps
+                                       every sentence.
+        token_budget (Optional[int]): Approximate token budget of the
+                                      compressed context; None disables it.
+
+    Returns:
+        List[Document]: Compressed copies of the relevant chunks, most
+        similar first, with their similarity in the metadata.
+    """
+    if not documents:
+        return []
+
+    similarities = _cosine(chunk_vectors, query_vector)
+    ranked = sorted(
+        (
+            (float(similarity), document)
+            for similarity, document in zip(similarities, documents)
+            if similarity >= similarity_threshold
+        ),
+        key=lambda item: item[0],
+        reverse=True,
+    )
+
+    sentences = [split_sentences(document.page_content) for _, document in ranked]
+    # Only chunks with more sentences than we keep need sentence embeddings.
+    to_trim = [
+        index
+        for index, chunk in enumerate(sentences)
+        if top_sentences is not None and len(chunk) > top_sentences
+    ]
+    if to_trim:
+        flat = [sentence for index in to_trim for sentence in sentences[index]]
+        scores = iter(_cosine(embedding_model.embed_documents(flat), query_vector))
+        for index in to_trim:
+            chunk = sentences[index]
+            chunk_scores = [next(scores) for _ in chunk]
+            keep = sorted(np.argsort(chunk_scores)[::-1][:top_sentences])
+            sentences[index] = [chunk[position] for position in keep]
+
+    max_chars = token_budget * CHARS_PER_TOKEN if token_budget is not None else None
+    compressed, used = [], 0
+    for (similarity, document), chunk in zip(ranked, sentences):
+        text = " ".join(chunk)
+        if max_chars is not None:
+            text = text[: max_chars - used]
+        if not text:
+            break
+        used += len(text)
+        compressed.append(
+            Document(
+                page_content=text,
+                metadata={**document.metadata, KEY_SIMILARITY: similarity},
+                id=document.id,
+            )
+        )
+    return compressed
+
+
+class CompressionRetriever(BaseRetriever):
+    """
+    FAISS retriever that compresses the retrieved chunks with
+    ``compress_documents`` before they reach the prompt.
+
+    The query is embedded once; chunk vectors are read back from the index.
+    Sentences are embedded through ``sentence_embeddings``, which defaults to
+    a ``SentenceEmbeddings`` over the vectorstore's model.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: FAISS
+
+    k: int = 4
+
+    similarity_threshold: float = COMPRESSION_SIMILARITY_THRESHOLD
+
+    top_sentences: Optional[int] = COMPRESSION_TOP_SENTENCES
+
+    token_budget: Optional[int] = COMPRESSION_TOKEN_BUDGET
+
+    filter: Optional[Any] = None
+
+    sentence_embeddings: Optional[Embeddings] = None
+
+    def model_post_init(self, __context: Any) -> None:
+        if self.sentence_embeddings is None:
+            self.sentence_embeddings = SentenceEmbeddings(self.vectorstore.embeddings)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        query_vector = self.vectorstore._embed_query(query)
+        documents, vectors, _ = fetch_candidates(
+            self.vectorstore, query_vector, self.k, self.filter
+        )
+        return compress_documents(
+            documents,
+            vectors,
+            query_vector,
+            self.sentence_embeddings,
+            similarity_threshold=self.similarity_threshold,
+            top_sentences=self.top_sentences,
+            token_budget=self.token_budget,
+        )
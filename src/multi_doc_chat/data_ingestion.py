@@ -0,0 +1,155 @@
+import os
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Callable, Optional
+
+from AIFoundationKit.base.exception.custom_exception import AppException
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from AIFoundationKit.base.logger.logger_utils import add_context
+from AIFoundationKit.base.utils import generate_session_id
+from langchain_community.document_loaders import (
+    Docx2txtLoader,
+    PyPDFLoader,
+    TextLoader,
+)
+from langchain_core.retrievers import BaseRetriever
+
+from src.blob_store import BlobStore
+from src.constants import (
+    DEFAULT_EMBEDDING_CACHE_PATH,
+    DEFAULT_FAISS_DIR,
+    DEFAULT_MULTI_DOC_DATA_DIR,
+    DIR_BLOBS,
+    KEY_EMBEDDING_EXECUTOR,
+    KEY_FAISS_DB,
+    KEY_FILE_NAME,
+    KEY_SESSION_ID,
+)
+from src.model_registry import DEFAULT_CONFIG_PATH, get_model_registry
+from src.utils import _create_retriever, ensure_directory_exists, process_and_load_files
+
+# Loader class per supported file extension.
+SUPPORTED_LOADERS = {
+    ".pdf": PyPDFLoader,
+    ".docx": Docx2txtLoader,
+    ".txt": TextLoader,
+    ".md": TextLoader,
+}
+
+
+class MultiDocIngestor:
+    """
+    Ingests PDF, DOCX, TXT and MD files into one FAISS shard per session,
+    stored under ``<faiss_dir>/<session_id>``.
+    """
+
+    def __init__(
+        self,
+        data_dir: str = DEFAULT_MULTI_DOC_DATA_DIR,
+        faiss_dir: str = DEFAULT_FAISS_DIR,
+        session_id: str = None,
+        embedding_cache_path: str = DEFAULT_EMBEDDING_CACHE_PATH,
+        max_workers: int = None,
+        config_path: str = DEFAULT_CONFIG_PATH,
+    ):
+        try:
+            self.session_id = session_id or generate_session_id()
+            self.logger = get_logger(__name__)
+            self.logger = add_context(self.logger, session_id=self.session_id)
+            self.data_dir = ensure_directory_exists(
+                os.path.join(data_dir, self.session_id)
+            )
+            self.blob_store = BlobStore(os.path.join(data_dir, DIR_BLOBS))
+            self.faiss_dir = ensure_directory_exists(faiss_dir)
+            self.shard_dir = self.faiss_dir / self.session_id
+            self.embedding_cache_path = embedding_cache_path
+            self.max_workers = max_workers
+            self.registry = get_model_registry(config_path)
+            self.index_config = self.registry.loader.config.get(KEY_FAISS_DB)
+            self.executor_config = self.registry.loader.config.get(
+                KEY_EMBEDDING_EXECUTOR
+            )
+            self.logger.info("Multi document ingestor initialized successfully")
+        except Exception as e:
+            self.logger.error(
+                "Failed to initialize multi document ingestor: %s", str(e)
+            )
+            raise AppException(
+                f"Failed to initialize multi document ingestor: {str(e)}"
+            ) from e
+
+    def ingest_files(
+        self,
+        file_paths: list[str],
+        incremental: bool = False,
+        executor: Executor = None,
+        on_progress: Optional[Callable[[float, str], None]] = None,
+    ) -> BaseRetriever:
+        """
+        Load, chunk and index files of mixed types into the session's shard.
+
+        Files are parsed concurrently across a process pool.
+
+        Args:
+            file_paths (list[str]): Paths of the files to ingest.
+            incremental (bool): Append only new chunks to the existing shard
+                                instead of rebuilding it. Defaults to False.
+            executor (Executor, optional): Shared process pool to parse the
+                                           files on. Defaults to a new pool.
+            on_progress (Callable, optional): Called with the progress in
+                                              [0, 1] and a message after each
+                                              parsed file and embedding batch.
+
+        Returns:
+            BaseRetriever: A retriever over the session's shard.
+        """
+        try:
+            unsupported = [
+                file_path
+                for file_path in file_paths
+                if Path(file_path).suffix.lower() not in SUPPORTED_LOADERS
+            ]
+            if unsupported:
+                raise ValueError(f"Unsupported file types: {unsupported}")
+
+            report = on_progress or (lambda fraction, message: None)
+
+            # Parsing and embedding each count for half of the ingest.
+            def on_parsed(done: int, total: int) -> None:
+                report(0.5 * done / total, f"Parsed {done} of {total} files")
+
+            def on_embedded(done: int, total: int) -> None:
+                report(
+                    0.5 + 0.5 * done / total, f"Embedded {done} of {total} new chunks"
+                )
+
+            files = process_and_load_files(
+                file_paths,
+                self.data_dir,
+                max_workers=self.max_workers,
+                loaders=SUPPORTED_LOADERS,
+                executor=executor,
+                blob_store=self.blob_store,
+                on_progress=on_parsed,
+            )
+            for file_path, documents in zip(file_paths, files):
+                self.logger.info("Ingesting file: %s", file_path)
+                for document in documents:
+                    document.metadata[KEY_FILE_NAME] = Path(file_path).name
+                    document.metadata[KEY_SESSION_ID] = self.session_id
+
+            embedding_model = self.registry.get_embeddings()
+            return _create_retriever(
+                files,
+                embedding_model,
+                self.shard_dir,
+                incremental=incremental,
+                embedding_cache_path=self.embedding_cache_path,
+                index_config=self.index_config,
+                executor_config=self.executor_config,
+                on_progress=on_embedded,
+            )
+
+        except Exception as e:
+            self.logger.error("Failed to ingest documents: %s", str(e))
+            raise AppException(f"Failed to ingest documents: {str(e)}") from e
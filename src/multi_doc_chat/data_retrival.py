@@ -0,0 +1,168 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from AIFoundationKit.base.exception.custom_exception import AppException
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+from src.constants import DEFAULT_FAISS_DIR, KEY_CONTENT_HASH
+from src.utils import load_vectorstore
+
+logger = get_logger(__name__)
+
+
+def merge_shard_results(
+    results: Iterable[List[Tuple[Document, float]]], k: int
+) -> List[Tuple[Document, float]]:
+    """
+    Merge per-shard search results into a global top ``k``.
+
+    Args:
+        results (Iterable[List[Tuple[Document, float]]]): Documents and
+            relevance scores (higher is better) from each shard.
+        k (int): Number of documents to keep.
+
+    Returns:
+        List[Tuple[Document, float]]: The best ``k`` documents by score. A chunk
+        indexed in several shards is kept once, with its best score.
+    """
+    best = {}
+    for shard_results in results:
+        for document, score in shard_results:
+            key = document.metadata.get(KEY_CONTENT_HASH) or document.page_content
+            if key not in best or score > best[key][1]:
+                best[key] = (document, score)
+    return sorted(best.values(), key=lambda item: item[1], reverse=True)[:k]
+
+
+def load_shards(
+    embedding_model: Any,
+    faiss_dir: str = DEFAULT_FAISS_DIR,
+    session_ids: Optional[List[str]] = None,
+    index_config: Optional[Dict[str, Any]] = None,
+) -> List[FAISS]:
+    """
+    Load the per-session FAISS shards written by ``MultiDocIngestor``.
+
+    Args:
+        embedding_model (Any): The embedding model used to build the shards.
+        faiss_dir (str): Directory holding one sub-directory per session.
+        session_ids (Optional[List[str]]): Sessions to load. Defaults to every
+                                           shard under ``faiss_dir``.
+        index_config (Optional[Dict[str, Any]]): The ``faiss_db`` config
+                                                 section, for search knobs.
+
+    Returns:
+        List[FAISS]: The loaded shards; missing sessions are skipped.
+    """
+    if session_ids is None:
+        # Hidden entries are index generations and links, not sessions.
+        session_ids = sorted(
+            name
+            for name in os.listdir(faiss_dir)
+            if not name.startswith(".") and os.path.isdir(os.path.join(faiss_dir, name))
+        )
+
+    shards = []
+    for session_id in session_ids:
+        vectorstore = load_vectorstore(
+            os.path.join(faiss_dir, session_id), embedding_model, index_config
+        )
+        if vectorstore is None:
+            logger.warning("No FAISS shard for session %s", session_id)
+            continue
+        shards.append(vectorstore)
+    return shards
+
+
+class ShardedRetriever(BaseRetriever):
+    """
+    Retriever searching several FAISS shards in parallel and merging the top
+    ``k`` results by relevance score.
+
+    The query is embedded once and the same vector is searched in every
+    shard; FAISS releases the GIL during search, so threads run in parallel.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    shards: List[FAISS]
+
+    k: int = 4
+
+    max_workers: Optional[int] = None
+
+    def _search_shard(
+        self, shard: FAISS, query_vector: List[float]
+    ) -> List[Tuple[Document, float]]:
+        relevance = shard._select_relevance_score_fn()
+        return [
+            (document, relevance(score))
+            for document, score in shard.similarity_search_with_score_by_vector(
+                query_vector, k=self.k
+            )
+        ]
+
+    def search_with_scores(self, query: str) -> List[Tuple[Document, float]]:
+        """
+        Return the top ``k`` documents across all shards with their scores.
+        """
+        if not self.shards:
+            return []
+
+        query_vector = self.shards[0]._embed_query(query)
+        workers = min(self.max_workers or len(self.shards), len(self.shards))
+        if workers <= 1:
+            results = [self._search_shard(shard, query_vector) for shard in self.shards]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(
+                    executor.map(
+                        lambda shard: self._search_shard(shard, query_vector),
+                        self.shards,
+                    )
+                )
+        return merge_shard_results(results, self.k)
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return [document for document, _ in self.search_with_scores(query)]
+
+
+def load_sharded_retriever(
+    embedding_model: Any,
+    faiss_dir: str = DEFAULT_FAISS_DIR,
+    session_ids: Optional[List[str]] = None,
+    k: int = 4,
+    max_workers: Optional[int] = None,
+    index_config: Optional[Dict[str, Any]] = None,
+) -> ShardedRetriever:
+    """
+    Build a ``ShardedRetriever`` over the shards of the given sessions.
+
+    Args:
+        embedding_model (Any): The embedding model used to build the shards.
+        faiss_dir (str): Directory holding one sub-directory per session.
+        session_ids (Optional[List[str]]): Sessions to search. Defaults to all.
+        k (int): Number of documents to return. Defaults to 4.
+        max_workers (Optional[int]): Threads used to search the shards.
+                                     Defaults to one per shard.
+        index_config (Optional[Dict[str, Any]]): The ``faiss_db`` config
+                                                 section, for search knobs.
+
+    Returns:
+        ShardedRetriever: The retriever.
+    """
+    try:
+        shards = load_shards(embedding_model, faiss_dir, session_ids, index_config)
+        logger.info("Loaded %d FAISS shards from %s", len(shards), faiss_dir)
+        return ShardedRetriever(shards=shards, k=k, max_workers=max_workers)
+    except Exception as e:
+        logger.error("Failed to load sharded retriever: %s", str(e))
+        raise AppException(f"Failed to load sharded retriever: {str(e)}") from e
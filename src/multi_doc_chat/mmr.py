@@ -0,0 +1,194 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from langchain_community.vectorstores import FAISS
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForRetrieverRun,
+    CallbackManagerForRetrieverRun,
+)
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from pydantic import ConfigDict
+
+MetadataFilter = Union[Callable[[Dict[str, Any]], bool], Dict[str, Any]]
+
+
+def _normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def maximal_marginal_relevance(
+    query_vector: Sequence[float],
+    candidate_vectors: np.ndarray,
+    k: int = 4,
+    lambda_mult: float = 0.5,
+) -> List[int]:
+    """
+    Select ``k`` candidates by maximal marginal relevance.
+
+    All cosine similarities are computed in one matrix product up front; each
+    selection step then costs O(fetch_k) by keeping, per candidate, its
+    maximum similarity to the already selected set.
+
+    Args:
+        query_vector (Sequence[float]): The query embedding.
+        candidate_vectors (np.ndarray): Candidate embeddings, one per row.
+        k (int): Number of candidates to select.
+        lambda_mult (float): 1 for pure relevance, 0 for maximum diversity.
+
+    Returns:
+        List[int]: Row indices of the selected candidates, in selection order.
+    """
+    candidates = np.asarray(candidate_vectors, dtype=np.float32)
+    if candidates.ndim != 2 or not len(candidates) or k <= 0:
+        return []
+
+    candidates = _normalize_rows(candidates)
+    query = _normalize_rows(np.asarray(query_vector, dtype=np.float32).reshape(1, -1))
+
+    relevance = candidates @ query[0]
+    pairwise = candidates @ candidates.T
+
+    k = min(k, len(candidates))
+    selected = [int(np.argmax(relevance))]
+    redundancy = pairwise[selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < k:
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, pairwise[best], out=redundancy)
+
+    return selected
+
+
+def _reconstruct(index: Any, ids: np.ndarray) -> np.ndarray:
+    try:
+        return index.reconstruct_batch(ids)
+    except RuntimeError:
+        # Indexes without a direct map (e.g. IVF) only support one-by-one
+        # reconstruction.
+        return np.vstack([index.reconstruct(int(i)) for i in ids])
+
+
+def fetch_candidates(
+    vectorstore: FAISS,
+    query_vector: Sequence[float],
+    fetch_k: int,
+    filter: Optional[MetadataFilter] = None,
+) -> Tuple[List[Document], np.ndarray, np.ndarray]:
+    """
+    Fetch the ``fetch_k`` nearest documents together with their stored
+    vectors and search scores, without re-embedding them.
+
+    Args:
+        vectorstore (FAISS): The vectorstore to search.
+        query_vector (Sequence[float]): The query embedding.
+        fetch_k (int): Number of candidates to fetch.
+        filter (MetadataFilter, optional): Metadata filter, as accepted by
+                                           ``FAISS.similarity_search``.
+
+    Returns:
+        Tuple[List[Document], np.ndarray, np.ndarray]: The documents, their
+        vectors (one per row) and their search scores.
+    """
+    query = np.asarray([query_vector], dtype=np.float32)
+    if getattr(vectorstore, "_normalize_L2", False):
+        query = _normalize_rows(query)
+
+    scores, ids = vectorstore.index.search(
+        query, fetch_k if filter is None else fetch_k * 2
+    )
+    keep = ids[0] != -1
+    scores, ids = scores[0][keep], ids[0][keep]
+
+    documents = [
+        vectorstore.docstore.search(vectorstore.index_to_docstore_id[int(i)])
+        for i in ids
+    ]
+    if filter is not None:
+        filter_func = vectorstore._create_filter_func(filter)
+        matches = [
+            position
+            for position, document in enumerate(documents)
+            if filter_func(document.metadata)
+        ][:fetch_k]
+        documents = [documents[position] for position in matches]
+        scores, ids = scores[matches], ids[matches]
+
+    if not documents:
+        return [], np.empty((0, vectorstore.index.d), dtype=np.float32), scores
+
+    return documents, _reconstruct(vectorstore.index, ids), scores
+
+
+def mmr_search_by_vector(
+    vectorstore: FAISS,
+    query_vector: Sequence[float],
+    k: int = 4,
+    fetch_k: int = 20,
+    lambda_mult: float = 0.5,
+    filter: Optional[MetadataFilter] = None,
+) -> List[Document]:
+    """
+    Vectorized replacement for ``FAISS.max_marginal_relevance_search_by_vector``.
+
+    Args:
+        vectorstore (FAISS): The vectorstore to search.
+        query_vector (Sequence[float]): The query embedding.
+        k (int): Number of documents to return.
+        fetch_k (int): Number of candidates to rerank.
+        lambda_mult (float): 1 for pure relevance, 0 for maximum diversity.
+        filter (MetadataFilter, optional): Metadata filter.
+
+    Returns:
+        List[Document]: The selected documents.
+    """
+    documents, vectors, _ = fetch_candidates(vectorstore, query_vector, fetch_k, filter)
+    selected = maximal_marginal_relevance(query_vector, vectors, k, lambda_mult)
+    return [documents[index] for index in selected]
+
+
+class MMRRetriever(BaseRetriever):
+    """
+    Retriever over a FAISS vectorstore that reranks candidates with the
+    vectorized ``maximal_marginal_relevance``.
+    """
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    vectorstore: FAISS
+
+    k: int = 4
+
+    fetch_k: int = 20
+
+    lambda_mult: float = 0.5
+
+    filter: Optional[Any] = None
+
+    def _search(self, query_vector: Sequence[float]) -> List[Document]:
+        return mmr_search_by_vector(
+            self.vectorstore,
+            query_vector,
+            k=self.k,
+            fetch_k=self.fetch_k,
+            lambda_mult=self.lambda_mult,
+            filter=self.filter,
+        )
+
+    def _get_relevant_documents(
+        self, query: str, *, run_manager: CallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self._search(self.vectorstore._embed_query(query))
+
+    async def _aget_relevant_documents(
+        self, query: str, *, run_manager: AsyncCallbackManagerForRetrieverRun
+    ) -> List[Document]:
+        return self._search(await self.vectorstore._aembed_query(query))
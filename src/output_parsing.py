@@ -0,0 +1,236 @@
+import ast
+import json
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Optional, Type
+
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_core.exceptions import OutputParserException
+from langchain_core.output_parsers import BaseOutputParser, JsonOutputParser
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import BaseModel, ValidationError
+
+logger = get_logger(__name__)
+
+_metrics = Counter()
+
+_metrics_lock = threading.Lock()
+
+_CODE_FENCE_PATTERN = re.compile(r"```(?:json|JSON)?\s*(.*?)\s*```", re.DOTALL)
+
+_TRAILING_COMMA_PATTERN = re.compile(r",\s*([}\]])")
+
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def _record(metric: str) -> None:
+    with _metrics_lock:
+        _metrics[metric] += 1
+
+
+def get_parse_metrics() -> Dict[str, int]:
+    """
+    Return how LLM outputs were parsed since start-up.
+
+    Keys are ``direct`` (valid JSON), ``local_repair`` (fixed locally),
+    ``llm_fix`` (sent to the LLM-based fixer), ``schema_mismatch`` (valid JSON
+    that did not match the schema) and ``failed``.
+    """
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+def reset_parse_metrics() -> None:
+    """
+    Reset the parse metrics.
+    """
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _json_candidates(text: str) -> list:
+    """
+    Slice the likely JSON out of a completion: first from the first opening
+    bracket to the end of the text (keeps a tail truncated before its closing
+    bracket), then to the last closing bracket (drops trailing prose).
+    """
+    starts = [index for index in (text.find("{"), text.find("[")) if index != -1]
+    if not starts:
+        return [text]
+    start = min(starts)
+    end = max(text.rfind("}"), text.rfind("]"))
+    if end > start:
+        return [text[start:], text[start : end + 1]]
+    return [text[start:]]
+
+
+def _close_truncated_json(text: str) -> str:
+    """
+    Close strings, arrays and objects left open by a truncated completion.
+    """
+    closers = []
+    in_string = False
+    escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]" and closers:
+            closers.pop()
+
+    if in_string:
+        text += '"'
+    text = text.rstrip()
+    if text.endswith(","):
+        text = text[:-1]
+    elif text.endswith(":"):
+        text += " null"
+    return text + "".join(reversed(closers))
+
+
+def repair_json(text: str) -> Any:
+    """
+    Parse JSON from an LLM completion, repairing common defects locally.
+
+    Handles markdown code fences, prose around the JSON, smart quotes,
+    trailing commas, Python-style literals and completions truncated before
+    the closing brackets.
+
+    Args:
+        text (str): The raw completion.
+
+    Returns:
+        Any: The parsed JSON value.
+
+    Raises:
+        ValueError: If the text cannot be repaired.
+    """
+    fenced = _CODE_FENCE_PATTERN.search(text)
+    text = (fenced.group(1) if fenced else text).strip().translate(_SMART_QUOTES)
+
+    for candidate in _json_candidates(text):
+        candidate = _TRAILING_COMMA_PATTERN.sub(r"\1", candidate)
+        for attempt in (candidate, _close_truncated_json(candidate)):
+            try:
+                return json.loads(attempt)
+            except json.JSONDecodeError:
+                pass
+            try:
+                value = ast.literal_eval(attempt)
+            except (ValueError, SyntaxError, MemoryError, RecursionError):
+                continue
+            if isinstance(value, (dict, list)):
+                return value
+
+    raise ValueError("Could not repair JSON output")
+
+
+class RepairingOutputParser(BaseOutputParser[Any]):
+    """
+    JSON output parser that repairs malformed completions locally and only
+    falls back to an LLM-based fixer when local repair fails.
+
+    When ``pydantic_object`` is set, the parsed value is validated and
+    returned as ``model_dump()``. Values that parse but do not match the
+    schema are returned unchanged, as ``JsonOutputParser`` would.
+    """
+
+    pydantic_object: Optional[Type[BaseModel]] = None
+
+    fixing_parser: Any = None
+
+    def _validate(self, value: Any) -> Any:
+        if self.pydantic_object is None:
+            return value
+        try:
+            return self.pydantic_object.model_validate(value).model_dump()
+        except ValidationError as e:
+            _record("schema_mismatch")
+            logger.warning("LLM output does not match schema: %s", e)
+            return value
+
+    def parse(self, text: str) -> Any:
+        try:
+            return self.parse_without_llm(text)
+        except OutputParserException:
+            if self.fixing_parser is None:
+                raise
+
+        _record("llm_fix")
+        logger.info("Local JSON repair failed, falling back to LLM fixer")
+        return self._validate(self.fixing_parser.parse(text))
+
+    async def aparse(self, text: str) -> Any:
+        try:
+            return self.parse_without_llm(text)
+        except OutputParserException:
+            if self.fixing_parser is None:
+                raise
+
+        _record("llm_fix")
+        logger.info("Local JSON repair failed, falling back to LLM fixer")
+        return self._validate(await self.fixing_parser.aparse(text))
+
+    def parse_without_llm(self, text: str) -> Any:
+        """
+        Parse ``text`` using only local repair.
+
+        Raises:
+            OutputParserException: If the text cannot be repaired.
+        """
+        try:
+            value = json.loads(text)
+            _record("direct")
+        except json.JSONDecodeError:
+            try:
+                value = repair_json(text)
+                _record("local_repair")
+            except ValueError as e:
+                if self.fixing_parser is None:
+                    _record("failed")
+                raise OutputParserException(
+                    f"Invalid JSON output: {e}", llm_output=text
+                ) from e
+        return self._validate(value)
+
+    def get_format_instructions(self) -> str:
+        return JsonOutputParser(
+            pydantic_object=self.pydantic_object
+        ).get_format_instructions()
+
+    @property
+    def _type(self) -> str:
+        return "repairing_json"
+
+
+def build_structured_output_chain(
+    prompt: Runnable, llm: Any, schema: Type[BaseModel], field: str = None
+) -> Runnable:
+    """
+    Build a chain that uses the provider's native structured output.
+
+    Args:
+        prompt (Runnable): The prompt template.
+        llm (Any): A chat model supporting ``with_structured_output``.
+        schema (Type[BaseModel]): The schema to request.
+        field (str, optional): Return only this field of the result, for
+                               schemas that wrap a list.
+
+    Returns:
+        Runnable: Chain returning plain dicts or lists.
+    """
+
+    def to_plain(result: BaseModel) -> Any:
+        value = result.model_dump()
+        return value[field] if field else value
+
+    return prompt | llm.with_structured_output(schema) | RunnableLambda(to_plain)
@@ -0,0 +1,294 @@
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_core.runnables import Runnable, RunnableConfig
+
+from src.constants import (
+    DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+    DEFAULT_RESPONSE_CACHE_TTL_SECONDS,
+)
+
+logger = get_logger(__name__)
+
+
+def response_cache_key(prompt_name: str, model_config: Any, inputs: Any) -> str:
+    """
+    Compute the cache key for a chain call.
+
+    Args:
+        prompt_name (str): Name of the prompt in ``PROMPT_REGISTRY``.
+        model_config (Any): Anything identifying the model settings.
+        inputs (Any): The chain inputs.
+
+    Returns:
+        str: sha256 hex digest of the prompt name, model config and inputs.
+    """
+    payload = json.dumps(
+        {"prompt": prompt_name, "model": repr(model_config), "inputs": inputs},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(ABC):
+    """
+    Interface of a chain response cache.
+
+    Subclasses implement ``_get`` and ``_set``; hit and miss counting is done
+    here so every backend reports the same metrics.
+    """
+
+    def __init__(self):
+        self._metrics_lock = threading.Lock()
+        self.metrics = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def _record(self, metric: str, count: int = 1) -> None:
+        with self._metrics_lock:
+            self.metrics[metric] += count
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached response.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Tuple[bool, Any]: Whether the key was found, and the response.
+        """
+        found, value = self._get(key)
+        self._record("hits" if found else "misses")
+        return found, value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a response.
+
+        Args:
+            key (str): The cache key.
+            value (Any): A JSON-serializable response.
+        """
+        self._set(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Return a snapshot of the cache metrics, including the hit rate.
+        """
+        with self._metrics_lock:
+            stats = dict(self.metrics)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    @abstractmethod
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a response without recording metrics.
+        """
+
+    @abstractmethod
+    def _set(self, key: str, value: Any) -> None:
+        """
+        Store a response.
+        """
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Response cache stored in a local SQLite file, with a TTL and an LRU bound
+    on the number of entries.
+    """
+
+    def __init__(
+        self,
+        cache_path: str,
+        ttl_seconds: Optional[float] = DEFAULT_RESPONSE_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_RESPONSE_CACHE_MAX_ENTRIES,
+    ):
+        """
+        Initializes the SQLiteResponseCache.
+
+        Args:
+            cache_path (str): Path of the SQLite database file.
+            ttl_seconds (float, optional): Lifetime of an entry. None disables
+                                           expiry.
+            max_entries (int): Maximum number of cached responses.
+        """
+        super().__init__()
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_last_access "
+                "ON responses (last_access)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.cache_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def _get(self, key: str) -> Tuple[bool, Any]:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False, None
+
+            value, created_at = row
+            if self._is_expired(created_at, now):
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._record("expirations")
+                return False, None
+
+            conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?", (now, key)
+            )
+        return True, json.loads(value)
+
+    def _set(self, key: str, value: Any) -> None:
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, value, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, default=str), now, now),
+            )
+            if self.ttl_seconds is not None:
+                expired = conn.execute(
+                    "DELETE FROM responses WHERE created_at < ?",
+                    (now - self.ttl_seconds,),
+                ).rowcount
+                if expired:
+                    self._record("expirations", expired)
+
+            (count,) = conn.execute("SELECT COUNT(*) FROM responses").fetchone()
+            overflow = count - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM responses WHERE key IN ("
+                    "SELECT key FROM responses ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._record("evictions", overflow)
+
+
+class CachedRunnable(Runnable):
+    """
+    Wraps a chain so identical calls are answered from a ``ResponseCache``.
+
+    The async methods run the blocking cache lookups in a worker thread.
+    Streaming calls stream the wrapped chain on a miss and cache the
+    concatenated chunks; a hit is yielded as one chunk.
+    """
+
+    def __init__(
+        self,
+        runnable: Runnable,
+        cache: ResponseCache,
+        prompt_name: str,
+        model_config: Any,
+    ):
+        """
+        Initializes the CachedRunnable.
+
+        Args:
+            runnable (Runnable): The chain to wrap.
+            cache (ResponseCache): The cache backend.
+            prompt_name (str): Name of the prompt, part of the cache key.
+            model_config (Any): Model settings, part of the cache key.
+        """
+        self.runnable = runnable
+        self.cache = cache
+        self.prompt_name = prompt_name
+        self.model_config = model_config
+
+    def _key(self, input: Any) -> str:
+        return response_cache_key(self.prompt_name, self.model_config, input)
+
+    def invoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        key = self._key(input)
+        found, value = self.cache.get(key)
+        if found:
+            logger.info("Response cache hit for prompt %s", self.prompt_name)
+            return value
+
+        value = self.runnable.invoke(input, config, **kwargs)
+        self.cache.set(key, value)
+        return value
+
+    async def ainvoke(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Any:
+        key = self._key(input)
+        found, value = await asyncio.to_thread(self.cache.get, key)
+        if found:
+            logger.info("Response cache hit for prompt %s", self.prompt_name)
+            return value
+
+        value = await self.runnable.ainvoke(input, config, **kwargs)
+        await asyncio.to_thread(self.cache.set, key, value)
+        return value
+
+    def stream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> Iterator[Any]:
+        key = self._key(input)
+        found, value = self.cache.get(key)
+        if found:
+            logger.info("Response cache hit for prompt %s", self.prompt_name)
+            yield value
+            return
+
+        value = None
+        for chunk in self.runnable.stream(input, config, **kwargs):
+            value = chunk if value is None else value + chunk
+            yield chunk
+        self.cache.set(key, value)
+
+    async def astream(
+        self, input: Any, config: Optional[RunnableConfig] = None, **kwargs: Any
+    ) -> AsyncIterator[Any]:
+        key = self._key(input)
+        found, value = await asyncio.to_thread(self.cache.get, key)
+        if found:
+            logger.info("Response cache hit for prompt %s", self.prompt_name)
+            yield value
+            return
+
+        value = None
+        async for chunk in self.runnable.astream(input, config, **kwargs):
+            value = chunk if value is None else value + chunk
+            yield chunk
+        await asyncio.to_thread(self.cache.set, key, value)
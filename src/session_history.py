@@ -0,0 +1,325 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Sequence, Tuple
+
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_core.chat_history import BaseChatMessageHistory
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    SystemMessage,
+    message_to_dict,
+    messages_from_dict,
+)
+
+from src.constants import (
+    CHARS_PER_TOKEN,
+    SESSION_HISTORY_IDLE_SECONDS,
+    SESSION_HISTORY_MAX_MESSAGES,
+    SESSION_HISTORY_MAX_SESSIONS,
+    SESSION_HISTORY_MAX_TOKENS,
+)
+
+logger = get_logger(__name__)
+
+Summarizer = Callable[[str, List[BaseMessage]], str]
+
+
+def estimate_tokens(message: BaseMessage) -> int:
+    """
+    Approximate the number of tokens in a message.
+
+    Args:
+        message (BaseMessage): The message.
+
+    Returns:
+        int: ``CHARS_PER_TOKEN`` characters per token, at least 1.
+    """
+    return len(str(message.content)) // CHARS_PER_TOKEN + 1
+
+
+@dataclass
+class _CachedWindow:
+    last_id: int
+    window_start: int
+    messages: List[BaseMessage] = field(default_factory=list)
+    last_access: float = 0.0
+
+
+class SessionHistoryStore:
+    """
+    Chat history for many sessions, persisted in a local SQLite file.
+
+    Every message is kept on disk, but only a window of recent messages is
+    returned to the chains: once a session exceeds ``max_messages`` or
+    ``max_tokens``, the oldest turns leave the window and, when a summarizer is
+    given, are folded into a running summary returned as a leading
+    ``SystemMessage``. Windows of recently used sessions are cached in memory;
+    idle sessions are evicted least recently used first. The cache is
+    validated against the database on every read, so several worker processes
+    can share one file.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        max_messages: int = SESSION_HISTORY_MAX_MESSAGES,
+        max_tokens: int = SESSION_HISTORY_MAX_TOKENS,
+        max_sessions: int = SESSION_HISTORY_MAX_SESSIONS,
+        idle_seconds: Optional[float] = SESSION_HISTORY_IDLE_SECONDS,
+        summarizer: Optional[Summarizer] = None,
+    ):
+        """
+        Initializes the SessionHistoryStore.
+
+        Args:
+            db_path (str): Path of the SQLite database file.
+            max_messages (int): Maximum number of messages in the window.
+            max_tokens (int): Approximate token budget of the window.
+            max_sessions (int): Maximum number of sessions cached in memory.
+            idle_seconds (float, optional): Evict sessions from memory after
+                                            this long without access.
+            summarizer (Summarizer, optional): Called with the previous summary
+                                               and the messages leaving the
+                                               window; returns the new summary.
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_messages = max_messages
+        self.max_tokens = max_tokens
+        self.max_sessions = max_sessions
+        self.idle_seconds = idle_seconds
+        self.summarizer = summarizer
+        self.evictions = 0
+        self._lock = threading.RLock()
+        self._cache: "OrderedDict[str, _CachedWindow]" = OrderedDict()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS messages ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "session_id TEXT NOT NULL, message TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_messages_session "
+                "ON messages (session_id, id)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                "session_id TEXT PRIMARY KEY, summary TEXT NOT NULL DEFAULT '', "
+                "window_start INTEGER NOT NULL DEFAULT 0, updated_at REAL NOT NULL)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def get_history(self, session_id: str) -> "SQLiteChatMessageHistory":
+        """
+        Return the history of a session, creating it on first use.
+        """
+        return SQLiteChatMessageHistory(self, session_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._cache)
+
+    def _state(self, conn: sqlite3.Connection, session_id: str) -> Tuple[int, int]:
+        (last_id,) = conn.execute(
+            "SELECT COALESCE(MAX(id), 0) FROM messages WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        row = conn.execute(
+            "SELECT window_start FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        return last_id, row[0] if row else 0
+
+    def _evict_idle(self, now: float) -> None:
+        while self._cache:
+            session_id, entry = next(iter(self._cache.items()))
+            idle = (
+                self.idle_seconds is not None
+                and now - entry.last_access > self.idle_seconds
+            )
+            if len(self._cache) <= self.max_sessions and not idle:
+                break
+            del self._cache[session_id]
+            self.evictions += 1
+
+    def window(self, session_id: str) -> List[BaseMessage]:
+        """
+        Return the summary (if any) followed by the messages in the window.
+        """
+        now = time.time()
+        with self._lock:
+            with self._connect() as conn:
+                last_id, window_start = self._state(conn, session_id)
+                entry = self._cache.get(session_id)
+                if (
+                    entry is None
+                    or entry.last_id != last_id
+                    or entry.window_start != window_start
+                ):
+                    entry = _CachedWindow(
+                        last_id, window_start, self._load_window(conn, session_id)
+                    )
+                    self._cache[session_id] = entry
+
+            entry.last_access = now
+            self._cache.move_to_end(session_id)
+            self._evict_idle(now)
+            return list(entry.messages)
+
+    def _load_window(
+        self, conn: sqlite3.Connection, session_id: str
+    ) -> List[BaseMessage]:
+        row = conn.execute(
+            "SELECT summary, window_start FROM sessions WHERE session_id = ?",
+            (session_id,),
+        ).fetchone()
+        summary, window_start = row if row else ("", 0)
+        messages = [
+            message for _, message in self._rows(conn, session_id, window_start)
+        ]
+        if summary:
+            messages.insert(
+                0,
+                SystemMessage(
+                    content=f"Summary of the earlier conversation: {summary}"
+                ),
+            )
+        return messages
+
+    def _rows(
+        self, conn: sqlite3.Connection, session_id: str, after_id: int
+    ) -> List[Tuple[int, BaseMessage]]:
+        rows = conn.execute(
+            "SELECT id, message FROM messages WHERE session_id = ? AND id > ? "
+            "ORDER BY id",
+            (session_id, after_id),
+        ).fetchall()
+        messages = messages_from_dict([json.loads(message) for _, message in rows])
+        return [(row[0], message) for row, message in zip(rows, messages)]
+
+    def _overflow(
+        self, rows: List[Tuple[int, BaseMessage]]
+    ) -> List[Tuple[int, BaseMessage]]:
+        # The last exchange always stays in the window, however long it is.
+        last_turn = max(
+            (
+                index
+                for index, (_, message) in enumerate(rows)
+                if isinstance(message, HumanMessage)
+            ),
+            default=len(rows) - 1,
+        )
+        tokens = sum(estimate_tokens(message) for _, message in rows)
+        cut = 0
+        while cut < last_turn and (
+            len(rows) - cut > self.max_messages or tokens > self.max_tokens
+        ):
+            tokens -= estimate_tokens(rows[cut][1])
+            cut += 1
+        # Keep the window starting at a user turn.
+        while cut and cut < last_turn and not isinstance(rows[cut][1], HumanMessage):
+            cut += 1
+        return rows[:cut]
+
+    def append(self, session_id: str, messages: Sequence[BaseMessage]) -> None:
+        """
+        Persist messages, then move turns that no longer fit out of the window.
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO messages (session_id, message) VALUES (?, ?)",
+                [
+                    (session_id, json.dumps(message_to_dict(message)))
+                    for message in messages
+                ],
+            )
+            conn.execute(
+                "INSERT INTO sessions (session_id, updated_at) VALUES (?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE "
+                "SET updated_at = excluded.updated_at",
+                (session_id, now),
+            )
+            summary, window_start = conn.execute(
+                "SELECT summary, window_start FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            overflow = self._overflow(self._rows(conn, session_id, window_start))
+
+        if not overflow:
+            return
+
+        new_start = overflow[-1][0]
+        if self.summarizer is not None:
+            # Summarize outside the transaction; the LLM call can be slow.
+            try:
+                summary = self.summarizer(summary, [message for _, message in overflow])
+            except Exception as e:
+                logger.warning("Failed to summarize session %s: %s", session_id, e)
+
+        with self._connect() as conn:
+            # Another process may have compacted the session in the meantime.
+            conn.execute(
+                "UPDATE sessions SET summary = ?, window_start = ? "
+                "WHERE session_id = ? AND window_start = ?",
+                (summary, new_start, session_id, window_start),
+            )
+
+    def clear(self, session_id: str) -> None:
+        """
+        Delete every message and the summary of a session.
+        """
+        with self._lock:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM messages WHERE session_id = ?", (session_id,))
+                conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._cache.pop(session_id, None)
+
+
+class SQLiteChatMessageHistory(BaseChatMessageHistory):
+    """
+    ``BaseChatMessageHistory`` view of one session in a ``SessionHistoryStore``.
+    """
+
+    def __init__(self, store: SessionHistoryStore, session_id: str):
+        self.store = store
+        self.session_id = session_id
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        return self.store.window(self.session_id)
+
+    def add_messages(self, messages: Sequence[BaseMessage]) -> None:
+        self.store.append(self.session_id, messages)
+
+    def clear(self) -> None:
+        self.store.clear(self.session_id)
+
+    # SQLite and the summarizer's LLM call block, so the async variants run
+    # them in a worker thread instead of on the event loop.
+
+    async def aget_messages(self) -> List[BaseMessage]:
+        return await asyncio.to_thread(self.store.window, self.session_id)
+
+    async def aadd_messages(self, messages: Sequence[BaseMessage]) -> None:
+        await asyncio.to_thread(self.store.append, self.session_id, messages)
+
+    async def aclear(self) -> None:
+        await asyncio.to_thread(self.store.clear, self.session_id)
@@ -1,15 +1,22 @@
 import os
+from concurrent.futures import Executor
 from pathlib import Path
 
 from AIFoundationKit.base.exception.custom_exception import AppException
 from AIFoundationKit.base.logger.custom_logger import get_logger
 from AIFoundationKit.base.logger.logger_utils import add_context
 from AIFoundationKit.base.utils import generate_session_id
-from AIFoundationKit.rag.model_loader import ModelLoader
-from dotenv import load_dotenv
 from langchain_core.documents import Document
 
-from src.utils import ensure_directory_exists, process_and_load_files, _create_retriever
+from src.blob_store import BlobStore
+from src.constants import (
+    DEFAULT_EMBEDDING_CACHE_PATH,
+    DIR_BLOBS,
+    KEY_EMBEDDING_EXECUTOR,
+    KEY_FAISS_DB,
+)
+from src.model_registry import DEFAULT_CONFIG_PATH, get_model_registry
+from src.utils import _create_retriever, ensure_directory_exists, process_and_load_files
 
 
 class SingleDocIngestor:
@@ -18,18 +25,27 @@ class SingleDocIngestor:
         data_dir: str = "data/single_document_chat",
         faiss_dir: str = "data/faiss_index",
         session_id: str = None,
+        embedding_cache_path: str = DEFAULT_EMBEDDING_CACHE_PATH,
+        max_workers: int = None,
+        config_path: str = DEFAULT_CONFIG_PATH,
     ):
         try:
-            load_dotenv()
             self.data_dir = ensure_directory_exists(data_dir)
+            self.blob_store = BlobStore(os.path.join(data_dir, DIR_BLOBS))
             self.faiss_dir = ensure_directory_exists(faiss_dir)
+            self.embedding_cache_path = embedding_cache_path
+            self.max_workers = max_workers
 
             self.logger = get_logger(__name__)
             if session_id is None:
                 self.logger = add_context(self.logger, session_id=generate_session_id())
             else:
                 self.logger = add_context(self.logger, session_id=session_id)
-            self.model_loader = ModelLoader()
+            self.registry = get_model_registry(config_path)
+            self.index_config = self.registry.loader.config.get(KEY_FAISS_DB)
+            self.executor_config = self.registry.loader.config.get(
+                KEY_EMBEDDING_EXECUTOR
+            )
             self.logger.info("Single document ingestor initialized successfully")
         except Exception as e:
             self.logger.error(
@@ -39,17 +55,42 @@ class SingleDocIngestor:
                 f"Failed to initialize single document ingestor: {str(e)}"
             ) from e
 
-    def ingest_files(self, file_paths: list[str]) -> list[Document]:
+    def ingest_files(
+        self,
+        file_paths: list[str],
+        incremental: bool = False,
+        executor: Executor = None,
+    ) -> list[Document]:
+        """
+        Load, chunk and index the given files.
+
+        Args:
+            file_paths (list[str]): Paths of the files to ingest.
+            incremental (bool): Append only new chunks to the existing FAISS
+                                index instead of rebuilding it. Defaults to False.
+            executor (Executor, optional): Shared process pool to parse the
+                                           files on. Defaults to a new pool.
+        """
         try:
-            files = process_and_load_files(file_paths, self.data_dir)
+            files = process_and_load_files(
+                file_paths,
+                self.data_dir,
+                max_workers=self.max_workers,
+                executor=executor,
+                blob_store=self.blob_store,
+            )
             for file_path in file_paths:
                 self.logger.info("Ingesting file: %s", file_path)
 
-            embedding_model = self.model_loader.load_embeddings()
+            embedding_model = self.registry.get_embeddings()
             return _create_retriever(
                 files,
                 embedding_model,
-                self.faiss_dir
+                self.faiss_dir,
+                incremental=incremental,
+                embedding_cache_path=self.embedding_cache_path,
+                index_config=self.index_config,
+                executor_config=self.executor_config,
             )
 
         except Exception as e:
@@ -1,33 +1,73 @@
-import os
-import sys
-from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List
 
 from AIFoundationKit.base.exception.custom_exception import AppException
 from AIFoundationKit.base.logger.custom_logger import get_logger
 from AIFoundationKit.base.logger.logger_utils import add_context
 from AIFoundationKit.base.utils import generate_session_id
-from AIFoundationKit.rag.model_loader import ModelLoader
-from dotenv import load_dotenv
 from langchain_classic.chains.combine_documents import create_stuff_documents_chain
-from langchain_classic.chains.history_aware_retriever import (
-    create_history_aware_retriever,
-)
 from langchain_classic.chains.retrieval import create_retrieval_chain
-from langchain_community.chat_message_histories import ChatMessageHistory
-from langchain_community.vectorstores import FAISS
 from langchain_core.chat_history import BaseChatMessageHistory
-from langchain_core.runnables.history import RunnableWithMessageHistory
+from langchain_core.documents import Document
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.retrievers import BaseRetriever
+from langchain_core.runnables import RunnableLambda
 
 from prompt.prompt_lib import PROMPT_REGISTRY
-from src.utils import load_retriever_from_vectorstore
+from src.constants import (
+    DEFAULT_SESSION_HISTORY_PATH,
+    KEY_FAISS_DB,
+    STREAM_EVENT_SOURCES,
+    STREAM_EVENT_TOKEN,
+)
+from src.hybrid_search import BM25Index, bm25_index_path
+from src.model_registry import DEFAULT_CONFIG_PATH, get_model_registry
+from src.session_history import SessionHistoryStore
+from src.single_doc_chat.query_contextualizer import QueryContextualizer
+from src.utils import load_retriever_from_vectorstore, load_vectorstore
 
 
 class ConversationlRAG:
-    def __init__(self):
+    def __init__(
+        self,
+        session_id: str = None,
+        retriever: BaseRetriever = None,
+        config_path: str = DEFAULT_CONFIG_PATH,
+        history_store: SessionHistoryStore = None,
+        contextualizer: QueryContextualizer = None,
+    ):
         try:
-            load_dotenv()
+            self.session_id = session_id or generate_session_id()
             self.logger = get_logger(__name__)
-            self.logger = add_context(self.logger, session_id=generate_session_id())
+            self.logger = add_context(self.logger, session_id=self.session_id)
+            self.registry = get_model_registry(config_path)
+            self.llm = self._load_llm()
+            # Shared through the registry, and so its response cache.
+            self.summary_chain = self.registry.get_chain(
+                "summarize_conversation",
+                lambda llm: PROMPT_REGISTRY["summarize_conversation"]
+                | llm
+                | StrOutputParser(),
+            )
+            if history_store is None:
+                history_store = SessionHistoryStore(
+                    DEFAULT_SESSION_HISTORY_PATH, summarizer=self._summarize_history
+                )
+            self.history_store = history_store
+            if contextualizer is None:
+                contextualizer = QueryContextualizer(
+                    self.registry.get_chain(
+                        "contextualize_question",
+                        lambda llm: PROMPT_REGISTRY["contextualize_question"]
+                        | llm
+                        | StrOutputParser(),
+                    )
+                )
+            self.contextualizer = contextualizer
+            self.retriever = None
+            self.chain = None
+            if retriever is not None:
+                self._build_chain(retriever)
             self.logger.info("Conversation RAG initialized successfully")
         except Exception as e:
             self.logger.error("Failed to initialize conversation RAG: %s", str(e))
@@ -38,19 +78,62 @@ class ConversationlRAG:
     def _load_llm(self):
         try:
             self.logger.info("Loading LLM...")
+            llm = self.registry.get_llm()
             self.logger.info("LLM loaded successfully")
+            return llm
         except Exception as e:
             self.logger.error("Failed to load LLM: %s", str(e))
             raise AppException(f"Failed to load LLM: {str(e)}") from e
 
-    def _get_session_history(self):
+    def _get_session_history(self, session_id: str = None) -> BaseChatMessageHistory:
         try:
             self.logger.info("Getting session history...")
+            session_id = session_id or self.session_id
+            history = self.history_store.get_history(session_id)
             self.logger.info("Session history retrieved successfully")
+            return history
         except Exception as e:
             self.logger.error("Failed to get session history: %s", str(e))
             raise AppException(f"Failed to get session history: {str(e)}") from e
 
+    def _summarize_history(self, summary: str, messages: List[BaseMessage]) -> str:
+        return self.summary_chain.invoke(
+            {"summary": summary or "None", "messages": messages}
+        )
+
+    def _build_chain(self, retriever: BaseRetriever) -> None:
+        self.retriever = retriever
+        # Replaces create_history_aware_retriever: the contextualizer only
+        # calls the LLM when the query actually depends on the history.
+        self.history_aware_retriever = RunnableLambda(
+            self._retrieve, afunc=self._aretrieve
+        )
+        self.qa_chain = self.registry.get_chain(
+            "context_qa",
+            lambda llm: create_stuff_documents_chain(
+                llm, PROMPT_REGISTRY["context_qa"]
+            ),
+        )
+        self.chain = create_retrieval_chain(self.history_aware_retriever, self.qa_chain)
+
+    def _retrieve(self, inputs: Dict[str, Any]) -> List[Document]:
+        query = self.contextualizer.contextualize(
+            inputs["input"], inputs.get("chat_history", [])
+        )
+        return self.retriever.invoke(query)
+
+    async def _aretrieve(self, inputs: Dict[str, Any]) -> List[Document]:
+        query = await self.contextualizer.acontextualize(
+            inputs["input"], inputs.get("chat_history", [])
+        )
+        return await self.retriever.ainvoke(query)
+
+    def _require_chain(self) -> None:
+        if self.chain is None:
+            raise AppException(
+                "No retriever loaded; call load_retriever_from_vectorstore first"
+            )
+
     def load_retriever_from_vectorstore(
         self, vectorstore, search_type="similarity", k=4
     ):
@@ -59,6 +142,7 @@ class ConversationlRAG:
             retriever = load_retriever_from_vectorstore(
                 vectorstore, search_type=search_type, k=k
             )
+            self._build_chain(retriever)
             self.logger.info("Retriever loaded successfully")
             return retriever
         except Exception as e:
@@ -67,10 +151,102 @@ class ConversationlRAG:
                 f"Failed to load retriever from vectorstore: {str(e)}"
             ) from e
 
-    def invoke_retriever(self):
+    def load_retriever_from_faiss(
+        self, faiss_index_path: str, search_type="similarity", k=4
+    ):
+        try:
+            vectorstore = load_vectorstore(
+                faiss_index_path,
+                self.registry.get_embeddings(),
+                self.registry.loader.config.get(KEY_FAISS_DB),
+            )
+            if vectorstore is None:
+                raise FileNotFoundError(f"No FAISS index at {faiss_index_path}")
+            if search_type != "hybrid":
+                return self.load_retriever_from_vectorstore(
+                    vectorstore, search_type=search_type, k=k
+                )
+            # Use the persisted keyword index instead of rebuilding it.
+            retriever = load_retriever_from_vectorstore(
+                vectorstore,
+                search_type=search_type,
+                k=k,
+                bm25_index=BM25Index.load(bm25_index_path(faiss_index_path)),
+            )
+            self._build_chain(retriever)
+            return retriever
+        except Exception as e:
+            self.logger.error("Failed to load FAISS index: %s", str(e))
+            raise AppException(f"Failed to load FAISS index: {str(e)}") from e
+
+    def invoke_retriever(self, user_input: str, session_id: str = None):
         try:
             self.logger.info("Invoking retriever...")
+            self._require_chain()
+            history = self._get_session_history(session_id)
+            documents = self.history_aware_retriever.invoke(
+                {"input": user_input, "chat_history": history.messages}
+            )
             self.logger.info("Retriever invoked successfully")
+            return documents
         except Exception as e:
             self.logger.error("Failed to invoke retriever: %s", str(e))
             raise AppException(f"Failed to invoke retriever: {str(e)}") from e
+
+    def invoke(self, user_input: str, session_id: str = None) -> str:
+        try:
+            self._require_chain()
+            history = self._get_session_history(session_id)
+            result = self.chain.invoke(
+                {"input": user_input, "chat_history": history.messages}
+            )
+            answer = result.get("answer", "")
+            history.add_messages(
+                [HumanMessage(content=user_input), AIMessage(content=answer)]
+            )
+            return answer
+        except Exception as e:
+            self.logger.error("Failed to answer question: %s", str(e))
+            raise AppException(f"Failed to answer question: {str(e)}") from e
+
+    async def astream_answer(
+        self, user_input: str, session_id: str = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Answer a question, yielding the retrieved sources first and then the
+        answer tokens as the LLM produces them.
+
+        Yields:
+            Dict[str, Any]: ``{"type": "sources", "documents": [...]}`` once,
+            followed by ``{"type": "token", "content": "..."}`` per token.
+        """
+        try:
+            self._require_chain()
+            history = self._get_session_history(session_id)
+            chat_history = await history.aget_messages()
+
+            documents: List[Document] = await self.history_aware_retriever.ainvoke(
+                {"input": user_input, "chat_history": chat_history}
+            )
+            yield {"type": STREAM_EVENT_SOURCES, "documents": documents}
+
+            answer_parts = []
+            async for token in self.qa_chain.astream(
+                {
+                    "input": user_input,
+                    "chat_history": chat_history,
+                    "context": documents,
+                }
+            ):
+                answer_parts.append(token)
+                yield {"type": STREAM_EVENT_TOKEN, "content": token}
+
+            await history.aadd_messages(
+                [
+                    HumanMessage(content=user_input),
+                    AIMessage(content="".join(answer_parts)),
+                ]
+            )
+        except Exception as e:
+            self.logger.error("Failed to stream answer: %s", str(e))
+            raise AppException(f"Failed to stream answer: {str(e)}") from e
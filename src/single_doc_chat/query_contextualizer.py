@@ -0,0 +1,140 @@
+import hashlib
+import json
+import re
+import threading
+from collections import Counter, OrderedDict
+from typing import Dict, List, Sequence
+
+from AIFoundationKit.base.logger.custom_logger import get_logger
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import Runnable
+
+from src.constants import (
+    CONTEXT_FOLLOW_UP_PREFIXES,
+    CONTEXT_REFERENCE_WORDS,
+    QUERY_REWRITE_CACHE_SIZE,
+    STANDALONE_QUERY_MIN_WORDS,
+)
+
+logger = get_logger(__name__)
+
+_WORD_PATTERN = re.compile(r"[a-z']+")
+
+
+def needs_contextualization(query: str) -> bool:
+    """
+    Decide with a local heuristic whether a follow-up query must be rewritten
+    using the chat history before retrieval.
+
+    A query needs rewriting when it starts like a follow-up ("and ...",
+    "what about ..."), contains a pronoun or back-reference, or is a single
+    word ("why?"). Short but complete queries ("revenue in 2023") are kept.
+
+    Args:
+        query (str): The user query.
+
+    Returns:
+        bool: True if the query probably depends on earlier turns.
+    """
+    text = query.strip().lower()
+    words = _WORD_PATTERN.findall(text)
+    if len(words) < STANDALONE_QUERY_MIN_WORDS:
+        return True
+    if text.startswith(CONTEXT_FOLLOW_UP_PREFIXES):
+        return True
+    return any(word in CONTEXT_REFERENCE_WORDS for word in words)
+
+
+def history_fingerprint(chat_history: Sequence[BaseMessage]) -> str:
+    """
+    Hash the type and content of every message in a chat history.
+    """
+    payload = json.dumps(
+        [[message.type, str(message.content)] for message in chat_history]
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class QueryContextualizer:
+    """
+    Rewrites follow-up queries into standalone questions, skipping the LLM
+    call whenever it is not needed.
+
+    Queries are passed through unchanged when the history is empty or the
+    query looks standalone; rewrites are cached per (history, query) in a
+    bounded LRU. One instance is meant to be shared by every conversation of
+    a process, so the cache outlives single requests.
+    """
+
+    def __init__(
+        self, rewrite_chain: Runnable, cache_size: int = QUERY_REWRITE_CACHE_SIZE
+    ):
+        """
+        Initializes the QueryContextualizer.
+
+        Args:
+            rewrite_chain (Runnable): Chain taking ``input`` and
+                                      ``chat_history`` and returning the
+                                      rewritten question as a string.
+            cache_size (int): Maximum number of cached rewrites.
+        """
+        self.rewrite_chain = rewrite_chain
+        self.cache_size = cache_size
+        self.stats: Dict[str, int] = Counter()
+        self._cache: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _lookup(self, query: str, chat_history: List[BaseMessage]):
+        if not chat_history:
+            self._count("no_history")
+            return query, None
+        if not needs_contextualization(query):
+            self._count("standalone")
+            return query, None
+
+        key = (history_fingerprint(chat_history), query)
+        with self._lock:
+            rewritten = self._cache.get(key)
+            if rewritten is not None:
+                self._cache.move_to_end(key)
+                self.stats["cached"] += 1
+                return rewritten, None
+        return None, key
+
+    def _store(self, key: tuple, rewritten: str) -> str:
+        rewritten = rewritten.strip()
+        with self._lock:
+            self.stats["rewritten"] += 1
+            self._cache[key] = rewritten
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        logger.info("Contextualized query: %s", rewritten)
+        return rewritten
+
+    def contextualize(self, query: str, chat_history: List[BaseMessage]) -> str:
+        """
+        Return a standalone version of ``query``.
+        """
+        result, key = self._lookup(query, chat_history)
+        if key is None:
+            return result
+        rewritten = self.rewrite_chain.invoke(
+            {"input": query, "chat_history": chat_history}
+        )
+        return self._store(key, rewritten)
+
+    async def acontextualize(self, query: str, chat_history: List[BaseMessage]) -> str:
+        """
+        Async variant of ``contextualize``.
+        """
+        result, key = self._lookup(query, chat_history)
+        if key is None:
+            return result
+        rewritten = await self.rewrite_chain.ainvoke(
+            {"input": query, "chat_history": chat_history}
+        )
+        return self._store(key, rewritten)
@@ -0,0 +1,204 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator, Optional
+
+from AIFoundationKit.base.exception.custom_exception import AppException
+from AIFoundationKit.base.logger.custom_logger import get_logger
+
+from src.constants import MAX_UPLOAD_BYTES, UPLOAD_CHUNK_SIZE
+
+logger = get_logger(__name__)
+
+
+class UploadTooLargeError(AppException):
+    """Raised when an upload exceeds the configured size limit."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(
+            f"Upload exceeds the limit of {max_bytes} bytes",
+            code="UPLOAD_TOO_LARGE",
+            status_code=413,
+            details={"max_bytes": max_bytes},
+        )
+
+
+@dataclass
+class SavedFile:
+    path: str
+    sha256: str
+    size: int
+
+
+def _known_size(source: Any) -> Optional[int]:
+    """
+    Size of ``source`` if it can be told without reading it.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return memoryview(source).nbytes
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    size = getattr(source, "size", None)
+    if isinstance(size, int):
+        return size
+    try:
+        return os.fstat(source.fileno()).st_size - source.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _iter_chunks(source: Any, chunk_size: int) -> Iterator[bytes]:
+    """
+    Yield the bytes of ``source`` in chunks of at most ``chunk_size``.
+
+    ``source`` may be bytes, a file path, a binary file-like object, an
+    object with ``getbuffer`` (e.g. a Streamlit upload) or an iterable of
+    byte strings.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            yield from _iter_chunks(f, chunk_size)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, view.nbytes, chunk_size):
+            yield view[start : start + chunk_size]
+    elif hasattr(source, "read"):
+        while chunk := source.read(chunk_size):
+            yield chunk
+    elif hasattr(source, "getbuffer"):
+        yield from _iter_chunks(source.getbuffer(), chunk_size)
+    else:
+        yield from source
+
+
+class _AtomicWriter:
+    """
+    Writes a file through a temporary file in the same directory, hashing
+    and counting bytes as they arrive.
+
+    ``commit`` fsyncs the data and renames it into place, so readers never
+    see a partially written file.
+    """
+
+    def __init__(self, directory: str, file_name: str, max_bytes: int):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, os.path.basename(file_name))
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._digest = hashlib.sha256()
+        fd, self._temp_path = tempfile.mkstemp(
+            prefix=".", suffix=".part", dir=directory
+        )
+        self._file = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self.size += len(chunk)
+        if self.size > self.max_bytes:
+            raise UploadTooLargeError(self.max_bytes)
+        self._digest.update(chunk)
+        self._file.write(chunk)
+
+    def commit(self) -> SavedFile:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+        # Persist the rename itself.
+        dir_fd = os.open(os.path.dirname(self.path) or ".", os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        return SavedFile(self.path, self._digest.hexdigest(), self.size)
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self._temp_path)
+        except FileNotFoundError:
+            pass
+
+
+def save_stream(
+    source: Any,
+    directory: str,
+    file_name: str,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> SavedFile:
+    """
+    Save ``source`` to ``directory/file_name`` in fixed-size chunks.
+
+    At most one chunk is held in memory. The sha256 is computed while
+    writing, and sources of known size are rejected before anything is
+    written.
+
+    Args:
+        source (Any): Bytes, a file path, a binary file-like object, an object
+                      with ``getbuffer`` or an iterable of byte strings.
+        directory (str): Destination directory, created if missing.
+        file_name (str): Destination file name; only its base name is used.
+        max_bytes (int): Maximum accepted size.
+        chunk_size (int): Bytes read and written at a time.
+
+    Returns:
+        SavedFile: The saved path with the content's sha256 and size.
+
+    Raises:
+        UploadTooLargeError: If the source is larger than ``max_bytes``.
+    """
+    known_size = _known_size(source)
+    if known_size is not None and known_size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    writer = _AtomicWriter(directory, file_name, max_bytes)
+    try:
+        for chunk in _iter_chunks(source, chunk_size):
+            writer.write(chunk)
+        saved = writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+    logger.info("Saved %s (%d bytes, sha256 %s)", saved.path, saved.size, saved.sha256)
+    return saved
+
+
+async def _aiter_chunks(source: Any, chunk_size: int) -> AsyncIterator[bytes]:
+    if hasattr(source, "read"):
+        while chunk := await source.read(chunk_size):
+            yield chunk
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+async def asave_stream(
+    source: Any,
+    directory: str,
+    file_name: str,
+    max_bytes: int = MAX_UPLOAD_BYTES,
+    chunk_size: int = UPLOAD_CHUNK_SIZE,
+) -> SavedFile:
+    """
+    Async version of ``save_stream``.
+
+    ``source`` is an object with an async ``read`` (e.g. a FastAPI
+    ``UploadFile``) or an async iterator of byte strings. Disk writes run
+    in a worker thread so the event loop is not blocked.
+    """
+    known_size = _known_size(source)
+    if known_size is not None and known_size > max_bytes:
+        raise UploadTooLargeError(max_bytes)
+
+    writer = await asyncio.to_thread(_AtomicWriter, directory, file_name, max_bytes)
+    try:
+        async for chunk in _aiter_chunks(source, chunk_size):
+            await asyncio.to_thread(writer.write, chunk)
+        saved = await asyncio.to_thread(writer.commit)
+    except BaseException:
+        writer.abort()
+        raise
+    logger.info("Saved %s (%d bytes, sha256 %s)", saved.path, saved.size, saved.sha256)
+    return saved
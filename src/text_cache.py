@@ -0,0 +1,167 @@
+import mmap
+import os
+import struct
+import uuid
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import fitz
+from AIFoundationKit.base.file_manager import BaseFileManager
+from AIFoundationKit.base.logger.custom_logger import get_logger
+
+from src.blob_store import BlobStore
+from src.constants import FITZ_TEXT_MODE, PAGE_TEXT_FILE
+
+logger = get_logger(__name__)
+
+# Layout: magic | (u32 length, UTF-8 page)* | u64 page offsets | u64 count | magic
+_MAGIC = b"DPPAGES1"
+_LENGTH = struct.Struct("<I")
+_OFFSET = struct.Struct("<Q")
+
+
+def write_pages(path: str, pages: Iterable[str]) -> int:
+    """
+    Write page texts to ``path`` in the page-text format, atomically.
+
+    Pages are written as they are produced, so only one is held at a time.
+
+    Args:
+        path (str): Destination file.
+        pages (Iterable[str]): The page texts, in order.
+
+    Returns:
+        int: Number of pages written.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    offsets = []
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(_MAGIC)
+            for page in pages:
+                data = page.encode("utf-8")
+                offsets.append(f.tell())
+                f.write(_LENGTH.pack(len(data)))
+                f.write(data)
+            for offset in offsets:
+                f.write(_OFFSET.pack(offset))
+            f.write(_OFFSET.pack(len(offsets)))
+            f.write(_MAGIC)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return len(offsets)
+
+
+class PageText(Sequence):
+    """
+    Read-only, memory-mapped view of a page-text file.
+
+    Pages are decoded on access, so a long document costs no memory until
+    its pages are read, and the mapping is shared between processes.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        size = len(self._mmap)
+        trailer = _OFFSET.size + len(_MAGIC)
+        if (
+            size < len(_MAGIC) + trailer
+            or self._mmap[: len(_MAGIC)] != _MAGIC
+            or self._mmap[-len(_MAGIC) :] != _MAGIC
+        ):
+            self._mmap.close()
+            raise ValueError(f"Not a page-text file: {path}")
+        (self._count,) = _OFFSET.unpack_from(self._mmap, size - trailer)
+        self._index = size - trailer - self._count * _OFFSET.size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("page index out of range")
+        (offset,) = _OFFSET.unpack_from(self._mmap, self._index + index * _OFFSET.size)
+        (length,) = _LENGTH.unpack_from(self._mmap, offset)
+        start = offset + _LENGTH.size
+        return self._mmap[start : start + length].decode("utf-8")
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def __enter__(self) -> "PageText":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def extract_pages(file_path: str) -> Iterator[str]:
+    """
+    Yield the text of each page of a PDF; other documents are one page,
+    read with ``BaseFileManager.read_file``.
+    """
+    if Path(file_path).suffix.lower() == ".pdf":
+        with fitz.open(file_path) as pdf:
+            for page in pdf:
+                yield page.get_text(FITZ_TEXT_MODE)
+    else:
+        yield BaseFileManager().read_file(file_path)
+
+
+def format_file_text(file_path: str, pages: Sequence) -> str:
+    """
+    Format cached pages exactly like ``BaseFileManager.read_file``.
+    """
+    if Path(file_path).suffix.lower() != ".pdf":
+        return pages[0] if len(pages) else ""
+    return "".join(
+        f"Page {page_num}:\n{text}\n" for page_num, text in enumerate(pages, start=1)
+    ).strip()
+
+
+class TextCache:
+    """
+    Per-document cache of extracted page text, stored as an artifact of the
+    document's blob, so every copy of the same content is parsed once.
+    """
+
+    def __init__(self, blob_store: BlobStore):
+        self.blob_store = blob_store
+
+    def ensure(self, sha256: str, file_path: str) -> bool:
+        """
+        Extract and cache the pages of a stored document unless cached.
+
+        Extraction errors are logged and not raised: the document is then
+        parsed, and the error reported, when it is read.
+
+        Returns:
+            bool: Whether the pages are cached.
+        """
+        path = self.blob_store.artifact_path(sha256, PAGE_TEXT_FILE)
+        if os.path.exists(path):
+            return True
+        try:
+            count = write_pages(path, extract_pages(file_path))
+        except Exception as e:
+            logger.warning("Could not extract text of %s: %s", file_path, e)
+            return False
+        logger.info("Cached %d pages of %s", count, file_path)
+        return True
+
+    def get(self, file_path: str) -> Optional[PageText]:
+        """
+        Cached pages of a document saved through the blob store, or None.
+        """
+        sha256 = self.blob_store.find(file_path)
+        if sha256 is None or not self.ensure(sha256, file_path):
+            return None
+        return PageText(self.blob_store.artifact_path(sha256, PAGE_TEXT_FILE))
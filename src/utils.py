@@ -1,15 +1,301 @@
+import hashlib
 import os
+import shutil
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Type, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
+import faiss
 from AIFoundationKit.base.utils import generate_session_id
+from langchain_community.docstore.in_memory import InMemoryDocstore
 from langchain_community.document_loaders import PyPDFLoader
+from langchain_community.vectorstores import FAISS
 from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents import Document
 from langchain_core.retrievers import BaseRetriever
 from langchain_core.vectorstores import VectorStore
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from langchain_community.vectorstores import FAISS
+
+from src.blob_store import BlobStore
+from src.constants import (
+    DOCSTORE_FILE,
+    FAISS_CURRENT_LINK,
+    FAISS_GENERATION_PREFIX,
+    FAISS_INDEX_FILE,
+    FAISS_INDEX_NAME,
+    KEY_CONTENT_HASH,
+    LEGACY_DOCSTORE_FILE,
+    UPLOAD_CHUNK_SIZE,
+)
+from src.embedding_cache import with_embedding_cache
+from src.embedding_executor import with_embedding_executor
+from src.faiss_index import (
+    apply_search_params,
+    build_vectorstore,
+    retrain_if_outgrown,
+)
+from src.faiss_store import (
+    SQLiteDocstore,
+    docstore_documents,
+    open_vectorstore,
+    read_index,
+    resolve_index_dir,
+    write_docstore,
+)
+from src.hybrid_search import BM25Index, HybridRetriever, bm25_index_path
+from src.multi_doc_chat.contextual_compression import CompressionRetriever
+from src.multi_doc_chat.mmr import MMRRetriever
+
+
+def compute_content_hash(text: str) -> str:
+    """
+    Compute the sha256 hex digest of a piece of text.
+
+    Args:
+        text (str): The text to hash.
+
+    Returns:
+        str: The hex digest, used as a stable content key.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compute_file_hash(file_path: Union[str, Path]) -> str:
+    """
+    Compute the sha256 hex digest of a file, reading it in chunks.
+
+    Args:
+        file_path (Union[str, Path]): The file to hash.
+
+    Returns:
+        str: The hex digest of the file's bytes.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _split_documents(
+    documents: List[Document], chunk_size: int, chunk_overlap: int
+) -> List[Document]:
+    """
+    Split documents into chunks tagged with their content hash.
+
+    Args:
+        documents (List[Document]): Documents (or lists of documents) to split.
+        chunk_size (int): Chunk size for splitting.
+        chunk_overlap (int): Chunk overlap for splitting.
+
+    Returns:
+        List[Document]: The chunks, each with ``content_hash`` in its metadata.
+    """
+    # Flatten list of lists if necessary
+    if documents and isinstance(documents[0], list):
+        documents = [item for sublist in documents for item in sublist]
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+    )
+    chunks = splitter.split_documents(documents)
+
+    for chunk in chunks:
+        chunk.metadata[KEY_CONTENT_HASH] = compute_content_hash(chunk.page_content)
+
+    return chunks
+
+
+def _dedupe_chunks(
+    chunks: List[Document], existing_ids: Set[str]
+) -> Tuple[List[Document], List[str]]:
+    """
+    Drop chunks whose content hash is already indexed or repeated in the batch.
+
+    Args:
+        chunks (List[Document]): Chunks produced by ``_split_documents``.
+        existing_ids (Set[str]): Content hashes already present in the index.
+
+    Returns:
+        Tuple[List[Document], List[str]]: The new chunks and their ids.
+    """
+    seen = set(existing_ids)
+    new_chunks, new_ids = [], []
+    for chunk in chunks:
+        chunk_id = chunk.metadata[KEY_CONTENT_HASH]
+        if chunk_id in seen:
+            continue
+        seen.add(chunk_id)
+        new_chunks.append(chunk)
+        new_ids.append(chunk_id)
+    return new_chunks, new_ids
+
+
+def _rekey_legacy_vectorstore(
+    vectorstore: FAISS,
+    embedding_model: Any,
+    index_config: Optional[Dict[str, Any]] = None,
+) -> Optional[FAISS]:
+    """
+    Rebuild an index whose chunks are not keyed by their content hash.
+
+    Indexes written before content-hash ids use random uuids, which never
+    match the id of a new chunk, so the first incremental ingest would add a
+    second copy of every chunk. Their chunks are re-keyed by content hash and
+    deduplicated. Vectors are read back from flat indexes and embedded again
+    for other index types, which cannot reconstruct them exactly.
+
+    Args:
+        vectorstore (FAISS): A writable vectorstore.
+        embedding_model (Any): The embedding model.
+        index_config (Optional[Dict[str, Any]]): The ``faiss_db`` section.
+
+    Returns:
+        Optional[FAISS]: The rebuilt vectorstore, or None if the index is
+                         already keyed by content hash.
+    """
+    documents = docstore_documents(vectorstore.docstore)
+    if all(
+        document.metadata.get(KEY_CONTENT_HASH) == doc_id
+        for doc_id, document in documents.items()
+    ):
+        return None
+
+    positions, chunks = [], {}
+    for position in range(vectorstore.index.ntotal):
+        document = documents[vectorstore.index_to_docstore_id[position]]
+        content_hash = compute_content_hash(document.page_content)
+        if content_hash in chunks:
+            continue
+        positions.append(position)
+        chunks[content_hash] = Document(
+            page_content=document.page_content,
+            metadata={**document.metadata, KEY_CONTENT_HASH: content_hash},
+        )
+
+    vectors = None
+    if isinstance(vectorstore.index, faiss.IndexFlat):
+        vectors = vectorstore.index.reconstruct_n(0, vectorstore.index.ntotal)
+        vectors = vectors[positions]
+    return build_vectorstore(
+        list(chunks.values()), embedding_model, list(chunks), index_config, vectors
+    )
+
+
+def load_vectorstore(
+    faiss_index_path: str,
+    embedding_model: Any,
+    index_config: Optional[Dict[str, Any]] = None,
+    writable: bool = False,
+) -> Optional[FAISS]:
+    """
+    Load a FAISS index previously persisted by ``_create_retriever``.
+
+    By default the index is memory-mapped, its documents are read lazily and
+    the vectorstore is shared with other callers through a process-wide cache,
+    so it must not be modified. Pass ``writable=True`` to get a private,
+    fully loaded copy that documents can be added to.
+
+    Args:
+        faiss_index_path (str): Directory containing the FAISS index.
+        embedding_model (Any): The embedding model used to build the index.
+        index_config (Optional[Dict[str, Any]]): The ``faiss_db`` config
+                                                 section; its ``nprobe`` and
+                                                 ``ef_search`` are applied.
+        writable (bool): If True, load a private copy that can be modified.
+
+    Returns:
+        Optional[FAISS]: The loaded vectorstore, or None if no index exists.
+    """
+    index_dir = resolve_index_dir(faiss_index_path)
+    if not os.path.exists(os.path.join(index_dir, FAISS_INDEX_FILE)):
+        return None
+
+    docstore_path = os.path.join(index_dir, DOCSTORE_FILE)
+    if not os.path.exists(docstore_path):
+        # Indexes saved before the SQLite docstore. They are written by this
+        # application only, so unpickling the docstore is safe here.
+        vectorstore = FAISS.load_local(
+            str(index_dir),
+            embedding_model,
+            index_name=FAISS_INDEX_NAME,
+            allow_dangerous_deserialization=True,
+        )
+    elif writable:
+        documents, index_to_docstore_id = SQLiteDocstore(docstore_path).load_all()
+        vectorstore = FAISS(
+            embedding_function=embedding_model,
+            index=read_index(os.path.join(index_dir, FAISS_INDEX_FILE), mmap=False),
+            docstore=InMemoryDocstore(documents),
+            index_to_docstore_id=index_to_docstore_id,
+        )
+    else:
+        vectorstore = open_vectorstore(faiss_index_path, embedding_model)
+
+    if index_config is not None:
+        apply_search_params(vectorstore.index, index_config)
+    return vectorstore
+
+
+def save_vectorstore_atomic(vectorstore: FAISS, faiss_index_path: str) -> None:
+    """
+    Persist a FAISS vectorstore without exposing partially written files.
+
+    The index and a SQLite docstore are written to a new generation directory
+    inside ``faiss_index_path``, and the ``FAISS_CURRENT_LINK`` symlink is then
+    swapped to it with a single ``os.replace``. The index and docstore thus
+    change together, and a reader that resolved the link with
+    ``resolve_index_dir`` keeps a consistent pair. The previous generation is
+    kept for readers still opening it; older ones, and index files saved
+    directly in the directory by older versions, are removed.
+
+    Args:
+        vectorstore (FAISS): The vectorstore to persist.
+        faiss_index_path (str): Directory to persist the index to.
+    """
+    target_dir = ensure_directory_exists(faiss_index_path)
+    previous_dir = os.path.realpath(resolve_index_dir(str(target_dir)))
+    generation_dir = tempfile.mkdtemp(prefix=FAISS_GENERATION_PREFIX, dir=target_dir)
+    tmp_link = os.path.join(target_dir, f"{FAISS_CURRENT_LINK}.{generate_session_id()}")
+    try:
+        write_docstore(
+            os.path.join(generation_dir, DOCSTORE_FILE),
+            vectorstore.index_to_docstore_id,
+            vectorstore.docstore,
+        )
+        faiss.write_index(
+            vectorstore.index, os.path.join(generation_dir, FAISS_INDEX_FILE)
+        )
+        os.symlink(os.path.basename(generation_dir), tmp_link)
+        os.replace(tmp_link, os.path.join(target_dir, FAISS_CURRENT_LINK))
+    except BaseException:
+        shutil.rmtree(generation_dir, ignore_errors=True)
+        if os.path.lexists(tmp_link):
+            os.remove(tmp_link)
+        raise
+
+    for file_name in (FAISS_INDEX_FILE, DOCSTORE_FILE, LEGACY_DOCSTORE_FILE):
+        legacy_file = os.path.join(target_dir, file_name)
+        if os.path.exists(legacy_file):
+            os.remove(legacy_file)
+    keep = {os.path.realpath(generation_dir), previous_dir}
+    for name in os.listdir(target_dir):
+        path = os.path.realpath(os.path.join(target_dir, name))
+        if name.startswith(FAISS_GENERATION_PREFIX) and path not in keep:
+            shutil.rmtree(path, ignore_errors=True)
 
 
 def _create_retriever(
@@ -18,38 +304,116 @@ def _create_retriever(
     faiss_index_path: str,
     chunk_size: int = 1000,
     chunk_overlap: int = 300,
+    incremental: bool = False,
+    embedding_cache_path: Optional[str] = None,
+    search_type: str = "similarity",
+    index_config: Optional[Dict[str, Any]] = None,
+    executor_config: Optional[Dict[str, Any]] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
 ) -> BaseRetriever:
     """
     Create a retriever from documents.
 
+    Chunks are keyed by the sha256 of their content. In incremental mode the
+    existing index at ``faiss_index_path`` is loaded and only chunks that are
+    not already indexed are embedded and appended, so the cost of an ingest
+    scales with the new content rather than the whole corpus; an index from
+    before content-hash ids is re-keyed first, once. A BM25 keyword
+    index over the same chunk ids is maintained alongside and persisted next to
+    the FAISS index for hybrid search.
+
+    New chunks are embedded through an ``EmbeddingExecutor`` in concurrent,
+    rate-limited batches. With an embedding cache, every finished batch is
+    stored right away, so rerunning a failed ingest only embeds the rest.
+
     Args:
         documents (List[Document]): List of documents to process.
         embedding_model (Any): The embedding model to use.
         faiss_index_path (str): Path to save the FAISS index.
         chunk_size (int): Chunk size for splitting.
         chunk_overlap (int): Chunk overlap for splitting.
+        incremental (bool): If True, append to the existing index instead of
+                            rebuilding it. Defaults to False.
+        embedding_cache_path (Optional[str]): Path of a persistent embedding
+                                              cache to wrap the model with.
+        search_type (str): Search type of the returned retriever, as accepted
+                           by ``load_retriever_from_vectorstore``.
+        index_config (Optional[Dict[str, Any]]): The ``faiss_db`` config
+                                                 section selecting the index
+                                                 type. Defaults to a flat index.
+        executor_config (Optional[Dict[str, Any]]): The ``embedding_executor``
+                                                    config section.
+        on_progress (Callable[[int, int], None], optional): Called with the
+                                                            number of embedded
+                                                            and total new
+                                                            chunks after each
+                                                            embedding batch.
 
     Returns:
         BaseRetriever: The configured retriever.
-    """
-    # Flatten list of lists if necessary
-    if documents and isinstance(documents[0], list):
-        documents = [item for sublist in documents for item in sublist]
 
-    splitter = RecursiveCharacterTextSplitter(
-        chunk_size=chunk_size,
-        chunk_overlap=chunk_overlap,
+    Raises:
+        ValueError: If a new index would be empty; nothing is written then.
+    """
+    chunks = _split_documents(documents, chunk_size, chunk_overlap)
+    embedding_model = with_embedding_cache(
+        with_embedding_executor(embedding_model, executor_config, on_progress),
+        embedding_cache_path,
     )
-    chunks = splitter.split_documents(documents)
 
-    vectorstore = FAISS.from_documents(
-        documents=chunks, embedding=embedding_model
-    )
+    vectorstore = None
+    rekeyed = None
+    if incremental:
+        vectorstore = load_vectorstore(
+            faiss_index_path, embedding_model, index_config, writable=True
+        )
+        if vectorstore is not None:
+            rekeyed = _rekey_legacy_vectorstore(
+                vectorstore, embedding_model, index_config
+            )
+            vectorstore = rekeyed or vectorstore
+
+    if vectorstore is None:
+        new_chunks, new_ids = _dedupe_chunks(chunks, set())
+        if not new_chunks:
+            # Nothing is written: an empty keyword index next to a missing
+            # FAISS index would leave the shard half built.
+            raise ValueError(f"No text to index for {faiss_index_path}")
+        vectorstore = build_vectorstore(
+            new_chunks, embedding_model, new_ids, index_config
+        )
+        bm25_index = BM25Index()
+        bm25_index.add(new_ids, [chunk.page_content for chunk in new_chunks])
+        bm25_stale = True
+    else:
+        existing_ids = set(vectorstore.index_to_docstore_id.values())
+        new_chunks, new_ids = _dedupe_chunks(chunks, existing_ids)
+        if new_chunks:
+            vectorstore.add_documents(new_chunks, ids=new_ids)
+            retrain_if_outgrown(vectorstore, index_config)
+        bm25_index = None
+        if rekeyed is None:
+            bm25_index = BM25Index.load(bm25_index_path(faiss_index_path))
+        bm25_stale = bool(new_chunks)
+        if bm25_index is None:
+            # Indexes built before BM25 support, or just re-keyed: index the
+            # whole docstore once.
+            bm25_index = BM25Index.from_documents(
+                docstore_documents(vectorstore.docstore)
+            )
+            bm25_stale = True
+        elif new_chunks:
+            bm25_index.add(new_ids, [chunk.page_content for chunk in new_chunks])
 
-    vectorstore.save_local(faiss_index_path)
+    if bm25_stale:
+        # Written before the FAISS files so a reader never sees chunk ids the
+        # keyword index does not know about.
+        bm25_index.save(bm25_index_path(faiss_index_path))
+    if new_chunks or rekeyed is not None:
+        save_vectorstore_atomic(vectorstore, faiss_index_path)
 
     retriever = load_retriever_from_vectorstore(
-        vectorstore, search_type="similarity", k=4
+        vectorstore, search_type=search_type, k=4, bm25_index=bm25_index
     )
     return retriever
 
@@ -60,6 +424,9 @@ def load_retriever_from_vectorstore(
     k: int = 4,
     score_threshold: Optional[float] = None,
     filter: Optional[Dict[str, Any]] = None,
+    fetch_k: int = 20,
+    lambda_mult: float = 0.5,
+    bm25_index: Optional[BM25Index] = None,
 ) -> BaseRetriever:
     """
     Load a retriever from a vectorstore with configurable search parameters.
@@ -68,15 +435,48 @@ def load_retriever_from_vectorstore(
         vectorstore (VectorStore): The vectorstore to create a retriever from.
         search_type (str): The type of search to perform. Defaults to "similarity".
                            Options: "similarity", "mmr",
-                           "similarity_score_threshold".
+                           "similarity_score_threshold", and for FAISS stores
+                           "compression", which trims the retrieved chunks to
+                           their most relevant sentences, and "hybrid", which
+                           fuses BM25 and dense results.
         k (int): The number of documents to return. Defaults to 4.
         score_threshold (Optional[float]): Minimum relevance threshold for
                                            similarity_score_threshold.
         filter (Optional[Dict[str, Any]]): Filter by document metadata.
+        fetch_k (int): Number of candidates reranked by "mmr". Defaults to 20.
+        lambda_mult (float): Relevance/diversity trade-off of "mmr", 1 for
+                             pure relevance. Defaults to 0.5.
+        bm25_index (Optional[BM25Index]): Keyword index for "hybrid". Built
+                                          from the docstore when omitted.
 
     Returns:
         BaseRetriever: The configured retriever.
     """
+    if search_type == "mmr" and isinstance(vectorstore, FAISS):
+        # Reranks the stored FAISS vectors with the vectorized implementation.
+        return MMRRetriever(
+            vectorstore=vectorstore,
+            k=k,
+            fetch_k=fetch_k,
+            lambda_mult=lambda_mult,
+            filter=filter,
+        )
+
+    if search_type == "hybrid":
+        if bm25_index is None:
+            bm25_index = BM25Index.from_documents(
+                docstore_documents(vectorstore.docstore)
+            )
+        return HybridRetriever(
+            vectorstore=vectorstore,
+            bm25_index=bm25_index,
+            k=k,
+            fetch_k=max(fetch_k, k),
+        )
+
+    if search_type == "compression" and isinstance(vectorstore, FAISS):
+        return CompressionRetriever(vectorstore=vectorstore, k=k, filter=filter)
+
     search_kwargs = {"k": k}
 
     if score_threshold is not None:
@@ -87,6 +487,9 @@ def load_retriever_from_vectorstore(
     if filter is not None:
         search_kwargs["filter"] = filter
 
+    if search_type == "mmr":
+        search_kwargs.update(fetch_k=fetch_k, lambda_mult=lambda_mult)
+
     retriever = vectorstore.as_retriever(
         search_type=search_type, search_kwargs=search_kwargs
     )
@@ -113,11 +516,204 @@ def ensure_directory_exists(
     return dir_path
 
 
+def _load_file(loader_cls: Type[BaseLoader], file_path: str) -> List[Document]:
+    """
+    Load a single file. Defined at module level so it can run in a worker process.
+
+    Args:
+        loader_cls (Type[BaseLoader]): Loader class to use.
+        file_path (str): Path of the file to load.
+
+    Returns:
+        List[Document]: The loaded documents.
+    """
+    return loader_cls(file_path).load()
+
+
+def _documents_artifact(loader_cls: Type[BaseLoader]) -> str:
+    return f"documents.{loader_cls.__name__}"
+
+
+def _get_cached_documents(
+    blob_store: BlobStore,
+    sha256: str,
+    loader_cls: Type[BaseLoader],
+    file_path: str,
+) -> Optional[List[Document]]:
+    """
+    Documents parsed earlier from the same content, re-pointed at ``file_path``.
+    """
+    records = blob_store.get_artifact(sha256, _documents_artifact(loader_cls))
+    if records is None:
+        return None
+    documents = [Document(**record) for record in records]
+    for document in documents:
+        if "source" in document.metadata:
+            document.metadata["source"] = file_path
+    return documents
+
+
+def _cache_documents(
+    blob_store: BlobStore,
+    sha256: str,
+    loader_cls: Type[BaseLoader],
+    documents: List[Document],
+) -> None:
+    blob_store.put_artifact(
+        sha256,
+        _documents_artifact(loader_cls),
+        [
+            {"page_content": document.page_content, "metadata": document.metadata}
+            for document in documents
+        ],
+    )
+
+
+def _iter_loaded_files(
+    file_paths: List[str],
+    data_dir: str,
+    loader_cls: Type[BaseLoader],
+    file_extension: str,
+    max_workers: Optional[int],
+    loaders: Optional[Dict[str, Type[BaseLoader]]] = None,
+    executor: Optional[Executor] = None,
+    blob_store: Optional[BlobStore] = None,
+) -> Iterator[Tuple[int, List[Document]]]:
+    """
+    Copy files into ``data_dir`` and load them, yielding results as they finish.
+
+    Args:
+        file_paths (List[str]): List of paths to input files.
+        data_dir (str): Directory to save the processed files.
+        loader_cls (Type[BaseLoader]): Loader class to use for loading documents.
+        file_extension (str): Extension to append to the unique filename.
+        max_workers (Optional[int]): Number of worker processes.
+        loaders (Optional[Dict[str, Type[BaseLoader]]]): Loader class per
+                                                         lower-case file
+                                                         extension. When set,
+                                                         each file keeps its own
+                                                         extension and is loaded
+                                                         with the matching class.
+        executor (Optional[Executor]): Shared pool to parse the files on
+                                       instead of a new one per call.
+        blob_store (Optional[BlobStore]): Store that deduplicates the files by
+                                          content. Files are then hard-linked
+                                          into ``data_dir`` under their
+                                          sha256, and content parsed before
+                                          is not parsed again.
+
+    Yields:
+        Tuple[int, List[Document]]: Index of the input file and its documents.
+    """
+    saved_files = []
+    for file_path in file_paths:
+        file_loader_cls, extension = loader_cls, file_extension
+        if loaders is not None:
+            extension = Path(file_path).suffix.lower()
+            if extension not in loaders:
+                raise ValueError(f"Unsupported file type: {file_path}")
+            file_loader_cls = loaders[extension]
+        if blob_store is None:
+            sha256 = None
+            new_file_path = os.path.join(data_dir, generate_session_id() + extension)
+            # copyfile streams in chunks and uses os.sendfile where available.
+            shutil.copyfile(file_path, new_file_path)
+        else:
+            sha256 = blob_store.put(file_path).sha256
+            new_file_path = blob_store.link(
+                sha256, os.path.join(data_dir, sha256 + extension)
+            )
+        saved_files.append((file_loader_cls, new_file_path, sha256))
+
+    pending = []
+    for index, (file_loader_cls, saved_path, sha256) in enumerate(saved_files):
+        documents = None
+        if sha256 is not None:
+            documents = _get_cached_documents(
+                blob_store, sha256, file_loader_cls, saved_path
+            )
+        if documents is None:
+            pending.append(index)
+        else:
+            yield index, documents
+
+    def parsed(index: int, documents: List[Document]) -> Tuple[int, List[Document]]:
+        file_loader_cls, _, sha256 = saved_files[index]
+        if sha256 is not None:
+            _cache_documents(blob_store, sha256, file_loader_cls, documents)
+        return index, documents
+
+    if not pending:
+        return
+
+    workers = min(max_workers or os.cpu_count() or 1, len(pending))
+    if executor is None and workers <= 1:
+        for index in pending:
+            file_loader_cls, saved_path, _ = saved_files[index]
+            yield parsed(index, _load_file(file_loader_cls, saved_path))
+        return
+
+    owns_executor = executor is None
+    if owns_executor:
+        executor = ProcessPoolExecutor(max_workers=workers)
+    futures = {}
+    try:
+        futures = {
+            executor.submit(_load_file, *saved_files[index][:2]): index
+            for index in pending
+        }
+        for future in as_completed(futures):
+            yield parsed(futures[future], future.result())
+    finally:
+        if owns_executor:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            for future in futures:
+                future.cancel()
+
+
+def iter_process_and_load_files(
+    file_paths: List[str],
+    data_dir: str,
+    loader_cls: Type[BaseLoader] = PyPDFLoader,
+    file_extension: str = ".pdf",
+    max_workers: Optional[int] = None,
+) -> Iterator[List[Document]]:
+    """
+    Process files like ``process_and_load_files`` but stream the results.
+
+    Files are parsed in parallel across a process pool and each file's
+    documents are yielded as soon as that file finishes, in completion order.
+
+    Args:
+        file_paths (List[str]): List of paths to input files.
+        data_dir (str): Directory to save the processed files.
+        loader_cls (Type[BaseLoader]): Loader class to use for loading documents.
+                                       Defaults to PyPDFLoader.
+        file_extension (str): Extension to append to the unique filename.
+                              Defaults to ".pdf".
+        max_workers (Optional[int]): Number of worker processes. Defaults to the
+                                     CPU count; 1 loads in the calling process.
+
+    Yields:
+        List[Document]: The documents of one file.
+    """
+    for _, documents in _iter_loaded_files(
+        file_paths, data_dir, loader_cls, file_extension, max_workers
+    ):
+        yield documents
+
+
 def process_and_load_files(
     file_paths: List[str],
     data_dir: str,
     loader_cls: Type[BaseLoader] = PyPDFLoader,
     file_extension: str = ".pdf",
+    max_workers: Optional[int] = None,
+    loaders: Optional[Dict[str, Type[BaseLoader]]] = None,
+    executor: Optional[Executor] = None,
+    blob_store: Optional[BlobStore] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
 ) -> List[List[Document]]:
     """
     Process files by saving them with a unique name and loading them.
@@ -129,19 +725,42 @@ def process_and_load_files(
                                        Defaults to PyPDFLoader.
         file_extension (str): Extension to append to the unique filename.
                               Defaults to ".pdf".
+        max_workers (Optional[int]): Number of worker processes used to parse
+                                     files. Defaults to the CPU count.
+        loaders (Optional[Dict[str, Type[BaseLoader]]]): Loader class per file
+                                                         extension, for inputs
+                                                         of mixed types.
+                                                         Overrides ``loader_cls``.
+        executor (Optional[Executor]): Shared pool to parse the files on,
+                                       e.g. the API server's process pool.
+                                       ``max_workers`` is then ignored.
+        blob_store (Optional[BlobStore]): Store deduplicating the files by
+                                          content and caching their parsed
+                                          documents. Defaults to plain copies.
+        on_progress (Callable[[int, int], None], optional): Called with the
+                                                            number of loaded
+                                                            and total files
+                                                            after each file.
 
     Returns:
-        List[List[Document]]: A list of lists of loaded documents.
+        List[List[Document]]: A list of lists of loaded documents, in the same
+                              order as ``file_paths``.
     """
-    files = []
-    for file_path in file_paths:
-        unique_file_name = generate_session_id() + file_extension
-        new_file_path = os.path.join(data_dir, unique_file_name)
-        with open(new_file_path, "wb") as f:
-            f.write(open(file_path, "rb").read())
-
-        loader = loader_cls(new_file_path)
-        documents = loader.load()
-        files.append(documents)
+    files: List[List[Document]] = [[] for _ in file_paths]
+    loaded = 0
+    for index, documents in _iter_loaded_files(
+        file_paths,
+        data_dir,
+        loader_cls,
+        file_extension,
+        max_workers,
+        loaders,
+        executor,
+        blob_store,
+    ):
+        files[index] = documents
+        loaded += 1
+        if on_progress is not None:
+            on_progress(loaded, len(file_paths))
 
     return files
@@ -2,6 +2,7 @@ import json
 import logging
 
 from AIFoundationKit.base.logger.custom_logger import JsonFormatter, get_logger
+from langchain_core.embeddings import DeterministicFakeEmbedding
 
 
 class BaseTestCase:
@@ -45,3 +46,14 @@ class BaseTestCase:
     def parse_log_record(self, log_json):
 
         return json.loads(log_json)
+
+
+class CountingEmbeddings(DeterministicFakeEmbedding):
+
+    embedded_texts: list = []
+
+    def embed_documents(self, texts):
+
+        self.embedded_texts.extend(texts)
+
+        return super().embed_documents(texts)
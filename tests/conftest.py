@@ -6,6 +6,7 @@ import fitz
 import pytest
 
 from src.constants import ENV_DATA_STORAGE_PATH
+from src.model_registry import reset_model_registries
 
 # Add project root to sys.path before importing from src
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
@@ -28,6 +29,16 @@ class DummyFile:
             return f.read()
 
 
+@pytest.fixture(autouse=True)
+def isolated_model_registries():
+
+    reset_model_registries()
+
+    yield
+
+    reset_model_registries()
+
+
 @pytest.fixture
 def dummy_file_class():
 
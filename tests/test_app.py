@@ -0,0 +1,400 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pandas as pd
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from starlette.requests import ClientDisconnect
+
+import app as app_module
+from src.document_comparison.document_handler import DocumentComparisonHandler
+from src.session_history import SessionHistoryStore
+from src.utils import save_vectorstore_atomic
+from tests.base import BaseTestCase
+
+
+class TestAdmissionGate(BaseTestCase):
+
+    def test_rejects_requests_beyond_the_queue(self):
+
+        async def scenario():
+
+            gate = app_module.AdmissionGate("test", max_running=1, max_waiting=1)
+
+            await gate.acquire()
+
+            waiting = asyncio.ensure_future(gate.acquire())
+
+            await asyncio.sleep(0)
+
+            with pytest.raises(HTTPException) as excinfo:
+
+                await gate.acquire()
+
+            gate.release()
+
+            await waiting
+
+            gate.release()
+
+            return excinfo.value, gate.admitted
+
+        error, admitted = asyncio.run(scenario())
+
+        assert error.status_code == 429
+
+        assert "Retry-After" in error.headers
+
+        assert admitted == 0
+
+    def test_chat_releases_slot_when_client_disconnects(self, monkeypatch):
+
+        monkeypatch.setattr(
+            app_module, "_load_conversation", lambda request, session_id, k: rag
+        )
+
+        rag = MagicMock()
+
+        gate = app_module.AdmissionGate("LLM", max_running=1, max_waiting=0)
+
+        request = SimpleNamespace(
+            app=SimpleNamespace(state=SimpleNamespace(llm_gate=gate))
+        )
+
+        async def send(message):
+
+            # The client went away before the status line was written.
+            raise OSError("connection reset")
+
+        async def scenario():
+
+            response = await app_module.chat(
+                request, app_module.ChatRequest(session_id="session_1", question="hi")
+            )
+
+            scope = {"type": "http", "asgi": {"spec_version": "2.4"}}
+
+            with pytest.raises(ClientDisconnect):
+
+                await response(scope, AsyncMock(), send)
+
+        asyncio.run(scenario())
+
+        assert gate.admitted == 0
+
+        rag.astream_answer.assert_not_called()
+
+
+class TestApp(BaseTestCase):
+
+    @pytest.fixture
+    def client(self, temp_data_dir, tmp_path, monkeypatch):
+
+        monkeypatch.setattr(app_module, "API_JOB_WORKERS", 0)
+
+        monkeypatch.setattr(
+            app_module, "DEFAULT_JOB_QUEUE_PATH", str(tmp_path / "jobs.sqlite3")
+        )
+
+        monkeypatch.setattr(
+            app_module, "DEFAULT_JOB_UPLOAD_DIR", str(tmp_path / "uploads")
+        )
+
+        with TestClient(app_module.app) as client:
+
+            yield client
+
+    def test_index_and_health(self, client):
+
+        assert client.get("/health").json() == {"status": "ok"}
+
+        response = client.get("/")
+
+        assert response.status_code == 200
+
+        assert "Document Portal" in response.text
+
+    def test_analyze_parses_on_the_pool(
+        self, client, temp_data_dir, sample_pdf, monkeypatch
+    ):
+
+        analysis = MagicMock()
+
+        analysis.aanalyze_document = AsyncMock(return_value={"Title": "Sample"})
+
+        monkeypatch.setattr(app_module, "get_document_analysis", lambda: analysis)
+
+        with open(sample_pdf, "rb") as f:
+
+            response = client.post("/analyze", files={"file": ("sample.pdf", f)})
+
+        assert response.status_code == 200
+
+        assert response.json()["analysis"] == {"Title": "Sample"}
+
+        (text,) = analysis.aanalyze_document.await_args.args
+
+        assert "--- Page 1  ---" in text
+
+        assert "Hello, World!" in text
+
+        # Saved through DocumentHandler, so the text was cached with the blob.
+        assert list((temp_data_dir / ".blobs" / "artifacts").glob("*/pages.bin"))
+
+    def test_compare_returns_rows(self, client, sample_pdf, tmp_path, monkeypatch):
+
+        comparison = MagicMock()
+
+        comparison.acompare_documents = AsyncMock(
+            return_value=pd.DataFrame([{"Page": "1", "Changes": "NO CHANGE"}])
+        )
+
+        monkeypatch.setattr(app_module, "get_document_comparison", lambda: comparison)
+
+        monkeypatch.setattr(
+            app_module,
+            "DocumentComparisonHandler",
+            lambda: DocumentComparisonHandler(file_path=str(tmp_path / "compare")),
+        )
+
+        pdf = sample_pdf.read_bytes()
+
+        response = client.post(
+            "/compare",
+            files={"reference": ("doc.pdf", pdf), "actual": ("doc.pdf", pdf)},
+        )
+
+        assert response.status_code == 200
+
+        assert response.json()["changes"] == [{"Page": "1", "Changes": "NO CHANGE"}]
+
+        reference_text, actual_text = comparison.acompare_documents.await_args.args
+
+        assert reference_text == actual_text
+
+        assert "Hello, World!" in reference_text
+
+        # Both uploads are links to one stored blob.
+        assert len(list((tmp_path / "compare" / ".blobs" / "objects").iterdir())) == 1
+
+    def test_ingest_rejects_unsupported_files(self, client):
+
+        response = client.post("/ingest", files={"files": ("data.csv", b"a,b")})
+
+        assert response.status_code == 400
+
+    def test_rejects_invalid_session_id(self, client):
+
+        response = client.post(
+            "/chat", json={"session_id": "../etc", "question": "hello"}
+        )
+
+        assert response.status_code == 400
+
+    def test_chat_streams_sources_then_tokens(self, client, monkeypatch):
+
+        async def astream_answer(question):
+
+            yield {
+                "type": "sources",
+                "documents": [Document(page_content="ctx", metadata={"page": 1})],
+            }
+
+            for token in ("Hello", " there"):
+
+                yield {"type": "token", "content": token}
+
+        rag = MagicMock(astream_answer=astream_answer)
+
+        monkeypatch.setattr(
+            app_module, "_load_conversation", lambda request, session_id, k: rag
+        )
+
+        response = client.post(
+            "/chat", json={"session_id": "session_1", "question": "hello"}
+        )
+
+        events = [json.loads(line) for line in response.text.splitlines()]
+
+        assert events[0] == {
+            "type": "sources",
+            "documents": [{"page_content": "ctx", "metadata": {"page": 1}}],
+        }
+
+        assert "".join(event["content"] for event in events[1:]) == "Hello there"
+
+        assert client.app.state.llm_gate.admitted == 0
+
+    def test_chat_returns_429_when_overloaded(self, client):
+
+        client.app.state.llm_gate = app_module.AdmissionGate("LLM", 0, 0)
+
+        response = client.post(
+            "/chat", json={"session_id": "session_1", "question": "hello"}
+        )
+
+        assert response.status_code == 429
+
+    def test_ingest_job_is_idempotent_per_upload(self, client, sample_pdf):
+
+        pdf = sample_pdf.read_bytes()
+
+        def submit(lane="default"):
+
+            return client.post(
+                "/jobs/ingest",
+                files={"files": ("doc.pdf", pdf)},
+                data={"session_id": "session_1", "lane": lane},
+            )
+
+        first = submit()
+
+        assert first.status_code == 202
+
+        job_id = first.json()["job_id"]
+
+        assert submit().json()["job_id"] == job_id
+
+        assert submit(lane="urgent").status_code == 400
+
+        status = client.get(f"/jobs/{job_id}").json()
+
+        assert status["status"] == "queued"
+
+        assert status["kind"] == "ingest"
+
+        job = client.app.state.job_queue.get(job_id)
+
+        (file_path,) = job.payload["file_paths"]
+
+        with open(file_path, "rb") as f:
+
+            assert f.read() == pdf
+
+        assert client.get(f"/jobs/{job_id}/result").status_code == 409
+
+        assert client.get("/jobs/missing").status_code == 404
+
+    def test_renamed_resubmission_reuses_stored_upload(self, client, sample_pdf):
+
+        pdf = sample_pdf.read_bytes()
+
+        def submit(name):
+
+            return client.post(
+                "/jobs/ingest",
+                files={"files": (name, pdf)},
+                data={"session_id": "session_1"},
+            ).json()["job_id"]
+
+        job_id = submit("a.pdf")
+
+        queue = client.app.state.job_queue
+
+        job = queue.claim()
+
+        queue.fail(job_id, job.attempts, "boom")
+
+        # Same bytes under another name: the failed job is requeued with the
+        # copy stored by the first submission.
+        assert submit("b.pdf") == job_id
+
+        (file_path,) = queue.get(job_id).payload["file_paths"]
+
+        assert file_path.endswith("a.pdf")
+
+        with open(file_path, "rb") as f:
+
+            assert f.read() == pdf
+
+    def test_compare_job_result(self, client, sample_pdf):
+
+        pdf = sample_pdf.read_bytes()
+
+        response = client.post(
+            "/jobs/compare",
+            files={"reference": ("doc.pdf", pdf), "actual": ("doc.pdf", pdf)},
+            data={"lane": "interactive"},
+        )
+
+        job_id = response.json()["job_id"]
+
+        queue = client.app.state.job_queue
+
+        job = queue.claim()
+
+        assert job.id == job_id
+
+        assert job.payload["reference_path"] != job.payload["actual_path"]
+
+        queue.complete(job_id, job.attempts, [{"Page": "1", "Changes": "NO CHANGE"}])
+
+        assert client.get(f"/jobs/{job_id}/result").json() == {
+            "job_id": job_id,
+            "result": [{"Page": "1", "Changes": "NO CHANGE"}],
+        }
+
+
+class TestLoadConversation(BaseTestCase):
+
+    def test_loads_the_session_shard(self, tmp_path, monkeypatch):
+
+        embeddings = DeterministicFakeEmbedding(size=16)
+
+        vectorstore = FAISS.from_documents(
+            [Document(page_content="Paris is the capital of France")], embeddings
+        )
+
+        save_vectorstore_atomic(vectorstore, str(tmp_path / "faiss" / "session_1"))
+
+        monkeypatch.setattr(app_module, "DEFAULT_FAISS_DIR", str(tmp_path / "faiss"))
+
+        history_store = SessionHistoryStore(str(tmp_path / "history.sqlite3"))
+
+        request = SimpleNamespace(
+            app=SimpleNamespace(
+                state=SimpleNamespace(history_store=history_store, contextualizer=None)
+            )
+        )
+
+        with (
+            patch("src.model_registry.ModelLoader") as loader_cls,
+            patch("src.model_registry.load_dotenv"),
+        ):
+
+            loader_cls.return_value.config = {}
+
+            loader_cls.return_value.load_embeddings.return_value = embeddings
+
+            loader_cls.return_value.load_llm.return_value = GenericFakeChatModel(
+                messages=iter([AIMessage(content="Paris")])
+            )
+
+            rag = app_module._load_conversation(request, "session_1", k=1)
+
+            again = app_module._load_conversation(request, "session_1", k=1)
+
+            with pytest.raises(HTTPException) as excinfo:
+
+                app_module._load_conversation(request, "missing", k=1)
+
+        assert excinfo.value.status_code == 404
+
+        assert rag.history_store is history_store
+
+        # One contextualizer, and rewrite cache, serves every request.
+        assert again.contextualizer is rag.contextualizer
+
+        assert request.app.state.contextualizer is rag.contextualizer
+
+        (document,) = rag.retriever.invoke("capital of France")
+
+        assert document.page_content == "Paris is the capital of France"
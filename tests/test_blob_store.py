@@ -0,0 +1,126 @@
+import os
+
+from langchain_community.document_loaders import TextLoader
+
+from src.blob_store import BlobStore
+from src.utils import process_and_load_files
+from tests.base import BaseTestCase
+
+
+class CountingTextLoader(TextLoader):
+
+    loaded: list = []
+
+    def load(self):
+
+        self.loaded.append(self.file_path)
+
+        return super().load()
+
+
+class TestBlobStore(BaseTestCase):
+
+    def test_stores_each_content_once(self, tmp_path):
+
+        store = BlobStore(str(tmp_path / "blobs"))
+
+        first = store.put(b"same content")
+
+        second = store.put(b"same content")
+
+        assert first == second
+
+        assert os.listdir(store.objects_dir) == [first.sha256]
+
+        assert os.listdir(store.tmp_dir) == []
+
+    def test_links_count_as_references(self, tmp_path):
+
+        store = BlobStore(str(tmp_path / "blobs"))
+
+        blob = store.put(b"content")
+
+        store.put_artifact(blob.sha256, "text", ["content"])
+
+        first = store.link(blob.sha256, str(tmp_path / "s1" / "a.txt"))
+
+        store.link(blob.sha256, str(tmp_path / "s2" / "b.txt"))
+
+        store.link(blob.sha256, first)
+
+        assert store.refcount(blob.sha256) == 2
+
+        with open(first, "rb") as f:
+
+            assert f.read() == b"content"
+
+        os.remove(first)
+
+        assert store.gc() == 0
+
+        os.remove(tmp_path / "s2" / "b.txt")
+
+        assert store.gc() == 1
+
+        assert store.refcount(blob.sha256) == 0
+
+        assert store.get_artifact(blob.sha256, "text") is None
+
+    def test_artifacts_round_trip(self, tmp_path):
+
+        store = BlobStore(str(tmp_path / "blobs"))
+
+        blob = store.put(b"content")
+
+        assert store.get_artifact(blob.sha256, "pages") is None
+
+        store.put_artifact(blob.sha256, "pages", [{"page": 1}])
+
+        assert store.get_artifact(blob.sha256, "pages") == [{"page": 1}]
+
+    def test_repeat_uploads_are_linked_and_not_parsed_again(self, tmp_path):
+
+        CountingTextLoader.loaded = []
+
+        store = BlobStore(str(tmp_path / "blobs"))
+
+        sources = []
+
+        for name in ("first.txt", "second.txt"):
+
+            path = tmp_path / name
+
+            path.write_text("shared document")
+
+            sources.append(str(path))
+
+        session_dirs = [tmp_path / "s1", tmp_path / "s2"]
+
+        results = []
+
+        for source, session_dir in zip(sources, session_dirs):
+
+            session_dir.mkdir()
+
+            results.append(
+                process_and_load_files(
+                    [source],
+                    str(session_dir),
+                    loader_cls=CountingTextLoader,
+                    file_extension=".txt",
+                    max_workers=1,
+                    blob_store=store,
+                )
+            )
+
+        assert len(CountingTextLoader.loaded) == 1
+
+        (first,), (second,) = results
+
+        assert first[0].page_content == second[0].page_content
+
+        (saved,) = os.listdir(session_dirs[1])
+
+        assert second[0].metadata["source"] == str(session_dirs[1] / saved)
+
+        assert store.refcount(saved.removesuffix(".txt")) == 2
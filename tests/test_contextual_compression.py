@@ -0,0 +1,132 @@
+import numpy as np
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from src.constants import KEY_SIMILARITY
+from src.embedding_cache import with_embedding_cache
+from src.multi_doc_chat.contextual_compression import (
+    CompressionRetriever,
+    compress_documents,
+    split_sentences,
+)
+from src.utils import load_retriever_from_vectorstore
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class TestContextualCompression(BaseTestCase):
+
+    @pytest.fixture
+    def embeddings(self):
+
+        return CountingEmbeddings(size=16)
+
+    def test_split_sentences(self):
+
+        assert split_sentences("One. Two? Three!\n\nFour") == [
+            "One.",
+            "Two?",
+            "Three!",
+            "Four",
+        ]
+
+    def test_keeps_most_similar_sentences_in_order(self, embeddings):
+
+        query = "Revenue grew."
+
+        document = Document(
+            page_content="Intro text. Revenue grew. Staff left. Outro text.",
+            metadata={"page": 1},
+        )
+
+        query_vector = embeddings.embed_query(query)
+
+        compressed = compress_documents(
+            [document],
+            np.array([query_vector]),
+            query_vector,
+            embeddings,
+            top_sentences=1,
+        )
+
+        assert compressed[0].page_content == "Revenue grew."
+
+        assert compressed[0].metadata["page"] == 1
+
+        assert compressed[0].metadata[KEY_SIMILARITY] == pytest.approx(1.0)
+
+    def test_drops_dissimilar_chunks_and_applies_budget(self, embeddings):
+
+        query_vector = np.array([1.0, 0.0])
+
+        documents = [
+            Document(page_content="a" * 40),
+            Document(page_content="b" * 40),
+            Document(page_content="c" * 40),
+        ]
+
+        compressed = compress_documents(
+            documents,
+            np.array([[0.5, 0.5], [1.0, 0.0], [-1.0, 0.0]]),
+            query_vector,
+            embeddings,
+            top_sentences=None,
+            token_budget=15,
+        )
+
+        assert [document.page_content for document in compressed] == [
+            "b" * 40,
+            "a" * 20,
+        ]
+
+        assert embeddings.embedded_texts == []
+
+    def test_retriever_compresses_faiss_results(self, embeddings):
+
+        vectorstore = FAISS.from_texts(
+            ["Cats purr. Dogs bark.", "Birds sing. Fish swim."], embeddings
+        )
+
+        retriever = load_retriever_from_vectorstore(vectorstore, "compression", k=2)
+
+        assert isinstance(retriever, CompressionRetriever)
+
+        retriever.similarity_threshold = -1.0
+
+        retriever.top_sentences = 1
+
+        documents = retriever.invoke("Cats purr. Dogs bark.")
+
+        assert len(documents) == 2
+
+        assert all(len(split_sentences(doc.page_content)) == 1 for doc in documents)
+
+    def test_sentences_bypass_the_persistent_cache(self, embeddings, tmp_path):
+
+        cached = with_embedding_cache(embeddings, str(tmp_path / "cache.sqlite3"))
+
+        vectorstore = FAISS.from_texts(
+            ["Cats purr. Dogs bark.", "Birds sing. Fish swim."], cached
+        )
+
+        retriever = load_retriever_from_vectorstore(vectorstore, "compression", k=2)
+
+        retriever.similarity_threshold = -1.0
+
+        retriever.top_sentences = 1
+
+        embeddings.embedded_texts.clear()
+
+        retriever.invoke("Cats purr.")
+
+        retriever.invoke("Dogs bark.")
+
+        assert len(cached.cache) == 2
+
+        # Embedded once, then served from the in-memory sentence cache.
+        assert sorted(embeddings.embedded_texts) == [
+            "Birds sing.",
+            "Cats purr.",
+            "Dogs bark.",
+            "Fish swim.",
+        ]
@@ -0,0 +1,84 @@
+import asyncio
+from itertools import cycle
+from unittest.mock import patch
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+from langchain_core.embeddings import DeterministicFakeEmbedding
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+
+from src.constants import STREAM_EVENT_SOURCES, STREAM_EVENT_TOKEN
+from src.session_history import SessionHistoryStore
+from src.single_doc_chat.data_retrival import ConversationlRAG
+from tests.base import BaseTestCase
+
+
+class TestConversationalRAG(BaseTestCase):
+
+    @pytest.fixture
+    def rag(self, tmp_path):
+
+        llm = GenericFakeChatModel(messages=cycle([AIMessage(content="Paris is big")]))
+
+        with (
+            patch("src.model_registry.ModelLoader") as loader_cls,
+            patch("src.model_registry.load_dotenv"),
+        ):
+
+            loader_cls.return_value.config = {}
+
+            loader_cls.return_value.load_llm.return_value = llm
+
+            rag = ConversationlRAG(
+                session_id="session",
+                history_store=SessionHistoryStore(str(tmp_path / "history.sqlite3")),
+            )
+
+        vectorstore = FAISS.from_documents(
+            [
+                Document(page_content="Paris is the capital of France"),
+                Document(page_content="Berlin is the capital of Germany"),
+            ],
+            DeterministicFakeEmbedding(size=16),
+        )
+
+        rag.load_retriever_from_vectorstore(vectorstore, k=1)
+
+        return rag
+
+    def test_stream_yields_sources_before_tokens(self, rag):
+
+        async def collect():
+
+            return [event async for event in rag.astream_answer("What is Paris?")]
+
+        events = asyncio.run(collect())
+
+        assert events[0]["type"] == STREAM_EVENT_SOURCES
+
+        assert len(events[0]["documents"]) == 1
+
+        tokens = [event["content"] for event in events[1:]]
+
+        assert all(event["type"] == STREAM_EVENT_TOKEN for event in events[1:])
+
+        assert len(tokens) > 1
+
+        assert "".join(tokens) == "Paris is big"
+
+        history = rag._get_session_history().messages
+
+        assert [message.content for message in history] == [
+            "What is Paris?",
+            "Paris is big",
+        ]
+
+    def test_invoke_returns_answer_and_records_history(self, rag):
+
+        assert rag.invoke("What is Paris?", session_id="other") == "Paris is big"
+
+        assert len(rag._get_session_history("other").messages) == 2
+
+        assert rag._get_session_history().messages == []
@@ -0,0 +1,138 @@
+from unittest.mock import MagicMock, patch
+
+from src.constants import PDF_PAGE_TEMPLATE
+from src.document_analysier.data_analysis import (
+    DocumentAnalysis,
+    merge_metadata,
+    split_document_by_pages,
+)
+from tests.base import BaseTestCase
+
+
+def _make_document(page_count: int, page_length: int = 100) -> str:
+
+    return "\n".join(
+        PDF_PAGE_TEMPLATE.format(page_num=page_num, text="x" * page_length)
+        for page_num in range(1, page_count + 1)
+    )
+
+
+class TestSplitDocumentByPages(BaseTestCase):
+
+    def test_short_document_is_single_chunk(self):
+
+        document = _make_document(3)
+
+        assert split_document_by_pages(document, max_tokens=1000) == [document]
+
+    def test_chunks_keep_whole_pages_within_budget(self):
+
+        document = _make_document(10)
+
+        chunks = split_document_by_pages(document, max_tokens=80)
+
+        assert len(chunks) > 1
+
+        assert "".join(chunks) == document
+
+        assert all(len(chunk) <= 80 * 4 for chunk in chunks)
+
+        assert all(chunk.lstrip("\n").startswith("--- Page") for chunk in chunks)
+
+    def test_oversized_page_is_split(self):
+
+        document = _make_document(1, page_length=1000)
+
+        chunks = split_document_by_pages(document, max_tokens=50)
+
+        assert "".join(chunks) == document
+
+        assert all(len(chunk) <= 200 for chunk in chunks)
+
+
+class TestMergeMetadata(BaseTestCase):
+
+    def test_merges_partial_results(self):
+
+        partials = [
+            {
+                "Summary": ["Intro", "Method"],
+                "Title": "Report",
+                "Author": "N/A",
+                "PageCount": 2,
+                "SentimentTone": "Neutral",
+            },
+            {
+                "Summary": ["Method", "Results"],
+                "Title": "Not Available",
+                "Author": "Jane",
+                "PageCount": 3,
+                "SentimentTone": "Positive",
+            },
+            {
+                "Summary": "Conclusion",
+                "Title": "Report",
+                "PageCount": 1,
+                "SentimentTone": "Positive",
+            },
+        ]
+
+        merged = merge_metadata(partials)
+
+        assert merged["Summary"] == ["Intro", "Method", "Results", "Conclusion"]
+
+        assert merged["Title"] == "Report"
+
+        assert merged["Author"] == "Jane"
+
+        assert merged["SentimentTone"] == "Positive"
+
+        assert merged["PageCount"] == 6
+
+        assert merged["Publisher"] == ""
+
+    def test_known_page_count_wins(self):
+
+        merged = merge_metadata([{"PageCount": 1}, {"PageCount": 1}], page_count=9)
+
+        assert merged["PageCount"] == 9
+
+
+class TestDocumentAnalysisMapReduce(BaseTestCase):
+
+    @patch("src.model_registry.load_dotenv")
+    @patch("src.model_registry.ModelLoader")
+    @patch("src.document_analysier.data_analysis.OutputFixingParser")
+    @patch("src.document_analysier.data_analysis.PROMPT_REGISTRY")
+    def test_long_document_is_batched_and_merged(
+        self, mock_registry, mock_fixing_parser, mock_model_loader, mock_load_dotenv
+    ):
+
+        mock_chain = MagicMock()
+
+        mock_prompt = mock_registry.__getitem__.return_value
+
+        mock_prompt.__or__.return_value.__or__.return_value = mock_chain
+
+        mock_chain.batch.side_effect = lambda inputs, config: [
+            {"Summary": [f"part {index}"], "SentimentTone": "Neutral"}
+            for index, _ in enumerate(inputs)
+        ]
+
+        analyzer = DocumentAnalysis(
+            config_path="dummy_path", chunk_token_budget=80, max_concurrency=3
+        )
+
+        result = analyzer.analyze_document(_make_document(10))
+
+        inputs, kwargs = mock_chain.batch.call_args
+
+        assert len(inputs[0]) > 1
+
+        assert kwargs["config"] == {"max_concurrency": 3}
+
+        assert result["PageCount"] == 10
+
+        assert result["Summary"][0] == "part 0"
+
+        mock_chain.invoke.assert_not_called()
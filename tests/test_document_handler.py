@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 
+import fitz
 import pytest
 
 from src.constants import ERR_PDF_NOT_FOUND, ERR_PDF_READ
@@ -69,3 +70,70 @@ class TestDocumentHandler(BaseTestCase):
             handler.read_pdf("nonexistent_file.pdf")
 
         assert ERR_PDF_READ in str(exc.value)
+
+    def test_read_pdf_corrupt_cache(self, temp_data_dir, sample_pdf, dummy_file_class):
+
+        handler = DocumentHandler()
+
+        saved_path = handler.save_pdf(dummy_file_class(sample_pdf))
+
+        (pages_file,) = (temp_data_dir / ".blobs" / "artifacts").glob("*/pages.bin")
+
+        pages_file.write_bytes(b"garbage")
+
+        with pytest.raises(AppException) as exc:
+
+            handler.read_pdf(saved_path)
+
+        assert ERR_PDF_READ in str(exc.value)
+
+    @pytest.fixture
+    def multi_page_pdf(self, temp_data_dir):
+
+        pdf_path = temp_data_dir / "multi_page.pdf"
+
+        doc = fitz.open()
+
+        for page_num in range(1, 21):
+
+            page = doc.new_page()
+
+            page.insert_text((50, 50), f"Content of page {page_num}")
+
+        doc.save(pdf_path)
+
+        doc.close()
+
+        return pdf_path
+
+    def test_iter_pdf_pages_yields_each_page(self, multi_page_pdf):
+
+        handler = DocumentHandler()
+
+        pages = list(handler.iter_pdf_pages(str(multi_page_pdf)))
+
+        assert [page_num for page_num, _ in pages] == list(range(1, 21))
+
+        assert "Content of page 7" in pages[6][1]
+
+    def test_read_pdf_parallel_matches_sequential(self, multi_page_pdf):
+
+        handler = DocumentHandler()
+
+        sequential = handler.read_pdf(str(multi_page_pdf))
+
+        parallel = handler.read_pdf(str(multi_page_pdf), max_workers=2)
+
+        assert parallel == sequential
+
+        assert "--- Page 20  ---" in parallel
+
+    def test_read_pdf_parallel_failure(self, temp_data_dir):
+
+        handler = DocumentHandler()
+
+        with pytest.raises(AppException) as exc:
+
+            handler.read_pdf("nonexistent_file.pdf", max_workers=2)
+
+        assert ERR_PDF_READ in str(exc.value)
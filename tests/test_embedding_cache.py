@@ -0,0 +1,91 @@
+import pytest
+
+from src.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+    embedding_cache_key,
+    with_embedding_cache,
+)
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class TestEmbeddingCache(BaseTestCase):
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+
+        return str(tmp_path / "cache" / "embeddings.sqlite3")
+
+    def test_cache_key_depends_on_model_name(self):
+
+        assert embedding_cache_key("a", "text") != embedding_cache_key("b", "text")
+
+    def test_round_trip(self, cache_path):
+
+        cache = EmbeddingCache(cache_path)
+
+        cache.put_many({"k1": [0.5, 1.5]})
+
+        assert cache.get_many(["k1", "k2"]) == {"k1": [0.5, 1.5]}
+
+    def test_evicts_least_recently_used(self, cache_path):
+
+        cache = EmbeddingCache(cache_path, max_entries=2)
+
+        cache.put_many({"k1": [1.0]})
+
+        cache.put_many({"k2": [2.0]})
+
+        cache.get_many(["k1"])
+
+        cache.put_many({"k3": [3.0]})
+
+        assert len(cache) == 2
+
+        assert set(cache.get_many(["k1", "k2", "k3"])) == {"k1", "k3"}
+
+    def test_cached_embeddings_only_embeds_misses(self, cache_path):
+
+        model = CountingEmbeddings(size=8, embedded_texts=[])
+
+        cached = with_embedding_cache(model, cache_path)
+
+        first = cached.embed_documents(["alpha", "beta"])
+
+        model.embedded_texts.clear()
+
+        second = cached.embed_documents(["beta", "gamma", "alpha"])
+
+        assert model.embedded_texts == ["gamma"]
+
+        assert second[0] == pytest.approx(first[1], rel=1e-6)
+
+        assert second[2] == pytest.approx(first[0], rel=1e-6)
+
+        assert cached.hits == 2
+
+        assert cached.misses == 3
+
+    def test_cache_is_shared_across_wrappers(self, cache_path):
+
+        model = CountingEmbeddings(size=8, embedded_texts=[])
+
+        with_embedding_cache(model, cache_path).embed_documents(["alpha"])
+
+        model.embedded_texts.clear()
+
+        with_embedding_cache(model, cache_path).embed_documents(["alpha"])
+
+        assert model.embedded_texts == []
+
+    def test_without_cache_path_returns_model(self, cache_path):
+
+        model = CountingEmbeddings(size=8, embedded_texts=[])
+
+        assert with_embedding_cache(model, None) is model
+
+        cached = with_embedding_cache(model, cache_path)
+
+        assert isinstance(cached, CachedEmbeddings)
+
+        assert with_embedding_cache(cached, cache_path) is cached
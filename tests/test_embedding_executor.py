@@ -0,0 +1,160 @@
+import threading
+import time
+
+import pytest
+
+from src.embedding_cache import (
+    EmbeddingCache,
+    resolve_model_name,
+    with_embedding_cache,
+)
+from src.embedding_executor import EmbeddingExecutor, with_embedding_executor
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class FlakyEmbeddings(CountingEmbeddings):
+    """
+    Fails the first ``failures`` calls for every text listed in ``fail_on``.
+    """
+
+    fail_on: set = set()
+
+    failures: int = 1
+
+    calls: list = []
+
+    def embed_documents(self, texts):
+
+        self.calls.append(list(texts))
+
+        failed = [text for text in texts if text in self.fail_on]
+
+        if failed and sum(failed[0] in call for call in self.calls) <= self.failures:
+
+            raise RuntimeError("429 Resource exhausted")
+
+        return super().embed_documents(texts)
+
+
+class TestEmbeddingExecutor(BaseTestCase):
+
+    @pytest.fixture
+    def texts(self):
+
+        return [f"chunk {index}" for index in range(10)]
+
+    def executor(self, model, **kwargs):
+
+        options = {"batch_size": 3, "requests_per_second": None, "backoff_seconds": 0}
+
+        return EmbeddingExecutor(model, **{**options, **kwargs})
+
+    def test_batches_preserve_order(self, texts):
+
+        model = FlakyEmbeddings(size=8, embedded_texts=[], calls=[])
+
+        vectors = self.executor(model).embed_documents(texts)
+
+        assert vectors == CountingEmbeddings(size=8).embed_documents(texts)
+
+        assert sorted(len(call) for call in model.calls) == [1, 3, 3, 3]
+
+    def test_reports_progress_after_each_batch(self, texts):
+
+        updates = []
+
+        model = FlakyEmbeddings(size=8, embedded_texts=[], calls=[])
+
+        self.executor(
+            model, on_progress=lambda done, total: updates.append((done, total))
+        ).embed_documents(texts)
+
+        assert len(updates) == 4
+
+        assert sorted(updates) == updates
+
+        assert updates[-1] == (10, 10)
+
+    def test_batches_run_concurrently(self, texts):
+
+        active, peak, lock = [0], [0], threading.Lock()
+
+        class SlowEmbeddings(CountingEmbeddings):
+
+            def embed_documents(self, texts):
+
+                with lock:
+
+                    active[0] += 1
+
+                    peak[0] = max(peak[0], active[0])
+
+                time.sleep(0.05)
+
+                with lock:
+
+                    active[0] -= 1
+
+                return super().embed_documents(texts)
+
+        model = SlowEmbeddings(size=8, embedded_texts=[])
+
+        self.executor(model, max_concurrency=4).embed_documents(texts)
+
+        assert peak[0] > 1
+
+    def test_retries_failed_batches(self, texts):
+
+        model = FlakyEmbeddings(
+            size=8, embedded_texts=[], calls=[], fail_on={"chunk 4"}, failures=2
+        )
+
+        executor = self.executor(model, max_retries=2)
+
+        assert len(executor.embed_documents(texts)) == 10
+
+        assert executor.retries == 2
+
+    def test_gives_up_after_max_retries(self, texts):
+
+        model = FlakyEmbeddings(
+            size=8, embedded_texts=[], calls=[], fail_on={"chunk 4"}, failures=5
+        )
+
+        with pytest.raises(RuntimeError):
+
+            self.executor(model, max_retries=1).embed_documents(texts)
+
+    def test_failed_ingest_resumes_from_checkpoint(self, texts, tmp_path):
+
+        model = FlakyEmbeddings(
+            size=8, embedded_texts=[], calls=[], fail_on={"chunk 9"}, failures=1
+        )
+
+        cache_path = str(tmp_path / "embeddings.sqlite3")
+
+        cached = with_embedding_cache(
+            self.executor(model, max_retries=0, max_concurrency=1), cache_path
+        )
+
+        with pytest.raises(RuntimeError):
+
+            cached.embed_documents(texts)
+
+        assert len(EmbeddingCache(cache_path)) == 9
+
+        model.embedded_texts.clear()
+
+        cached.embed_documents(texts)
+
+        assert model.embedded_texts == ["chunk 9"]
+
+    def test_cache_keys_ignore_the_executor(self):
+
+        model = CountingEmbeddings(size=8)
+
+        executor = with_embedding_executor(model)
+
+        assert with_embedding_executor(executor) is executor
+
+        assert resolve_model_name(executor) == resolve_model_name(model)
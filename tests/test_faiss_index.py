@@ -0,0 +1,154 @@
+import faiss
+import numpy as np
+import pytest
+from langchain_core.documents import Document
+
+from src.faiss_index import build_vectorstore, create_faiss_index, resolve_index_config
+from src.multi_doc_chat.mmr import mmr_search_by_vector
+from src.utils import _create_retriever, load_vectorstore
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class TestFaissIndex(BaseTestCase):
+
+    @pytest.fixture
+    def vectors(self):
+
+        return np.random.default_rng(0).normal(size=(400, 16)).astype(np.float32)
+
+    def test_rejects_unknown_index_type(self):
+
+        with pytest.raises(ValueError):
+
+            resolve_index_config({"index_type": "lsh"})
+
+    @pytest.mark.parametrize(
+        "index_type, expected",
+        [
+            ("flat", faiss.IndexFlat),
+            ("ivf_flat", faiss.IndexIVFFlat),
+            ("ivf_pq", faiss.IndexIVFPQ),
+            ("hnsw", faiss.IndexHNSWFlat),
+            ("sq8", faiss.IndexScalarQuantizer),
+        ],
+    )
+    def test_creates_trained_index(self, vectors, index_type, expected):
+
+        config = {
+            "index_type": index_type,
+            "nlist": 64,
+            "pq_m": 4,
+            "pq_nbits": 4,
+            "nprobe": 4,
+        }
+
+        index = create_faiss_index(vectors, config)
+
+        assert isinstance(index, expected)
+
+        assert index.is_trained
+
+        index.add(vectors)
+
+        _, ids = index.search(vectors[:5], 1)
+
+        if index_type != "ivf_pq":
+
+            assert ids[:, 0].tolist() == [0, 1, 2, 3, 4]
+
+        if index_type.startswith("ivf"):
+
+            # Clamped to the corpus size: 400 vectors train at most 10 lists.
+            assert index.nlist == 10
+
+            assert index.nprobe == 4
+
+    def test_ivf_vectorstore_round_trip(self, tmp_path):
+
+        embeddings = CountingEmbeddings(size=16)
+
+        documents = [Document(page_content=f"chunk {index}") for index in range(100)]
+
+        config = {"index_type": "ivf_flat", "nlist": 2, "nprobe": 2}
+
+        vectorstore = build_vectorstore(
+            documents, embeddings, [str(index) for index in range(100)], config
+        )
+
+        assert vectorstore.similarity_search("chunk 7", k=1)[0].id == "7"
+
+        query_vector = embeddings.embed_query("chunk 7")
+
+        assert len(mmr_search_by_vector(vectorstore, query_vector, k=3)) == 3
+
+        faiss_dir = str(tmp_path / "faiss")
+
+        _create_retriever(documents, embeddings, faiss_dir, index_config=config)
+
+        loaded = load_vectorstore(faiss_dir, embeddings, {**config, "nprobe": 1})
+
+        assert isinstance(loaded.index, faiss.IndexIVFFlat)
+
+        assert loaded.index.nprobe == 1
+
+    def test_small_ivf_pq_corpus_falls_back_to_flat(self):
+
+        embeddings = CountingEmbeddings(size=16)
+
+        documents = [Document(page_content=f"chunk {index}") for index in range(100)]
+
+        vectorstore = build_vectorstore(
+            documents,
+            embeddings,
+            [str(index) for index in range(100)],
+            {"index_type": "ivf_pq", "pq_m": 4, "pq_nbits": 8},
+        )
+
+        assert isinstance(vectorstore.index, faiss.IndexFlat)
+
+        assert vectorstore.similarity_search("chunk 7", k=1)[0].id == "7"
+
+    @pytest.mark.parametrize(
+        "config, trained_type",
+        [
+            ({"index_type": "ivf_flat", "nlist": 64}, faiss.IndexIVFFlat),
+            ({"index_type": "ivf_pq", "pq_m": 4, "pq_nbits": 6}, faiss.IndexIVFPQ),
+        ],
+    )
+    def test_incremental_growth_retrains_the_index(
+        self, tmp_path, config, trained_type
+    ):
+
+        embeddings = CountingEmbeddings(size=16)
+
+        faiss_dir = str(tmp_path / "faiss")
+
+        documents = [Document(page_content=f"chunk {index}") for index in range(400)]
+
+        _create_retriever(documents[:50], embeddings, faiss_dir, index_config=config)
+
+        small = load_vectorstore(faiss_dir, embeddings, config)
+
+        small_nlist = getattr(faiss.try_extract_index_ivf(small.index), "nlist", 0)
+
+        assert small_nlist <= 2
+
+        _create_retriever(
+            documents,
+            embeddings,
+            faiss_dir,
+            incremental=True,
+            index_config=config,
+        )
+
+        grown = load_vectorstore(faiss_dir, embeddings, {**config, "nprobe": 16})
+
+        assert isinstance(grown.index, trained_type)
+
+        assert grown.index.nlist == 10
+
+        assert grown.index.ntotal == 400
+
+        assert grown.similarity_search("chunk 123", k=1)[0].page_content == (
+            "chunk 123"
+        )
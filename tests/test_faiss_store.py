@@ -0,0 +1,189 @@
+import os
+
+import pytest
+from langchain_community.docstore.in_memory import InMemoryDocstore
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from src.constants import (
+    DOCSTORE_FILE,
+    FAISS_GENERATION_PREFIX,
+    FAISS_INDEX_NAME,
+    LEGACY_DOCSTORE_FILE,
+)
+from src.faiss_store import (
+    SQLiteDocstore,
+    clear_vectorstore_cache,
+    resolve_index_dir,
+)
+from src.multi_doc_chat.mmr import mmr_search_by_vector
+from src.utils import _create_retriever, compute_content_hash, load_vectorstore
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class TestFaissStore(BaseTestCase):
+
+    @pytest.fixture(autouse=True)
+    def empty_cache(self):
+
+        clear_vectorstore_cache()
+
+        yield
+
+        clear_vectorstore_cache()
+
+    @pytest.fixture
+    def embeddings(self):
+
+        return CountingEmbeddings(size=16)
+
+    @pytest.fixture
+    def faiss_dir(self, tmp_path):
+
+        return str(tmp_path / "faiss_index")
+
+    def test_saves_sqlite_docstore_instead_of_pickle(self, embeddings, faiss_dir):
+
+        _create_retriever([Document(page_content="alpha")], embeddings, faiss_dir)
+
+        assert sorted(os.listdir(resolve_index_dir(faiss_dir))) == [
+            DOCSTORE_FILE,
+            "index.faiss",
+        ]
+
+        assert os.path.exists(os.path.join(faiss_dir, "bm25.json"))
+
+    def test_rebuild_swaps_index_and_docstore_together(self, embeddings, faiss_dir):
+
+        _create_retriever([Document(page_content="alpha")], embeddings, faiss_dir)
+
+        reader = load_vectorstore(faiss_dir, embeddings)
+
+        generations = []
+
+        for text in ("beta", "gamma"):
+
+            _create_retriever([Document(page_content=text)], embeddings, faiss_dir)
+
+            generations.append(resolve_index_dir(faiss_dir))
+
+        # A reader opened before the rebuilds still pairs its own index and
+        # docstore, and only the current and previous generations are kept.
+        assert reader.similarity_search("alpha", k=1)[0].page_content == "alpha"
+
+        assert (
+            load_vectorstore(faiss_dir, embeddings)
+            .similarity_search("gamma", k=1)[0]
+            .page_content
+            == "gamma"
+        )
+
+        assert sorted(
+            os.path.join(faiss_dir, name)
+            for name in os.listdir(faiss_dir)
+            if name.startswith(FAISS_GENERATION_PREFIX)
+        ) == sorted(generations)
+
+    def test_read_only_loads_are_cached(self, embeddings, faiss_dir):
+
+        _create_retriever([Document(page_content="alpha")], embeddings, faiss_dir)
+
+        first = load_vectorstore(faiss_dir, embeddings)
+
+        assert load_vectorstore(faiss_dir, embeddings) is first
+
+        assert isinstance(first.docstore, SQLiteDocstore)
+
+    def test_rewritten_index_is_reloaded(self, embeddings, faiss_dir):
+
+        _create_retriever([Document(page_content="alpha")], embeddings, faiss_dir)
+
+        first = load_vectorstore(faiss_dir, embeddings)
+
+        _create_retriever(
+            [Document(page_content="beta")], embeddings, faiss_dir, incremental=True
+        )
+
+        second = load_vectorstore(faiss_dir, embeddings)
+
+        assert second is not first
+
+        assert second.index.ntotal == 2
+
+        assert first.index.ntotal == 1
+
+    def test_writable_load_is_a_private_copy(self, embeddings, faiss_dir):
+
+        _create_retriever([Document(page_content="alpha")], embeddings, faiss_dir)
+
+        shared = load_vectorstore(faiss_dir, embeddings)
+
+        writable = load_vectorstore(faiss_dir, embeddings, writable=True)
+
+        assert isinstance(writable.docstore, InMemoryDocstore)
+
+        writable.add_documents([Document(page_content="beta")], ids=["beta"])
+
+        assert shared.index.ntotal == 1
+
+    def test_docstore_reads_documents_on_demand(self, embeddings, faiss_dir):
+
+        documents = [Document(page_content=f"chunk {index}") for index in range(20)]
+
+        _create_retriever(documents, embeddings, faiss_dir)
+
+        vectorstore = load_vectorstore(faiss_dir, embeddings)
+
+        found = vectorstore.similarity_search("chunk 3", k=1)[0]
+
+        assert found.page_content == "chunk 3"
+
+        assert found.id == compute_content_hash("chunk 3")
+
+        assert vectorstore.docstore.search("missing") == "ID missing not found."
+
+        assert len(vectorstore.index_to_docstore_id) == 20
+
+    def test_loads_and_upgrades_pickled_docstore(self, embeddings, faiss_dir):
+
+        FAISS.from_documents(
+            [Document(page_content="alpha")], embeddings, ids=["alpha"]
+        ).save_local(faiss_dir, index_name=FAISS_INDEX_NAME)
+
+        legacy = load_vectorstore(faiss_dir, embeddings)
+
+        assert legacy.docstore.search("alpha").page_content == "alpha"
+
+        _create_retriever(
+            [Document(page_content="beta")], embeddings, faiss_dir, incremental=True
+        )
+
+        assert not os.path.exists(os.path.join(faiss_dir, LEGACY_DOCSTORE_FILE))
+
+        upgraded = load_vectorstore(faiss_dir, embeddings)
+
+        assert upgraded.index.ntotal == 2
+
+        # Re-keyed by content hash on the way.
+        assert (
+            upgraded.docstore.search(compute_content_hash("alpha")).page_content
+            == "alpha"
+        )
+
+    def test_memory_mapped_ivf_index_supports_mmr(self, embeddings, faiss_dir):
+
+        documents = [Document(page_content=f"chunk {index}") for index in range(100)]
+
+        config = {"index_type": "ivf_flat", "nlist": 2, "nprobe": 2}
+
+        _create_retriever(documents, embeddings, faiss_dir, index_config=config)
+
+        vectorstore = load_vectorstore(faiss_dir, embeddings, config)
+
+        query_vector = embeddings.embed_query("chunk 7")
+
+        results = mmr_search_by_vector(vectorstore, query_vector, k=3)
+
+        assert results[0].page_content == "chunk 7"
+
+        assert len(results) == 3
@@ -0,0 +1,151 @@
+import os
+
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from src.hybrid_search import (
+    BM25Index,
+    HybridRetriever,
+    bm25_index_path,
+    reciprocal_rank_fusion,
+    tokenize,
+)
+from src.utils import _create_retriever, load_retriever_from_vectorstore
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class TestBM25Index(BaseTestCase):
+
+    def test_tokenize_keeps_identifiers(self):
+
+        assert tokenize("Invoice INV-2023-001, clause 4.2") == [
+            "invoice",
+            "inv-2023-001",
+            "inv",
+            "2023",
+            "001",
+            "clause",
+            "4.2",
+            "4",
+            "2",
+        ]
+
+    def test_ranks_keyword_matches(self, tmp_path):
+
+        index = BM25Index()
+
+        index.add(
+            ["a", "b", "c"],
+            [
+                "Invoice INV-2023-001 is overdue",
+                "General terms and conditions",
+                "Invoice INV-2023-002 was paid, invoice closed",
+            ],
+        )
+
+        assert [doc_id for doc_id, _ in index.search("INV-2023-001", k=2)] == [
+            "a",
+            "c",
+        ]
+
+        assert index.search("unrelated", k=2) == []
+
+        path = str(tmp_path / "bm25.json")
+
+        index.save(path)
+
+        assert BM25Index.load(path).search("invoice", k=3) == index.search(
+            "invoice", k=3
+        )
+
+        assert BM25Index.load(str(tmp_path / "missing.json")) is None
+
+    def test_reciprocal_rank_fusion(self):
+
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=60)
+
+        assert [doc_id for doc_id, _ in fused] == ["a", "c", "b"]
+
+
+class TestHybridRetriever(BaseTestCase):
+
+    @pytest.fixture
+    def embeddings(self):
+
+        return CountingEmbeddings(size=16)
+
+    def test_keyword_query_is_found(self, embeddings):
+
+        texts = [f"Filler paragraph number {index}" for index in range(30)]
+
+        texts.append("Payment reference INV-7731 is pending")
+
+        vectorstore = FAISS.from_texts(
+            texts, embeddings, ids=[str(index) for index in range(len(texts))]
+        )
+
+        retriever = load_retriever_from_vectorstore(vectorstore, "hybrid", k=3)
+
+        assert isinstance(retriever, HybridRetriever)
+
+        documents = retriever.invoke("INV-7731")
+
+        assert documents[0].page_content == "Payment reference INV-7731 is pending"
+
+    def test_create_retriever_persists_bm25_next_to_faiss(self, embeddings, tmp_path):
+
+        faiss_dir = str(tmp_path / "faiss")
+
+        _create_retriever(
+            [Document(page_content="Clause 7.3 covers termination")],
+            embeddings,
+            faiss_dir,
+        )
+
+        retriever = _create_retriever(
+            [Document(page_content="Clause 9.1 covers payment")],
+            embeddings,
+            faiss_dir,
+            incremental=True,
+            search_type="hybrid",
+        )
+
+        assert len(BM25Index.load(bm25_index_path(faiss_dir))) == 2
+
+        assert retriever.invoke("7.3")[0].page_content == (
+            "Clause 7.3 covers termination"
+        )
+
+    def test_missing_bm25_index_is_backfilled(self, embeddings, tmp_path):
+
+        faiss_dir = str(tmp_path / "faiss")
+
+        _create_retriever(
+            [Document(page_content="Clause 7.3 covers termination")],
+            embeddings,
+            faiss_dir,
+        )
+
+        os.remove(bm25_index_path(faiss_dir))
+
+        _create_retriever(
+            [Document(page_content="Clause 7.3 covers termination")],
+            embeddings,
+            faiss_dir,
+            incremental=True,
+        )
+
+        assert len(BM25Index.load(bm25_index_path(faiss_dir))) == 1
+
+    def test_empty_rebuild_writes_nothing(self, embeddings, tmp_path):
+
+        faiss_dir = str(tmp_path / "faiss")
+
+        with pytest.raises(ValueError):
+
+            _create_retriever([Document(page_content="  ")], embeddings, faiss_dir)
+
+        assert not os.path.exists(bm25_index_path(faiss_dir))
+
+        assert not os.path.exists(faiss_dir)
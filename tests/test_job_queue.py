@@ -0,0 +1,309 @@
+import threading
+import time
+
+import pandas as pd
+
+import src.job_handlers as job_handlers
+from src.document_comparison.document_handler import DocumentComparisonHandler
+from src.job_queue import JobQueue, job_key, run_job, run_worker
+from tests.base import BaseTestCase
+
+
+def echo_job(payload, progress):
+
+    for step in range(1, 3):
+
+        progress(step / 2, f"step {step}")
+
+    return {"echo": payload["value"]}
+
+
+def failing_job(payload, progress):
+
+    raise RuntimeError("boom")
+
+
+HANDLERS = {"echo": echo_job, "fail": failing_job}
+
+
+class TestJobQueue(BaseTestCase):
+
+    def test_claims_by_lane_then_submission_order(self, tmp_path):
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+        bulk = queue.submit("echo", {"value": 1}, lane="bulk")
+
+        first = queue.submit("echo", {"value": 2})
+
+        second = queue.submit("echo", {"value": 3})
+
+        urgent = queue.submit("echo", {"value": 4}, lane="interactive")
+
+        claimed = [queue.claim().id for _ in range(4)]
+
+        assert claimed == [urgent, first, second, bulk]
+
+        assert queue.claim() is None
+
+    def test_claim_serves_only_requested_lanes(self, tmp_path):
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+        queue.submit("echo", {"value": 1}, lane="bulk")
+
+        assert queue.claim(lanes=["interactive", "default"]) is None
+
+        assert queue.claim(lanes=["bulk"]) is not None
+
+    def test_submit_is_idempotent_per_key(self, tmp_path):
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+        job_id = queue.submit("fail", {}, key="k")
+
+        assert queue.submit("fail", {}, key="k") == job_id
+
+        run_worker(str(tmp_path / "jobs.sqlite3"), handlers=HANDLERS, until_idle=True)
+
+        assert queue.status(job_id)["status"] == "failed"
+
+        assert queue.status(job_id)["error"] == "boom"
+
+        assert queue.submit("fail", {}, key="k") == job_id
+
+        assert queue.status(job_id)["status"] == "queued"
+
+    def test_job_key_depends_on_file_contents(self, tmp_path):
+
+        first = tmp_path / "a.txt"
+
+        second = tmp_path / "b.txt"
+
+        first.write_text("same")
+
+        second.write_text("same")
+
+        assert job_key("ingest", [str(first)]) == job_key("ingest", [str(second)])
+
+        assert job_key("ingest", [str(first)]) != job_key(
+            "ingest", [str(first)], session_id="s"
+        )
+
+        second.write_text("different")
+
+        assert job_key("ingest", [str(first)]) != job_key("ingest", [str(second)])
+
+    def test_worker_records_progress_and_result(self, tmp_path):
+
+        db_path = str(tmp_path / "jobs.sqlite3")
+
+        queue = JobQueue(db_path)
+
+        job_id = queue.submit("echo", {"value": 42})
+
+        assert queue.result(job_id) is None
+
+        assert run_worker(db_path, handlers=HANDLERS, until_idle=True) == 1
+
+        status = queue.status(job_id)
+
+        assert status["status"] == "succeeded"
+
+        assert status["progress"] == 1.0
+
+        assert status["message"] == "step 2"
+
+        assert queue.result(job_id) == {"echo": 42}
+
+    def test_worker_stops_on_event(self, tmp_path):
+
+        stop_event = threading.Event()
+
+        worker = threading.Thread(
+            target=run_worker,
+            args=(str(tmp_path / "jobs.sqlite3"),),
+            kwargs={
+                "handlers": HANDLERS,
+                "poll_seconds": 0.01,
+                "stop_event": stop_event,
+            },
+        )
+
+        worker.start()
+
+        job_id = JobQueue(str(tmp_path / "jobs.sqlite3")).submit("echo", {"value": 1})
+
+        deadline = time.time() + 5
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"))
+
+        while queue.status(job_id)["status"] != "succeeded" and time.time() < deadline:
+
+            time.sleep(0.01)
+
+        stop_event.set()
+
+        worker.join(timeout=5)
+
+        assert not worker.is_alive()
+
+        assert queue.result(job_id) == {"echo": 1}
+
+    def test_stale_jobs_are_requeued_until_max_attempts(self, tmp_path):
+
+        queue = JobQueue(
+            str(tmp_path / "jobs.sqlite3"), stale_seconds=0, max_attempts=2
+        )
+
+        job_id = queue.submit("echo", {"value": 1})
+
+        assert queue.claim().attempts == 1
+
+        time.sleep(0.01)
+
+        assert queue.claim().attempts == 2
+
+        time.sleep(0.01)
+
+        assert queue.claim() is None
+
+        status = queue.status(job_id)
+
+        assert status["status"] == "failed"
+
+        assert status["error"] == "worker timed out"
+
+
+class TestJobHandlers(BaseTestCase):
+
+    def test_compare_job_reports_batch_progress(self, tmp_path, monkeypatch):
+
+        class FakeComparison:
+
+            async def acompare_documents(self, reference, actual, on_progress=None):
+
+                for done in (1, 2):
+
+                    on_progress(done, 2)
+
+                return pd.DataFrame([{"Page": "1", "Changes": reference + actual}])
+
+        monkeypatch.setattr(job_handlers, "DocumentComparisonWithLLM", FakeComparison)
+
+        monkeypatch.setattr(
+            job_handlers,
+            "DocumentComparisonHandler",
+            lambda: DocumentComparisonHandler(file_path=str(tmp_path / "compare")),
+        )
+
+        (tmp_path / "uploads").mkdir()
+
+        (tmp_path / "uploads" / "a.txt").write_text("a")
+
+        (tmp_path / "uploads" / "b.txt").write_text("b")
+
+        reports = []
+
+        result = job_handlers.compare_job(
+            {
+                "reference_path": str(tmp_path / "uploads" / "a.txt"),
+                "actual_path": str(tmp_path / "uploads" / "b.txt"),
+            },
+            lambda progress, message: reports.append(progress),
+        )
+
+        assert result == [{"Page": "1", "Changes": "ab"}]
+
+        assert reports == [0.0, 0.5, 1.0]
+
+    def test_ingest_job_forwards_progress(self, monkeypatch):
+
+        class FakeIngestor:
+
+            def __init__(self, session_id):
+
+                self.session_id = session_id
+
+            def ingest_files(self, file_paths, incremental=False, on_progress=None):
+
+                on_progress(0.5, "Parsed 1 of 1 files")
+
+                on_progress(1.0, "Embedded 3 of 3 new chunks")
+
+        monkeypatch.setattr(job_handlers, "MultiDocIngestor", FakeIngestor)
+
+        reports = []
+
+        result = job_handlers.ingest_job(
+            {"session_id": "session_1", "file_paths": ["/uploads/0/a.txt"]},
+            lambda progress, message: reports.append(progress),
+        )
+
+        assert result == {"session_id": "session_1", "files": ["a.txt"]}
+
+        assert reports == [0.0, 0.5, 1.0]
+
+    def test_reclaimed_attempt_cannot_record_its_outcome(self, tmp_path):
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), stale_seconds=0)
+
+        job_id = queue.submit("echo", {"value": 1})
+
+        stale = queue.claim()
+
+        time.sleep(0.01)
+
+        live = queue.claim()
+
+        assert live.attempts == stale.attempts + 1
+
+        assert not queue.heartbeat(job_id, stale.attempts)
+
+        assert not queue.report_progress(job_id, stale.attempts, 0.5)
+
+        assert queue.complete(job_id, live.attempts, {"echo": "live"})
+
+        assert not queue.complete(job_id, stale.attempts, {"echo": "stale"})
+
+        assert not queue.fail(job_id, stale.attempts, "stale")
+
+        assert queue.result(job_id) == {"echo": "live"}
+
+    def test_heartbeat_keeps_a_silent_job_claimed(self, tmp_path):
+
+        queue = JobQueue(str(tmp_path / "jobs.sqlite3"), stale_seconds=0.2)
+
+        def slow_job(payload, progress):
+
+            time.sleep(0.5)
+
+            return "done"
+
+        queue.submit("slow", {})
+
+        job = queue.claim()
+
+        other = JobQueue(str(tmp_path / "jobs.sqlite3"), stale_seconds=0.2)
+
+        claimed = []
+
+        def poll():
+
+            for _ in range(10):
+
+                claimed.append(other.claim())
+
+                time.sleep(0.05)
+
+        poller = threading.Thread(target=poll)
+
+        poller.start()
+
+        run_job(queue, job, {"slow": slow_job}, heartbeat_seconds=0.05)
+
+        poller.join()
+
+        assert claimed == [None] * 10
+
+        assert queue.result(job.id) == "done"
@@ -0,0 +1,101 @@
+import asyncio
+
+import numpy as np
+import pytest
+from langchain_community.vectorstores import FAISS
+from langchain_community.vectorstores.utils import (
+    maximal_marginal_relevance as langchain_mmr,
+)
+from langchain_core.documents import Document
+
+from src.multi_doc_chat.mmr import (
+    MMRRetriever,
+    fetch_candidates,
+    maximal_marginal_relevance,
+    mmr_search_by_vector,
+)
+from src.utils import load_retriever_from_vectorstore
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class TestMaximalMarginalRelevance(BaseTestCase):
+
+    @pytest.mark.parametrize("lambda_mult", [0.0, 0.5, 1.0])
+    def test_matches_langchain_selection(self, lambda_mult):
+
+        rng = np.random.default_rng(0)
+
+        query = rng.normal(size=16)
+
+        candidates = rng.normal(size=(50, 16))
+
+        assert maximal_marginal_relevance(
+            query, candidates, k=10, lambda_mult=lambda_mult
+        ) == langchain_mmr(
+            query.reshape(1, -1), candidates, k=10, lambda_mult=lambda_mult
+        )
+
+    def test_handles_small_and_empty_inputs(self):
+
+        assert maximal_marginal_relevance([1.0, 0.0], np.empty((0, 2))) == []
+
+        assert sorted(maximal_marginal_relevance([1.0, 0.0], np.eye(2), k=5)) == [
+            0,
+            1,
+        ]
+
+
+class TestMMRRetriever(BaseTestCase):
+
+    @pytest.fixture
+    def embeddings(self):
+
+        return CountingEmbeddings(size=16)
+
+    @pytest.fixture
+    def vectorstore(self, embeddings):
+
+        documents = [
+            Document(page_content=f"chunk {index}", metadata={"group": index % 2})
+            for index in range(30)
+        ]
+
+        vectorstore = FAISS.from_documents(documents, embeddings)
+
+        embeddings.embedded_texts.clear()
+
+        return vectorstore
+
+    def test_matches_langchain_mmr_without_re_embedding(self, vectorstore, embeddings):
+
+        query_vector = embeddings.embed_query("a question about chunks")
+
+        expected = vectorstore.max_marginal_relevance_search_by_vector(
+            query_vector, k=5, fetch_k=20
+        )
+
+        assert mmr_search_by_vector(vectorstore, query_vector, k=5, fetch_k=20) == (
+            expected
+        )
+
+        assert embeddings.embedded_texts == []
+
+    def test_filter_is_applied_to_candidates(self, vectorstore, embeddings):
+
+        documents, vectors, scores = fetch_candidates(
+            vectorstore, embeddings.embed_query("chunk 3"), 6, filter={"group": 1}
+        )
+
+        assert len(documents) == len(vectors) == len(scores) == 6
+
+        assert all(document.metadata["group"] == 1 for document in documents)
+
+    def test_load_retriever_uses_vectorized_mmr(self, vectorstore):
+
+        retriever = load_retriever_from_vectorstore(vectorstore, "mmr", k=3)
+
+        assert isinstance(retriever, MMRRetriever)
+
+        assert len(retriever.invoke("chunk 3")) == 3
+
+        assert len(asyncio.run(retriever.ainvoke("chunk 3"))) == 3
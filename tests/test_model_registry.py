@@ -0,0 +1,93 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.model_registry import get_model_registry
+from tests.base import BaseTestCase
+
+
+class TestModelRegistry(BaseTestCase):
+
+    @pytest.fixture
+    def mock_loader(self):
+
+        with (
+            patch("src.model_registry.ModelLoader") as loader_cls,
+            patch("src.model_registry.load_dotenv"),
+        ):
+
+            loader = loader_cls.return_value
+
+            loader.config = {
+                "llm": {"groq": {"model_name": "llama", "temperature": 0}},
+                "embedding_model": {"provider": "google", "model_name": "emb"},
+            }
+
+            loader._resolve_provider_name.side_effect = (
+                lambda provider, section: provider or "groq"
+            )
+
+            loader.load_llm.side_effect = lambda *args, **kwargs: MagicMock()
+
+            loader.load_embeddings.side_effect = lambda *args, **kwargs: MagicMock()
+
+            yield loader_cls
+
+    def test_registry_is_shared_per_config(self, mock_loader):
+
+        assert get_model_registry("a.yaml") is get_model_registry("a.yaml")
+
+        assert get_model_registry("a.yaml") is not get_model_registry("b.yaml")
+
+        assert mock_loader.call_count == 2
+
+    def test_llm_is_created_once_per_key(self, mock_loader):
+
+        registry = get_model_registry()
+
+        llm = registry.get_llm()
+
+        assert registry.get_llm() is llm
+
+        assert registry.get_llm("groq") is llm
+
+        assert registry.get_llm(temperature=0.7) is not llm
+
+        assert registry.loader.load_llm.call_count == 2
+
+    def test_embeddings_are_created_once(self, mock_loader):
+
+        registry = get_model_registry()
+
+        assert registry.get_embeddings() is registry.get_embeddings()
+
+        registry.loader.load_embeddings.assert_called_once()
+
+    def test_chain_is_built_once_per_prompt(self, mock_loader):
+
+        registry = get_model_registry()
+
+        build_chain = MagicMock(side_effect=lambda llm: MagicMock())
+
+        chain = registry.get_chain("document_analysis", build_chain)
+
+        assert registry.get_chain("document_analysis", build_chain) is chain
+
+        assert registry.get_chain("document_comparison", build_chain) is not chain
+
+        assert build_chain.call_count == 2
+
+        build_chain.assert_called_with(registry.get_llm())
+
+    def test_concurrent_access_creates_single_client(self, mock_loader):
+
+        registry = get_model_registry()
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+
+            llms = list(executor.map(lambda _: registry.get_llm(), range(32)))
+
+        assert all(llm is llms[0] for llm in llms)
+
+        registry.loader.load_llm.assert_called_once()
@@ -0,0 +1,239 @@
+import os
+from unittest.mock import patch
+
+import fitz
+import pytest
+import yaml
+from langchain_core.documents import Document
+
+from src.constants import KEY_CONTENT_HASH
+from src.embedding_executor import with_embedding_executor
+from src.faiss_store import resolve_index_dir
+from src.model_registry import DEFAULT_CONFIG_PATH
+from src.multi_doc_chat.data_ingestion import MultiDocIngestor
+from src.multi_doc_chat.data_retrival import (
+    load_sharded_retriever,
+    merge_shard_results,
+)
+from src.single_doc_chat.data_ingestion import SingleDocIngestor
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class TestMultiDocIngestor(BaseTestCase):
+
+    @pytest.fixture
+    def embeddings(self):
+
+        return CountingEmbeddings(size=16)
+
+    @pytest.fixture
+    def make_ingestor(self, tmp_path, embeddings):
+
+        with (
+            patch("src.model_registry.ModelLoader") as loader_cls,
+            patch("src.model_registry.load_dotenv"),
+        ):
+
+            loader_cls.return_value.config = {}
+
+            loader_cls.return_value.load_embeddings.return_value = embeddings
+
+            def make(session_id):
+
+                return MultiDocIngestor(
+                    data_dir=str(tmp_path / "uploads"),
+                    faiss_dir=str(tmp_path / "faiss"),
+                    session_id=session_id,
+                    embedding_cache_path=None,
+                    max_workers=1,
+                )
+
+            yield make
+
+    def test_default_ingestor_uses_project_config(self, tmp_path, monkeypatch):
+
+        # Relative data paths from the config land in the temporary directory.
+        monkeypatch.chdir(tmp_path)
+
+        with open(DEFAULT_CONFIG_PATH, encoding="utf-8") as f:
+
+            config = yaml.safe_load(f)
+
+        with patch("src.model_registry.load_dotenv"):
+
+            ingestor = MultiDocIngestor(session_id="session_a")
+
+        assert ingestor.index_config == config["faiss_db"]
+
+        assert ingestor.index_config["index_type"] == (config["faiss_db"]["index_type"])
+
+    @pytest.mark.parametrize("ingestor_cls", [MultiDocIngestor, SingleDocIngestor])
+    def test_default_ingestor_uses_configured_executor(
+        self, tmp_path, monkeypatch, embeddings, ingestor_cls
+    ):
+
+        monkeypatch.chdir(tmp_path)
+
+        with open(DEFAULT_CONFIG_PATH, encoding="utf-8") as f:
+
+            config = yaml.safe_load(f)["embedding_executor"]
+
+        with patch("src.model_registry.load_dotenv"):
+
+            ingestor = ingestor_cls(session_id="session_a")
+
+        assert ingestor.executor_config == config
+
+        executor = with_embedding_executor(embeddings, ingestor.executor_config)
+
+        assert executor.batch_size == config["batch_size"]
+
+        assert executor.max_concurrency == config["max_concurrency"]
+
+        assert executor.max_retries == config["max_retries"]
+
+    @pytest.fixture
+    def mixed_files(self, tmp_path):
+
+        pdf_path = tmp_path / "report.pdf"
+
+        pdf = fitz.open()
+
+        pdf.new_page().insert_text((50, 50), "Quarterly revenue grew strongly.")
+
+        pdf.save(pdf_path)
+
+        pdf.close()
+
+        txt_path = tmp_path / "notes.txt"
+
+        txt_path.write_text("Meeting notes about the hiring plan.")
+
+        md_path = tmp_path / "readme.md"
+
+        md_path.write_text("# Portal\n\nUpload documents to chat with them.")
+
+        return [str(pdf_path), str(txt_path), str(md_path)]
+
+    def test_ingests_mixed_types_into_session_shard(
+        self, make_ingestor, mixed_files, tmp_path
+    ):
+
+        retriever = make_ingestor("session_a").ingest_files(mixed_files)
+
+        shard_dir = resolve_index_dir(str(tmp_path / "faiss" / "session_a"))
+
+        assert os.path.exists(os.path.join(shard_dir, "index.faiss"))
+
+        documents = retriever.invoke("hiring plan")
+
+        assert {document.metadata["file_name"] for document in documents} == {
+            "report.pdf",
+            "notes.txt",
+            "readme.md",
+        }
+
+        assert all(
+            document.metadata["session_id"] == "session_a" for document in documents
+        )
+
+    def test_reports_parse_then_embedding_progress(self, make_ingestor, mixed_files):
+
+        updates = []
+
+        make_ingestor("session_a").ingest_files(
+            mixed_files,
+            on_progress=lambda fraction, message: updates.append((fraction, message)),
+        )
+
+        parsed = [update for update in updates if update[1].startswith("Parsed")]
+
+        assert [fraction for fraction, _ in parsed] == pytest.approx(
+            [1 / 6, 2 / 6, 0.5]
+        )
+
+        assert parsed[-1][1] == "Parsed 3 of 3 files"
+
+        assert updates.index(parsed[-1]) < len(updates) - 1
+
+        fractions = [fraction for fraction, _ in updates]
+
+        assert fractions == sorted(fractions)
+
+        assert fractions[-1] == 1.0
+
+        assert updates[-1][1].startswith("Embedded")
+
+    def test_docx_files_are_supported(self, make_ingestor, tmp_path):
+
+        docx = pytest.importorskip("docx")
+
+        docx_path = tmp_path / "contract.docx"
+
+        document = docx.Document()
+
+        document.add_paragraph("The contract renews every year.")
+
+        document.save(docx_path)
+
+        retriever = make_ingestor("session_docx").ingest_files([str(docx_path)])
+
+        assert "renews" in retriever.invoke("contract")[0].page_content
+
+    def test_rejects_unsupported_types(self, make_ingestor, tmp_path):
+
+        path = tmp_path / "data.xlsx"
+
+        path.write_bytes(b"binary")
+
+        with pytest.raises(Exception, match="Unsupported file types"):
+
+            make_ingestor("session_b").ingest_files([str(path)])
+
+    def test_sharded_retriever_searches_all_sessions(
+        self, make_ingestor, mixed_files, embeddings, tmp_path
+    ):
+
+        make_ingestor("session_a").ingest_files(mixed_files[:1])
+
+        make_ingestor("session_b").ingest_files(mixed_files[1:])
+
+        retriever = load_sharded_retriever(
+            embeddings, faiss_dir=str(tmp_path / "faiss"), k=3
+        )
+
+        assert len(retriever.shards) == 2
+
+        documents = retriever.invoke("Meeting notes about the hiring plan.")
+
+        assert len(documents) == 3
+
+        assert documents[0].metadata["file_name"] == "notes.txt"
+
+        only_a = load_sharded_retriever(
+            embeddings,
+            faiss_dir=str(tmp_path / "faiss"),
+            session_ids=["session_a", "missing"],
+        )
+
+        assert len(only_a.shards) == 1
+
+
+class TestMergeShardResults(BaseTestCase):
+
+    def test_keeps_best_score_per_chunk(self):
+
+        shared = Document(page_content="shared", metadata={KEY_CONTENT_HASH: "h"})
+
+        merged = merge_shard_results(
+            [
+                [(shared, 0.2), (Document(page_content="a"), 0.9)],
+                [(shared, 0.7), (Document(page_content="b"), 0.1)],
+            ],
+            k=2,
+        )
+
+        assert [(document.page_content, score) for document, score in merged] == [
+            ("a", 0.9),
+            ("shared", 0.7),
+        ]
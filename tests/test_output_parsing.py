@@ -0,0 +1,104 @@
+from unittest.mock import MagicMock
+
+import pytest
+from langchain_core.exceptions import OutputParserException
+
+from model.models import Metadata, SummaryResponse
+from src.output_parsing import (
+    RepairingOutputParser,
+    get_parse_metrics,
+    repair_json,
+    reset_parse_metrics,
+)
+from tests.base import BaseTestCase
+
+
+class TestRepairJson(BaseTestCase):
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ('```json\n{"a": 1}\n```', {"a": 1}),
+            ('Here is the result: {"a": [1, 2]} Hope it helps.', {"a": [1, 2]}),
+            ('{"a": [1, 2,], "b": 3,}', {"a": [1, 2], "b": 3}),
+            ("{“a”: “b”}", {"a": "b"}),
+            ("{'a': True, 'b': None}", {"a": True, "b": None}),
+            ('[{"Page": "1", "changes": "NO CH', [{"Page": "1", "changes": "NO CH"}]),
+            (
+                '{"Summary": ["x", "y"], "Title":',
+                {"Summary": ["x", "y"], "Title": None},
+            ),
+        ],
+    )
+    def test_repairs_common_defects(self, text, expected):
+
+        assert repair_json(text) == expected
+
+    def test_unrepairable_text_raises(self):
+
+        with pytest.raises(ValueError):
+
+            repair_json("no json here")
+
+
+class TestRepairingOutputParser(BaseTestCase):
+
+    def setup_method(self, method):
+
+        reset_parse_metrics()
+
+    def test_local_repair_avoids_llm_fixer(self):
+
+        fixer = MagicMock()
+
+        parser = RepairingOutputParser(
+            pydantic_object=SummaryResponse, fixing_parser=fixer
+        )
+
+        result = parser.parse('```json\n[{"Page": "1", "changes": "NO CHANGE"},]\n```')
+
+        assert result == [{"Page": "1", "changes": "NO CHANGE"}]
+
+        fixer.parse.assert_not_called()
+
+        assert get_parse_metrics() == {"local_repair": 1}
+
+    def test_validates_against_schema(self):
+
+        parser = RepairingOutputParser(pydantic_object=Metadata)
+
+        payload = (
+            '{"Summary": ["s"], "Title": "t", "Author": "a", "DateCreated": "d",'
+            ' "LastModifiedDate": "d", "Publisher": "p", "Language": "en",'
+            ' "PageCount": 3, "SentimentTone": "neutral"}'
+        )
+
+        assert parser.parse(payload)["PageCount"] == 3
+
+        assert parser.parse('{"Title": "only"}') == {"Title": "only"}
+
+        assert get_parse_metrics() == {"direct": 2, "schema_mismatch": 1}
+
+    def test_llm_fixer_is_last_resort(self):
+
+        fixer = MagicMock()
+
+        fixer.parse.return_value = {"fixed": True}
+
+        parser = RepairingOutputParser(fixing_parser=fixer)
+
+        assert parser.parse("not json at all") == {"fixed": True}
+
+        fixer.parse.assert_called_once_with("not json at all")
+
+        assert get_parse_metrics() == {"llm_fix": 1}
+
+    def test_without_fixer_raises(self):
+
+        parser = RepairingOutputParser()
+
+        with pytest.raises(OutputParserException):
+
+            parser.parse("not json at all")
+
+        assert get_parse_metrics() == {"failed": 1}
@@ -0,0 +1,236 @@
+import asyncio
+import re
+from unittest.mock import MagicMock, patch
+
+from src.constants import (
+    NO_CHANGE,
+    PAGE_ADDED,
+    PAGE_CHANGED,
+    PAGE_REMOVED,
+    PAGE_UNCHANGED,
+)
+from src.document_comparison.document_comparison import DocumentComparisonWithLLM
+from src.document_comparison.page_diff import (
+    align_pages,
+    build_changed_pages_prompt,
+    merge_page_changes,
+    split_pages,
+)
+from tests.base import BaseTestCase
+
+
+def _make_text(pages):
+
+    return "\n".join(
+        f"Page {index}:\n{text}" for index, text in enumerate(pages, start=1)
+    )
+
+
+class TestPageDiff(BaseTestCase):
+
+    def test_split_pages(self):
+
+        assert split_pages(_make_text(["one", "two"])) == ["one", "two"]
+
+        assert split_pages("plain text") == ["plain text"]
+
+    def test_whitespace_only_changes_are_unchanged(self):
+
+        diffs = align_pages(_make_text(["a  b\nc"]), _make_text(["a b c"]))
+
+        assert [diff.status for diff in diffs] == [PAGE_UNCHANGED]
+
+    def test_inserted_page_does_not_shift_following_pages(self):
+
+        reference = _make_text(["intro", "body", "end"])
+
+        actual = _make_text(["intro", "new page", "body", "end"])
+
+        diffs = align_pages(reference, actual)
+
+        assert [diff.status for diff in diffs] == [
+            PAGE_UNCHANGED,
+            PAGE_ADDED,
+            PAGE_UNCHANGED,
+            PAGE_UNCHANGED,
+        ]
+
+        assert diffs[2].reference_page == 2
+
+        assert diffs[2].actual_page == 3
+
+    def test_changed_page_carries_line_diff(self):
+
+        diffs = align_pages(
+            _make_text(["Budget: $50,000"]), _make_text(["Budget: $60,000"])
+        )
+
+        assert diffs[0].status == PAGE_CHANGED
+
+        assert "-Budget: $50,000" in diffs[0].diff
+
+        assert "+Budget: $60,000" in diffs[0].diff
+
+        prompt = build_changed_pages_prompt(diffs)
+
+        assert "Page 1 (changed" in prompt
+
+    def test_merge_page_changes(self):
+
+        diffs = align_pages(
+            _make_text(["same", "old", "same again"]),
+            _make_text(["same", "new", "same again"]),
+        )
+
+        rows = merge_page_changes(
+            diffs,
+            [
+                {"Page": "Page 2", "changes": "old -> new"},
+                {"Page": "1", "changes": "hallucinated"},
+            ],
+        )
+
+        assert rows == [
+            {"Page": "1", "changes": NO_CHANGE},
+            {"Page": "2", "changes": "old -> new"},
+            {"Page": "3", "changes": NO_CHANGE},
+        ]
+
+    def test_removed_then_inserted_pages_have_unique_ids(self):
+
+        diffs = align_pages(
+            _make_text(["alpha", "bravo", "charlie", "delta", "echo"]),
+            _make_text(["alpha", "xray", "echo", "yankee"]),
+        )
+
+        assert [(diff.page, diff.status) for diff in diffs] == [
+            ("1", PAGE_UNCHANGED),
+            ("2", PAGE_CHANGED),
+            ("R3", PAGE_REMOVED),
+            ("R4", PAGE_REMOVED),
+            ("3", PAGE_UNCHANGED),
+            ("4", PAGE_ADDED),
+        ]
+
+        assert "Page R3 (removed; reference page 3, actual page -)" in (
+            build_changed_pages_prompt(diffs)
+        )
+
+        rows = merge_page_changes(
+            diffs,
+            [
+                {"Page": "Page R4", "changes": "delta removed"},
+                {"Page": "3", "changes": "hallucinated"},
+                {"Page": "Page 4", "changes": "yankee added"},
+            ],
+        )
+
+        assert [row["Page"] for row in rows] == ["1", "2", "R3", "R4", "3", "4"]
+
+        assert rows[3]["changes"] == "delta removed"
+
+        assert rows[4]["changes"] == NO_CHANGE
+
+        assert rows[5]["changes"] == "yankee added"
+
+        assert "-charlie" in rows[2]["changes"]
+
+
+class TestCompareDocumentPages(BaseTestCase):
+
+    @patch("src.model_registry.load_dotenv")
+    @patch("src.model_registry.ModelLoader")
+    @patch("src.document_comparison.document_comparison.OutputFixingParser")
+    def test_identical_documents_skip_llm(self, *_):
+
+        comparator = DocumentComparisonWithLLM()
+
+        comparator.chain = MagicMock()
+
+        text = _make_text(["one", "two"])
+
+        df = comparator.compare_document_pages(text, text)
+
+        comparator.chain.invoke.assert_not_called()
+
+        assert list(df["changes"]) == [NO_CHANGE, NO_CHANGE]
+
+    @patch("src.model_registry.load_dotenv")
+    @patch("src.model_registry.ModelLoader")
+    @patch("src.document_comparison.document_comparison.OutputFixingParser")
+    def test_only_changed_pages_are_sent(self, *_):
+
+        comparator = DocumentComparisonWithLLM()
+
+        comparator.chain = MagicMock()
+
+        comparator.chain.invoke.return_value = [
+            {"Page": "2", "changes": "Q3 changed to Q4"}
+        ]
+
+        df = comparator.compare_document_pages(
+            _make_text(["unchanged text", "launch in Q3"]),
+            _make_text(["unchanged text", "launch in Q4"]),
+        )
+
+        sent = comparator.chain.invoke.call_args[0][0]["combined_docs"]
+
+        assert "unchanged text" not in sent
+
+        assert "launch in Q4" in sent
+
+        assert list(df["changes"]) == [NO_CHANGE, "Q3 changed to Q4"]
+
+
+class TestACompareDocuments(BaseTestCase):
+
+    @patch("src.model_registry.load_dotenv")
+    @patch("src.model_registry.ModelLoader")
+    @patch("src.document_comparison.document_comparison.OutputFixingParser")
+    def test_batches_run_concurrently_and_keep_page_order(self, *_):
+
+        comparator = DocumentComparisonWithLLM()
+
+        in_flight = {"current": 0, "max": 0}
+
+        async def fake_ainvoke(inputs):
+
+            in_flight["current"] += 1
+
+            in_flight["max"] = max(in_flight["max"], in_flight["current"])
+
+            await asyncio.sleep(0.01)
+
+            in_flight["current"] -= 1
+
+            pages = re.findall(r"^Page (\d+) \(", inputs["combined_docs"], re.M)
+
+            return [{"Page": page, "changes": f"changed {page}"} for page in pages]
+
+        comparator.chain = MagicMock()
+
+        comparator.chain.ainvoke = fake_ainvoke
+
+        reference = _make_text([f"old {index}" for index in range(1, 9)])
+
+        actual = _make_text(
+            [f"new {index}" if index % 2 else f"old {index}" for index in range(1, 9)]
+        )
+
+        df = asyncio.run(
+            comparator.acompare_documents(
+                reference,
+                actual,
+                pages_per_batch=1,
+                max_concurrency=2,
+                requests_per_second=1000,
+            )
+        )
+
+        assert in_flight["max"] == 2
+
+        assert list(df["Page"]) == [str(page) for page in range(1, 9)]
+
+        assert list(df["changes"]) == [
+            f"changed {page}" if page % 2 else NO_CHANGE for page in range(1, 9)
+        ]
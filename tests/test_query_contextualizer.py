@@ -0,0 +1,82 @@
+import asyncio
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.runnables import RunnableLambda
+
+from src.single_doc_chat.query_contextualizer import (
+    QueryContextualizer,
+    needs_contextualization,
+)
+from tests.base import BaseTestCase
+
+
+class TestQueryContextualizer(BaseTestCase):
+
+    @pytest.mark.parametrize(
+        "query, expected",
+        [
+            ("What is the revenue reported for 2023?", False),
+            ("Who is the author of the annual report?", False),
+            ("Revenue in 2023", False),
+            ("Summary please", False),
+            ("What did it say about revenue?", True),
+            ("And the second quarter figures please?", True),
+            ("Why?", True),
+            ("Summarize those findings for the board", True),
+        ],
+    )
+    def test_needs_contextualization(self, query, expected):
+
+        assert needs_contextualization(query) is expected
+
+    @pytest.fixture
+    def rewrites(self):
+
+        return []
+
+    @pytest.fixture
+    def contextualizer(self, rewrites):
+
+        def rewrite(inputs):
+
+            rewrites.append(inputs["input"])
+
+            return f" standalone: {inputs['input']} "
+
+        return QueryContextualizer(RunnableLambda(rewrite), cache_size=1)
+
+    def test_skips_llm_without_history_or_for_standalone_queries(
+        self, contextualizer, rewrites
+    ):
+
+        history = [HumanMessage(content="Tell me about Acme"), AIMessage(content="ok")]
+
+        assert contextualizer.contextualize("What about it?", []) == "What about it?"
+
+        query = "What is the revenue reported for 2023?"
+
+        assert contextualizer.contextualize(query, history) == query
+
+        assert rewrites == []
+
+    def test_rewrites_are_cached_per_history_and_query(self, contextualizer, rewrites):
+
+        history = [HumanMessage(content="Tell me about Acme"), AIMessage(content="ok")]
+
+        assert contextualizer.contextualize("Who founded it?", history) == (
+            "standalone: Who founded it?"
+        )
+
+        assert (
+            asyncio.run(contextualizer.acontextualize("Who founded it?", history))
+            == "standalone: Who founded it?"
+        )
+
+        contextualizer.contextualize("Who founded it?", history[:1])
+
+        assert rewrites == ["Who founded it?", "Who founded it?"]
+
+        assert contextualizer.stats["cached"] == 1
+
+        assert len(contextualizer._cache) == 1
@@ -0,0 +1,246 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.language_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnableLambda
+
+from src.constants import ENV_RESPONSE_CACHE_PATH
+from src.document_comparison.document_comparison import DocumentComparisonWithLLM
+from src.model_registry import ModelLoader, get_model_registry
+from src.response_cache import (
+    CachedRunnable,
+    ResponseCache,
+    SQLiteResponseCache,
+    response_cache_key,
+)
+from src.single_doc_chat.data_retrival import ConversationlRAG
+from tests.base import BaseTestCase
+
+
+class TestSQLiteResponseCache(BaseTestCase):
+
+    @pytest.fixture
+    def cache_path(self, tmp_path):
+
+        return str(tmp_path / "responses.sqlite3")
+
+    def test_round_trip_and_metrics(self, cache_path):
+
+        cache = SQLiteResponseCache(cache_path)
+
+        assert cache.get("key") == (False, None)
+
+        cache.set("key", {"Summary": ["a"]})
+
+        assert cache.get("key") == (True, {"Summary": ["a"]})
+
+        stats = cache.stats()
+
+        assert stats["hits"] == 1
+
+        assert stats["misses"] == 1
+
+        assert stats["hit_rate"] == 0.5
+
+    def test_expired_entries_are_misses(self, cache_path):
+
+        cache = SQLiteResponseCache(cache_path, ttl_seconds=10)
+
+        with patch("src.response_cache.time.time", return_value=1000.0):
+
+            cache.set("key", "value")
+
+        with patch("src.response_cache.time.time", return_value=1011.0):
+
+            assert cache.get("key") == (False, None)
+
+        assert cache.stats()["expirations"] == 1
+
+    def test_evicts_least_recently_used(self, cache_path):
+
+        cache = SQLiteResponseCache(cache_path, ttl_seconds=None, max_entries=2)
+
+        for index, key in enumerate(["a", "b"]):
+
+            with patch("src.response_cache.time.time", return_value=100.0 + index):
+
+                cache.set(key, key)
+
+        with patch("src.response_cache.time.time", return_value=200.0):
+
+            cache.get("a")
+
+            cache.set("c", "c")
+
+        assert cache.get("b") == (False, None)
+
+        assert cache.get("a") == (True, "a")
+
+        assert cache.stats()["evictions"] == 1
+
+    def test_key_depends_on_every_part(self):
+
+        base = response_cache_key("document_analysis", ("groq",), {"x": 1})
+
+        assert base == response_cache_key("document_analysis", ("groq",), {"x": 1})
+
+        assert base != response_cache_key("document_comparison", ("groq",), {"x": 1})
+
+        assert base != response_cache_key("document_analysis", ("google",), {"x": 1})
+
+        assert base != response_cache_key("document_analysis", ("groq",), {"x": 2})
+
+
+class TestCachedRunnable(BaseTestCase):
+
+    def test_repeat_calls_are_served_from_cache(self, tmp_path):
+
+        calls = []
+
+        def analyze(inputs):
+
+            calls.append(inputs)
+
+            return {"length": len(inputs["document_text"])}
+
+        cached = CachedRunnable(
+            RunnableLambda(analyze),
+            SQLiteResponseCache(str(tmp_path / "responses.sqlite3")),
+            prompt_name="document_analysis",
+            model_config=("groq", "llama", 0),
+        )
+
+        inputs = {"document_text": "hello"}
+
+        assert cached.invoke(inputs) == {"length": 5}
+
+        assert cached.invoke(inputs) == {"length": 5}
+
+        assert asyncio.run(cached.ainvoke(inputs)) == {"length": 5}
+
+        assert cached.batch([inputs, {"document_text": "hi"}]) == [
+            {"length": 5},
+            {"length": 2},
+        ]
+
+        assert len(calls) == 2
+
+    def test_async_lookups_run_off_the_event_loop(self, tmp_path):
+
+        threads = []
+
+        class RecordingCache(SQLiteResponseCache):
+
+            def _get(self, key):
+
+                threads.append(threading.current_thread())
+
+                return super()._get(key)
+
+        cached = CachedRunnable(
+            RunnableLambda(lambda inputs: inputs["text"].upper()),
+            RecordingCache(str(tmp_path / "responses.sqlite3")),
+            prompt_name="echo",
+            model_config=None,
+        )
+
+        assert asyncio.run(cached.ainvoke({"text": "hi"})) == "HI"
+
+        assert threads and threading.main_thread() not in threads
+
+    def test_streamed_responses_are_cached(self, tmp_path):
+
+        llm = GenericFakeChatModel(messages=iter([AIMessage(content="Hello there")]))
+
+        cached = CachedRunnable(
+            llm | StrOutputParser(),
+            SQLiteResponseCache(str(tmp_path / "responses.sqlite3")),
+            prompt_name="chat",
+            model_config=None,
+        )
+
+        async def collect():
+
+            return [chunk async for chunk in cached.astream("hi")]
+
+        chunks = asyncio.run(collect())
+
+        assert len(chunks) > 1
+
+        assert asyncio.run(collect()) == ["Hello there"]
+
+        assert cached.invoke("hi") == "Hello there"
+
+    def test_response_cache_is_abstract(self):
+
+        with pytest.raises(TypeError):
+
+            ResponseCache()
+
+    def test_registry_wraps_chains_when_enabled(self, tmp_path, monkeypatch):
+
+        monkeypatch.setenv(ENV_RESPONSE_CACHE_PATH, str(tmp_path / "cache.sqlite3"))
+
+        with (
+            patch("src.model_registry.ModelLoader") as loader_cls,
+            patch("src.model_registry.load_dotenv"),
+        ):
+
+            loader_cls.return_value.config = {}
+
+            registry = get_model_registry()
+
+            chain = registry.get_chain("document_analysis", lambda llm: llm)
+
+        assert isinstance(chain, CachedRunnable)
+
+    def test_conversation_chains_are_cached(self, tmp_path, monkeypatch):
+
+        monkeypatch.setenv(ENV_RESPONSE_CACHE_PATH, str(tmp_path / "cache.sqlite3"))
+
+        with (
+            patch("src.model_registry.ModelLoader") as loader_cls,
+            patch("src.model_registry.load_dotenv"),
+        ):
+
+            loader_cls.return_value.config = {}
+
+            rag = ConversationlRAG(
+                history_store=MagicMock(), retriever=RunnableLambda(lambda q: [])
+            )
+
+        assert isinstance(rag.summary_chain, CachedRunnable)
+
+        assert isinstance(rag.contextualizer.rewrite_chain, CachedRunnable)
+
+        assert isinstance(rag.qa_chain, CachedRunnable)
+
+    def test_default_components_use_configured_cache(self, tmp_path, monkeypatch):
+
+        # config/config.yaml enables the cache at a path relative to the cwd.
+        monkeypatch.chdir(tmp_path)
+
+        monkeypatch.delenv(ENV_RESPONSE_CACHE_PATH, raising=False)
+
+        with (
+            patch.object(ModelLoader, "load_llm", return_value=MagicMock()),
+            patch("src.model_registry.load_dotenv"),
+        ):
+
+            rag = ConversationlRAG(
+                history_store=MagicMock(), retriever=RunnableLambda(lambda q: [])
+            )
+
+            comparator = DocumentComparisonWithLLM()
+
+        assert isinstance(rag.summary_chain, CachedRunnable)
+
+        assert isinstance(rag.qa_chain, CachedRunnable)
+
+        assert isinstance(comparator.chain, CachedRunnable)
+
+        assert (tmp_path / "data" / "response_cache").is_dir()
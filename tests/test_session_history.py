@@ -0,0 +1,157 @@
+import asyncio
+import threading
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from src.session_history import SessionHistoryStore
+from tests.base import BaseTestCase
+
+
+class TestSessionHistoryStore(BaseTestCase):
+
+    @pytest.fixture
+    def db_path(self, tmp_path):
+
+        return str(tmp_path / "history.sqlite3")
+
+    def add_turns(self, history, count):
+
+        for index in range(count):
+
+            history.add_messages(
+                [HumanMessage(content=f"q{index}"), AIMessage(content=f"a{index}")]
+            )
+
+    def test_history_persists_across_stores(self, db_path):
+
+        self.add_turns(SessionHistoryStore(db_path).get_history("s1"), 2)
+
+        history = SessionHistoryStore(db_path).get_history("s1")
+
+        assert [message.content for message in history.messages] == [
+            "q0",
+            "a0",
+            "q1",
+            "a1",
+        ]
+
+        assert SessionHistoryStore(db_path).get_history("s2").messages == []
+
+    def test_window_is_bounded_and_summarized(self, db_path):
+
+        summaries = []
+
+        def summarize(summary, messages):
+
+            summaries.append([message.content for message in messages])
+
+            return summary + "".join(message.content for message in messages)
+
+        store = SessionHistoryStore(db_path, max_messages=4, summarizer=summarize)
+
+        history = store.get_history("s1")
+
+        self.add_turns(history, 4)
+
+        messages = history.messages
+
+        assert isinstance(messages[0], SystemMessage)
+
+        assert messages[0].content.endswith("q0a0q1a1")
+
+        assert [message.content for message in messages[1:]] == [
+            "q2",
+            "a2",
+            "q3",
+            "a3",
+        ]
+
+        assert summaries == [["q0", "a0"], ["q1", "a1"]]
+
+    def test_token_budget_drops_whole_turns(self, db_path):
+
+        store = SessionHistoryStore(db_path, max_tokens=20)
+
+        history = store.get_history("s1")
+
+        history.add_messages(
+            [HumanMessage(content="x" * 80), AIMessage(content="y" * 20)]
+        )
+
+        history.add_messages([HumanMessage(content="q"), AIMessage(content="a")])
+
+        assert [message.content for message in history.messages] == ["q", "a"]
+
+    def test_oversized_last_exchange_stays_in_the_window(self, db_path):
+
+        store = SessionHistoryStore(db_path, max_tokens=20)
+
+        history = store.get_history("s1")
+
+        self.add_turns(history, 1)
+
+        history.add_messages([HumanMessage(content="q"), AIMessage(content="y" * 400)])
+
+        assert [message.content for message in history.messages] == ["q", "y" * 400]
+
+    def test_async_access_runs_off_the_event_loop(self, db_path):
+
+        threads = []
+
+        def summarize(summary, messages):
+
+            threads.append(threading.current_thread())
+
+            return "summary"
+
+        history = SessionHistoryStore(
+            db_path, max_messages=2, summarizer=summarize
+        ).get_history("s1")
+
+        async def scenario():
+
+            for index in range(2):
+
+                await history.aadd_messages(
+                    [HumanMessage(content=f"q{index}"), AIMessage(content=f"a{index}")]
+                )
+
+            return await history.aget_messages()
+
+        messages = asyncio.run(scenario())
+
+        assert [message.content for message in messages[1:]] == ["q1", "a1"]
+
+        assert threads and threading.main_thread() not in threads
+
+    def test_idle_sessions_are_evicted_from_memory(self, db_path):
+
+        store = SessionHistoryStore(db_path, max_sessions=2, idle_seconds=60)
+
+        for session_id in ["a", "b", "c"]:
+
+            store.get_history(session_id).messages
+
+        assert len(store) == 2
+
+        with patch("src.session_history.time.time", return_value=10**12):
+
+            store.get_history("a").messages
+
+        assert len(store) == 1
+
+        assert store.evictions == 3
+
+    def test_clear_removes_session(self, db_path):
+
+        store = SessionHistoryStore(db_path)
+
+        history = store.get_history("s1")
+
+        self.add_turns(history, 1)
+
+        history.clear()
+
+        assert history.messages == []
@@ -0,0 +1,112 @@
+import asyncio
+import hashlib
+import io
+
+import pytest
+
+from src.streaming_upload import UploadTooLargeError, asave_stream, save_stream
+from tests.base import BaseTestCase
+
+CONTENT = b"0123456789" * 10
+
+
+class AsyncReader:
+
+    def __init__(self, data):
+
+        self.file = io.BytesIO(data)
+
+    async def read(self, size):
+
+        return self.file.read(size)
+
+
+class TestStreamingUpload(BaseTestCase):
+
+    @pytest.mark.parametrize(
+        "make_source",
+        [
+            lambda path: CONTENT,
+            lambda path: str(path),
+            lambda path: io.BytesIO(CONTENT),
+            lambda path: (CONTENT[i : i + 7] for i in range(0, len(CONTENT), 7)),
+        ],
+    )
+    def test_saves_any_source_in_chunks(self, tmp_path, make_source):
+
+        source_path = tmp_path / "source.bin"
+
+        source_path.write_bytes(CONTENT)
+
+        saved = save_stream(
+            make_source(source_path), str(tmp_path / "out"), "a.bin", chunk_size=16
+        )
+
+        assert saved.path == str(tmp_path / "out" / "a.bin")
+
+        assert (tmp_path / "out" / "a.bin").read_bytes() == CONTENT
+
+        assert saved.sha256 == hashlib.sha256(CONTENT).hexdigest()
+
+        assert saved.size == len(CONTENT)
+
+    def test_rejects_known_size_before_writing(self, tmp_path):
+
+        with pytest.raises(UploadTooLargeError):
+
+            save_stream(CONTENT, str(tmp_path), "a.bin", max_bytes=10)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_rejects_stream_past_limit_and_cleans_up(self, tmp_path):
+
+        (tmp_path / "a.bin").write_bytes(b"previous")
+
+        chunks = iter([CONTENT[:40], CONTENT[40:80], CONTENT[80:]])
+
+        with pytest.raises(UploadTooLargeError) as excinfo:
+
+            save_stream(chunks, str(tmp_path), "a.bin", max_bytes=50)
+
+        assert excinfo.value.status_code == 413
+
+        # The rejected upload never replaces the existing file.
+        assert [path.name for path in tmp_path.iterdir()] == ["a.bin"]
+
+        assert (tmp_path / "a.bin").read_bytes() == b"previous"
+
+    def test_async_save_from_reader_and_iterator(self, tmp_path):
+
+        async def chunks():
+
+            for start in range(0, len(CONTENT), 30):
+
+                yield CONTENT[start : start + 30]
+
+        async def scenario():
+
+            from_reader = await asave_stream(
+                AsyncReader(CONTENT), str(tmp_path), "reader.bin", chunk_size=16
+            )
+
+            from_iterator = await asave_stream(chunks(), str(tmp_path), "iter.bin")
+
+            return from_reader, from_iterator
+
+        from_reader, from_iterator = asyncio.run(scenario())
+
+        assert from_reader.sha256 == from_iterator.sha256
+
+        assert (tmp_path / "reader.bin").read_bytes() == CONTENT
+
+        assert (tmp_path / "iter.bin").read_bytes() == CONTENT
+
+    def test_async_save_rejects_past_limit(self, tmp_path):
+
+        with pytest.raises(UploadTooLargeError):
+
+            asyncio.run(
+                asave_stream(AsyncReader(CONTENT), str(tmp_path), "a.bin", max_bytes=50)
+            )
+
+        assert list(tmp_path.iterdir()) == []
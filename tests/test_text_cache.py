@@ -0,0 +1,127 @@
+import pytest
+from AIFoundationKit.base.file_manager import BaseFileManager
+
+import src.document_analysier.data_ingestion as data_ingestion
+import src.text_cache as text_cache
+from src.document_analysier.data_ingestion import DocumentHandler
+from src.document_comparison.document_handler import DocumentComparisonHandler
+from src.text_cache import PageText, write_pages
+from tests.base import BaseTestCase
+
+
+def fail(*args, **kwargs):
+
+    raise AssertionError("document parsed again")
+
+
+class TestPageText(BaseTestCase):
+
+    def test_round_trip(self, tmp_path):
+
+        pages = ["first page", "", "naïve — ünïcode ✓", "last"]
+
+        path = str(tmp_path / "pages.bin")
+
+        assert write_pages(path, iter(pages)) == 4
+
+        with PageText(path) as cached:
+
+            assert len(cached) == 4
+
+            assert list(cached) == pages
+
+            assert cached[-1] == "last"
+
+            with pytest.raises(IndexError):
+
+                cached[4]
+
+    def test_empty_document(self, tmp_path):
+
+        path = str(tmp_path / "pages.bin")
+
+        write_pages(path, [])
+
+        with PageText(path) as cached:
+
+            assert list(cached) == []
+
+    def test_rejects_other_files(self, tmp_path):
+
+        path = tmp_path / "other.bin"
+
+        path.write_bytes(b"not a page-text file at all")
+
+        with pytest.raises(ValueError):
+
+            PageText(str(path))
+
+
+class TestTextCacheUsage(BaseTestCase):
+
+    def test_read_pdf_uses_text_extracted_at_save(
+        self, temp_data_dir, sample_pdf, dummy_file_class, monkeypatch
+    ):
+
+        handler = DocumentHandler()
+
+        expected = handler.read_pdf(str(sample_pdf))
+
+        saved_path = handler.save_pdf(dummy_file_class(sample_pdf))
+
+        monkeypatch.setattr(data_ingestion.fitz, "open", fail)
+
+        assert handler.read_pdf(saved_path) == expected
+
+    def test_combine_files_reuses_cached_text(self, sample_pdf, tmp_path, monkeypatch):
+
+        base_dir = str(tmp_path / "compare")
+
+        first = DocumentComparisonHandler(session_id="first", file_path=base_dir)
+
+        reference_path, _ = first.save_file(
+            str(sample_pdf), b"plain text", actual_file_name="notes.txt"
+        )
+
+        expected = first.file_manager.read_file(reference_path)
+
+        assert expected == BaseFileManager().read_file(str(sample_pdf))
+
+        monkeypatch.setattr(text_cache, "extract_pages", fail)
+
+        # A new session with the same reference finds its text cached.
+        second = DocumentComparisonHandler(session_id="second", file_path=base_dir)
+
+        second.save_file(str(sample_pdf), b"plain text", actual_file_name="notes.txt")
+
+        monkeypatch.setattr(second.file_manager, "read_file", fail)
+
+        combined = second.combine_files()
+
+        assert combined == (f"notes.txt:\nplain text\n\n{sample_pdf.name}:\n{expected}")
+
+    def test_clean_old_session_keeps_the_shared_store(self, tmp_path):
+
+        base_dir = tmp_path / "compare"
+
+        for session_id in ("a_old", "b_new"):
+
+            handler = DocumentComparisonHandler(
+                session_id=session_id, file_path=str(base_dir)
+            )
+
+            handler.save_file(
+                session_id.encode(),
+                b"shared",
+                reference_file_name="ref.txt",
+                actual_file_name="act.txt",
+            )
+
+        handler.clean_old_session(keep_latest=1)
+
+        assert sorted(path.name for path in base_dir.iterdir()) == [".blobs", "b_new"]
+
+        # Only the removed session's own reference was unreferenced.
+        assert len(list((base_dir / ".blobs" / "objects").iterdir())) == 2
+
+        assert handler.combine_files() == "act.txt:\nshared\n\nref.txt:\nb_new"
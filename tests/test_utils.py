@@ -0,0 +1,203 @@
+import os
+
+import pytest
+from langchain_community.document_loaders import TextLoader
+from langchain_community.vectorstores import FAISS
+from langchain_core.documents import Document
+
+from src.constants import (
+    FAISS_CURRENT_LINK,
+    FAISS_GENERATION_PREFIX,
+    FAISS_INDEX_FILE,
+    KEY_CONTENT_HASH,
+)
+from src.faiss_store import resolve_index_dir
+from src.hybrid_search import BM25Index, bm25_index_path
+from src.utils import (
+    _create_retriever,
+    compute_content_hash,
+    iter_process_and_load_files,
+    load_vectorstore,
+    process_and_load_files,
+)
+from tests.base import BaseTestCase, CountingEmbeddings
+
+
+class TestCreateRetriever(BaseTestCase):
+
+    @pytest.fixture
+    def embedding_model(self):
+
+        return CountingEmbeddings(size=16, embedded_texts=[])
+
+    @pytest.fixture
+    def faiss_dir(self, tmp_path):
+
+        return str(tmp_path / "faiss_index")
+
+    def test_chunks_are_keyed_by_content_hash(self, embedding_model, faiss_dir):
+
+        docs = [Document(page_content="alpha"), Document(page_content="beta")]
+
+        _create_retriever(docs, embedding_model, faiss_dir)
+
+        vectorstore = load_vectorstore(faiss_dir, embedding_model)
+
+        ids = set(vectorstore.index_to_docstore_id.values())
+
+        assert ids == {compute_content_hash("alpha"), compute_content_hash("beta")}
+
+        stored = vectorstore.docstore.search(compute_content_hash("alpha"))
+
+        assert stored.metadata[KEY_CONTENT_HASH] == compute_content_hash("alpha")
+
+    def test_incremental_embeds_only_new_chunks(self, embedding_model, faiss_dir):
+
+        _create_retriever(
+            [Document(page_content="alpha"), Document(page_content="beta")],
+            embedding_model,
+            faiss_dir,
+            incremental=True,
+        )
+
+        embedding_model.embedded_texts.clear()
+
+        _create_retriever(
+            [[Document(page_content="beta")], [Document(page_content="gamma")]],
+            embedding_model,
+            faiss_dir,
+            incremental=True,
+        )
+
+        assert embedding_model.embedded_texts == ["gamma"]
+
+        vectorstore = load_vectorstore(faiss_dir, embedding_model)
+
+        assert vectorstore.index.ntotal == 3
+
+    def test_incremental_ingest_upgrades_legacy_index(self, embedding_model, faiss_dir):
+
+        # Saved with uuid ids and a pickled docstore, as before content hashes.
+        FAISS.from_documents(
+            [
+                Document(page_content="alpha"),
+                Document(page_content="beta"),
+                Document(page_content="alpha"),
+            ],
+            embedding_model,
+        ).save_local(faiss_dir)
+
+        embedding_model.embedded_texts.clear()
+
+        _create_retriever(
+            [Document(page_content="beta"), Document(page_content="gamma")],
+            embedding_model,
+            faiss_dir,
+            incremental=True,
+        )
+
+        # Flat vectors are reused, so only the new chunk is embedded.
+        assert embedding_model.embedded_texts == ["gamma"]
+
+        vectorstore = load_vectorstore(faiss_dir, embedding_model)
+
+        assert sorted(vectorstore.index_to_docstore_id.values()) == sorted(
+            compute_content_hash(text) for text in ["alpha", "beta", "gamma"]
+        )
+
+        assert vectorstore.similarity_search("beta", k=1)[0].page_content == "beta"
+
+        assert len(BM25Index.load(bm25_index_path(faiss_dir))) == 3
+
+    def test_full_rebuild_replaces_index(self, embedding_model, faiss_dir):
+
+        _create_retriever([Document(page_content="alpha")], embedding_model, faiss_dir)
+
+        _create_retriever([Document(page_content="beta")], embedding_model, faiss_dir)
+
+        vectorstore = load_vectorstore(faiss_dir, embedding_model)
+
+        assert list(vectorstore.index_to_docstore_id.values()) == [
+            compute_content_hash("beta")
+        ]
+
+    def test_save_leaves_no_temporary_directories(
+        self, embedding_model, faiss_dir, tmp_path
+    ):
+
+        _create_retriever([Document(page_content="alpha")], embedding_model, faiss_dir)
+
+        assert os.path.exists(
+            os.path.join(resolve_index_dir(faiss_dir), FAISS_INDEX_FILE)
+        )
+
+        assert os.listdir(tmp_path) == ["faiss_index"]
+
+        assert sorted(
+            name
+            for name in os.listdir(faiss_dir)
+            if not name.startswith(FAISS_GENERATION_PREFIX)
+        ) == [FAISS_CURRENT_LINK, "bm25.json"]
+
+    def test_load_vectorstore_missing_index(self, embedding_model, tmp_path):
+
+        assert load_vectorstore(str(tmp_path / "missing"), embedding_model) is None
+
+
+class TestProcessAndLoadFiles(BaseTestCase):
+
+    @pytest.fixture
+    def text_files(self, tmp_path):
+
+        paths = []
+
+        for index in range(4):
+
+            path = tmp_path / f"input_{index}.txt"
+
+            path.write_text(f"document {index}")
+
+            paths.append(str(path))
+
+        return paths
+
+    @pytest.mark.parametrize("max_workers", [1, 2])
+    def test_preserves_input_order(self, text_files, tmp_path, max_workers):
+
+        data_dir = tmp_path / "out"
+
+        data_dir.mkdir()
+
+        files = process_and_load_files(
+            text_files,
+            str(data_dir),
+            loader_cls=TextLoader,
+            file_extension=".txt",
+            max_workers=max_workers,
+        )
+
+        assert [docs[0].page_content for docs in files] == [
+            f"document {index}" for index in range(4)
+        ]
+
+        assert len(os.listdir(data_dir)) == 4
+
+    def test_iter_yields_every_file(self, text_files, tmp_path):
+
+        data_dir = tmp_path / "out"
+
+        data_dir.mkdir()
+
+        results = list(
+            iter_process_and_load_files(
+                text_files,
+                str(data_dir),
+                loader_cls=TextLoader,
+                file_extension=".txt",
+                max_workers=2,
+            )
+        )
+
+        assert sorted(docs[0].page_content for docs in results) == [
+            f"document {index}" for index in range(4)
+        ]
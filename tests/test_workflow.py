@@ -8,8 +8,8 @@ from tests.base import BaseTestCase
 
 class TestWorkflow(BaseTestCase):
 
-    @patch("src.document_analysier.data_analysis.load_dotenv")
-    @patch("src.document_analysier.data_analysis.ModelLoader")
+    @patch("src.model_registry.load_dotenv")
+    @patch("src.model_registry.ModelLoader")
     @patch("src.document_analysier.data_analysis.JsonOutputParser")
     @patch("src.document_analysier.data_analysis.OutputFixingParser")
     @patch("src.document_analysier.data_analysis.PROMPT_REGISTRY")